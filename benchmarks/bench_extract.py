@@ -0,0 +1,231 @@
+"""네트워크 없이 저장된 HTML 스냅샷으로 추출 단계(CPU 구간)의 처리량과 페이지당 메모리를 측정
+
+    python -m benchmarks.bench_extract                       # 설치된 모든 파서로 측정
+    python -m benchmarks.bench_extract -n 5000 -p lxml       # 반복 횟수, 파서 지정
+    python -m benchmarks.bench_extract --save base.json      # 결과 저장
+    python -m benchmarks.bench_extract --compare base.json   # 저장한 결과보다 느려지면 종료 코드 1
+    python -m benchmarks.bench_extract --record category https://kmong.com/category/645
+
+--record는 브라우저로 페이지를 열어 렌더링된 HTML을 fixtures/<이름>.html로 저장한다.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from src.crawler import crawler_old, hydration
+from src.crawler.crawler import ProfileCrawler, _category_from_soup, _profile_from_soup, review_rows
+from src.crawler.data_extractor import default_spec
+from src.crawler.document import DocumentCache
+from src.crawler.review_api import parse_reviews
+from src.utils.helpers import log
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PARSERS = ('html.parser', 'lxml', 'html5lib')
+MEMORY_SAMPLES = 20
+
+
+class NullPool:
+    """벤치마크 중 브라우저를 띄우지 않도록 하는 빈 드라이버 풀"""
+    def acquire(self):
+        raise RuntimeError("벤치마크에서는 브라우저를 사용하지 않습니다.")
+
+    def release(self, session):
+        pass
+
+    def close(self):
+        pass
+
+
+def load_fixture(filename):
+    with open(os.path.join(FIXTURE_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+
+def build_cases():
+    """(이름, 픽스처 파일, 추출 함수, 파싱 여부) 목록. 추출 함수는 soup(파싱하지 않으면 본문 문자열)을 받는다
+
+    *_next 항목은 HTML을 파싱하지 않고 __NEXT_DATA__ JSON만 읽는 경로다.
+    """
+    profile_crawler = ProfileCrawler(seller_names=[], driver_pool=NullPool())
+    # 구버전 크롤러는 생성할 때 브라우저를 띄우므로 생성자를 거치지 않는다
+    gig_crawler = crawler_old.ProfileCrawler.__new__(crawler_old.ProfileCrawler)
+    gig_crawler.documents = DocumentCache()
+
+    # category, profile은 파이프라인 파싱 단계(parse_category_html, parse_profile_html)의 DOM 추출 경로와 같다
+    def category(soup):
+        return _category_from_soup(soup)
+
+    def profile(soup):
+        # finish_profile에서 파싱 결과를 받은 뒤의 처리와 같다
+        fields = _profile_from_soup(soup)
+        return (profile_crawler._profile_fingerprint(fields), profile_crawler._plan_visits(fields),
+                review_rows(fields['reviews']))
+
+    def review(soup):
+        fields = default_spec.extract(soup, 'review_list')
+        return review_rows(fields['reviews']), fields['next_review_page']
+
+    def portfolio(soup):
+        profile_crawler._load_portfolios = lambda portfolio_url: soup
+        return profile_crawler._extract_portfolios('seller001')
+
+    def gig(soup):
+        return (gig_crawler._extract_package_info_fast(soup), gig_crawler._extract_skill_level_fast(soup),
+                gig_crawler._extract_team_size_fast(soup))
+
+    def category_next(html):
+        return hydration.category_page(hydration.next_data(html))
+
+    def profile_next(html):
+        return hydration.profile_page(hydration.next_data(html))
+
+    def gig_next(html):
+        return hydration.gig_packages(hydration.next_data(html))
+
+    return [
+        ('category', 'category.html', category, True),
+        ('category_next', 'category_next.html', category_next, False),
+        ('profile_next', 'profile_next.html', profile_next, False),
+        ('gig_next', 'gig_next.html', gig_next, False),
+        ('profile', 'profile.html', profile, True),
+        ('review', 'review.html', review, True),
+        ('review_api', 'review_api.json', parse_reviews, False),
+        ('portfolio', 'portfolio.html', portfolio, True),
+        ('gig', 'gig.html', gig, True),
+    ]
+
+
+def available_parsers(names):
+    parsers = []
+    for name in names:
+        try:
+            BeautifulSoup("<p></p>", name)
+        except FeatureNotFound:
+            log(f"{name} 파서가 설치되어 있지 않아 건너뜁니다.")
+            continue
+        parsers.append(name)
+    return parsers
+
+
+def _rate(iterations, seconds):
+    return round(iterations / seconds, 1) if seconds else None
+
+
+def measure(text, extract, parser, iterations):
+    """파싱+추출, 추출만(같은 soup 재사용) 처리량(페이지/초)과 페이지당 최대 메모리(KiB)"""
+    parse = (lambda: BeautifulSoup(text, parser)) if parser else (lambda: text)
+    extract(parse())  # 첫 호출의 선택자 컴파일 등은 측정에서 뺀다
+
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        extract(parse())
+    full = time.perf_counter() - started
+
+    document = parse()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        extract(document)
+    extract_only = time.perf_counter() - started
+    del document
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(min(iterations, MEMORY_SAMPLES)):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        extract(parse())
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    return {
+        'pages_per_second': _rate(iterations, full),
+        'extract_pages_per_second': _rate(iterations, extract_only),
+        'memory_kib_per_page': round(sum(peaks) / len(peaks) / 1024, 1),
+    }
+
+
+def run(iterations, parsers, only=None):
+    results = {}
+    for name, filename, extract, is_html in build_cases():
+        if only and name not in only:
+            continue
+        text = load_fixture(filename)
+        for parser in (parsers if is_html else [None]):
+            key = f"{name}/{parser}" if parser else name
+            results[key] = measure(text, extract, parser, iterations)
+            stats = results[key]
+            log(f"{key:<24} {stats['pages_per_second']:>9} 페이지/초 (추출만 {stats['extract_pages_per_second']:>9}), "
+                f"페이지당 {stats['memory_kib_per_page']} KiB")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """baseline보다 처리량이 tolerance 비율 이상 떨어진 항목 목록"""
+    regressions = []
+    for key, stats in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]['pages_per_second']
+        after = stats['pages_per_second']
+        ratio = after / before if before else 1
+        log(f"{key:<24} {before} → {after} 페이지/초 ({ratio:.2f}배)")
+        if ratio < 1 - tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def record(name, url):
+    """브라우저로 url을 열어 렌더링이 끝난 HTML을 픽스처로 저장"""
+    from src.crawler import readiness
+    from src.crawler.driver_pool import create_driver
+
+    driver = create_driver()
+    try:
+        driver.get(url)
+        readiness.wait_for_network_idle(driver)
+        path = os.path.join(FIXTURE_DIR, f"{name}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(driver.page_source)
+    finally:
+        driver.quit()
+    log(f"픽스처 저장: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 HTML로 추출 단계 벤치마크")
+    parser.add_argument('-n', '--iterations', type=int, default=1000)
+    parser.add_argument('-p', '--parser', action='append', help="측정할 파서 (기본: 설치된 모든 파서)")
+    parser.add_argument('-c', '--case', action='append', help="측정할 항목 (기본: 전체)")
+    parser.add_argument('--save', help="결과를 JSON으로 저장할 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="허용하는 처리량 감소 비율")
+    parser.add_argument('--record', nargs=2, metavar=('NAME', 'URL'), help="페이지를 픽스처로 저장")
+    args = parser.parse_args()
+
+    if args.record:
+        record(*args.record)
+        return 0
+
+    results = run(args.iterations, available_parsers(args.parser or PARSERS), args.case)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        log(f"결과 저장: {args.save}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            log(f"처리량 감소: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,43 +1,299 @@
 import sys
 import os
+from functools import partial
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from src.crawler.crawler import CategoryCrawler, ProfileCrawler
+from src.crawler.archive import PageArchive
+from src.crawler.broker import TaskBroker, BrokerWorker
+from src.crawler.crawler import (
+    CategoryCrawler, ProfileCrawler, GigCrawler, PROFILE_COLUMNS, SERVICE_COLUMNS, GIG_COLUMNS,
+    parse_gig_html, parse_profile_html,
+)
+from src.crawler.driver_pool import DriverPool, create_driver
+from src.crawler.fetcher import HttpFetcher
+from src.crawler.freshness import FreshnessStore
+from src.crawler.offline import extract_archive, gig_records, profile_records, service_rows
+from src.crawler.pipeline import StagedPipeline
+from src.crawler.scheduler import default_throttle
+from src.crawler.state_store import CrawlStateStore
+from src.data.analyzer import CategoryAnalyzer
+from src.data.processor import ProfileNormalizer
+from src.data.sink import CsvSink, PartitionedSink
+from src.utils.config import (
+    MAX_IN_FLIGHT, PER_HOST_LIMIT, CATEGORY_PAGE_WORKERS, GIG_WORKERS, METRICS_LIVE_INTERVAL, ARCHIVE_ENABLED,
+    BROKER_DB_PATH, REVIEW_API_TEMPLATE,
+)
+from src.utils.metrics import metrics
 from datetime import datetime
 import time
 import pandas as pd
 
-from multiprocessing import Pool
+# 6, 7번(분산 수집) 실행 방법
+DISTRIBUTED_HELP = (
+    "분산 수집은 작업 큐(SQLite 파일 하나)를 여러 노드가 함께 씁니다.\n"
+    f"- 모든 노드의 config.BROKER_DB_PATH(현재 {BROKER_DB_PATH})를 같은 공유 폴더(NFS, SMB)의 파일로 맞추세요.\n"
+    "  공유 폴더는 파일 잠금을 지원해야 하며, 한 호스트에서만 돌릴 때는 로컬 경로를 그대로 써도 됩니다.\n"
+    "- 한 노드에서 6번(코디네이터)을 실행하고, 각 노드에서 7번(워커)을 실행하세요. 순서는 상관없습니다.\n"
+    "- 워커는 코디네이터가 모든 작업을 마쳤다고 표시하면 종료하고, 결과는 코디네이터가 CSV로 합칩니다."
+)
+
+# 프로필 수집 세션: 리뷰 API 주소를 설정하지 않았으면 페이지를 넘길 때의 네트워크 로그에서 찾는다
+profile_driver = partial(create_driver, capture_network=REVIEW_API_TEMPLATE is None)
 
 def log(message):
     print(f"[{datetime.now().strftime("%H:%M:%S.%f")[:-3]}] {message}")
 
-def get_seller_names():
+def open_archive():
+    # 받은 페이지 원본을 보관해 두면 선택자를 고친 뒤 8번(오프라인 재추출)으로 다시 수집 없이 추출할 수 있다
+    return PageArchive() if ARCHIVE_ENABLED else None
+
+def close_archive(archive):
+    if archive is not None:
+        archive.close()
+
+def get_seller_names(order_by_cost=True):
+    df = pd.read_csv('./output/services.csv')
+    if not order_by_cost or '리뷰수' not in df.columns:
+        return df['판매자'].unique()
+    # 서비스 리뷰 수 합을 판매자별 작업량(리뷰 페이지 수)으로 보고 큰 판매자부터 큐에 넣는다
+    # 워커는 끝나는 대로 다음 판매자를 꺼내므로, 긴 작업이 마지막에 혼자 남지 않는다
+    costs = pd.to_numeric(df['리뷰수'], errors='coerce').fillna(0).groupby(df['판매자'], sort=False).sum()
+    return costs.sort_values(ascending=False, kind='stable').index.to_numpy()
+
+def crawl_profiles(seller_names, driver_pool, state_store, sink, freshness=None, max_in_flight=MAX_IN_FLIGHT, per_host_limit=PER_HOST_LIMIT, archive=None):
+    # 가져오기(HTTP, per_host_limit개 스레드) → 파싱(프로세스 풀) → 마무리(리뷰 API, 포트폴리오, 브라우저 대체) → 쓰기 단계로 처리
+    # 마무리 단계는 워커마다 크롤러와 part 파일을 하나씩 두고, 브라우저는 HTTP로 부족한 판매자에 한해 풀에서 빌려 쓴다
+    # 이전 실행에서 완료된 판매자는 건너뛰고, 실패한 판매자는 다시 시도한다
+    log(f"{len(seller_names)}명의 판매자 정보를 수집합니다.")
+    todo = state_store.pending('seller', seller_names)
+    log(f"완료 {len(seller_names) - len(todo)}명, 남은 판매자 {len(todo)}명")
+
+    fetcher = HttpFetcher(pool_size=max_in_flight + per_host_limit)
+    fetch_crawler = ProfileCrawler(seller_names=seller_names, fetcher=fetcher, driver_pool=driver_pool, freshness=freshness,
+                                   archive=archive)
+    finishers = [(ProfileCrawler(seller_names=seller_names, fetcher=fetcher, driver_pool=driver_pool, freshness=freshness,
+                                 archive=archive), sink.part(i))
+                 for i in range(max_in_flight)]
+    # 브라우저 세션은 HTTP 응답으로 부족해 대체가 필요할 때 DriverPool.acquire가 띄운다
+    done = []
+
+    def fetch(seller_name):
+        state_store.mark_started('seller', seller_name)
+        return fetch_crawler.fetch_profile(seller_name)
+
+    def finish(finisher, seller_name, meta, fields):
+        profile_crawler, part = finisher
+        try:
+            profile = profile_crawler.finish_profile(seller_name, meta, fields)
+        finally:
+            profile_crawler.release_driver()
+        # 쓰기 단계의 완료 표시 전에 워커의 part 파일에 먼저 써서, 중단돼도 수집한 결과를 잃지 않게 한다
+        part.write(profile)
+        # 워커별 처리량은 마무리 워커 스레드에서 센다 (쓰기 단계는 스레드 하나뿐)
+        metrics.inc('sellers', worker=True)
+        return profile
+
+    def write(seller_name, profile):
+        reviews = len(profile['reviews'] or [])
+        state_store.mark_done('seller', seller_name, {'reviews': reviews})
+        metrics.inc('reviews', reviews)
+        done.append(seller_name)
+        log(f"{seller_name} [{len(done)}/{len(todo)}]")
+
+    def fail(seller_name, error):
+        state_store.mark_failed('seller', seller_name, error)
+
+    pipeline = StagedPipeline(fetch, parse_profile_html, finish, write, finishers,
+                              fetch_workers=per_host_limit, on_error=fail, name='profile')
+    try:
+        pipeline.run(todo)
+    finally:
+        for profile_crawler in [fetch_crawler, *(crawler for crawler, _ in finishers)]:
+            profile_crawler.close()
+        fetcher.close()
+        sink.close()
+
+    return len(done)
+
+def get_service_links():
     df = pd.read_csv('./output/services.csv')
-    seller_names = df['판매자'].unique()
-    return seller_names
+    return df['링크'].dropna().unique()
+
+def crawl_gigs(links, driver_pool, state_store, sink, workers=GIG_WORKERS, max_in_flight=MAX_IN_FLIGHT, archive=None):
+    # 서비스 상세 페이지는 대부분 HTTP 응답만으로 처리되므로 브라우저 수보다 많은 스레드로 동시에 요청하고,
+    # 파싱은 프로세스 풀에서, 브라우저 대체는 max_in_flight개 마무리 워커에서 처리한다
+    # 이전 실행에서 완료된 서비스는 건너뛴다
+    todo = state_store.pending('gig', links)
+    log(f"완료 {len(links) - len(todo)}개, 남은 서비스 {len(todo)}개")
+
+    fetcher = HttpFetcher(pool_size=workers)
+    fetch_crawler = GigCrawler(fetcher=fetcher, driver_pool=driver_pool, archive=archive)
+    finishers = [(GigCrawler(fetcher=fetcher, driver_pool=driver_pool, archive=archive), sink.part(i))
+                 for i in range(max_in_flight)]
+    done = []
+
+    def fetch(link):
+        state_store.mark_started('gig', link)
+        return fetch_crawler.fetch_gig(link)
+
+    def finish(finisher, link, meta, fields):
+        gig_crawler, part = finisher
+        try:
+            gig = gig_crawler.finish_gig(link, meta, fields)
+        finally:
+            gig_crawler.release_driver()
+        part.write(gig)
+        metrics.inc('gigs', worker=True)
+        return gig
+
+    def write(link, gig):
+        state_store.mark_done('gig', link, {'packages': len(gig['packages'] or {})})
+        done.append(link)
+        log(f"{link} [{len(done)}/{len(todo)}]")
+
+    def fail(link, error):
+        state_store.mark_failed('gig', link, error)
+
+    pipeline = StagedPipeline(fetch, parse_gig_html, finish, write, finishers,
+                              fetch_workers=workers, on_error=fail, name='gig')
+    try:
+        pipeline.run(todo)
+    finally:
+        for gig_crawler in [fetch_crawler, *(crawler for crawler, _ in finishers)]:
+            gig_crawler.close()
+        fetcher.close()
+        sink.close()
+
+    return len(done)
+
+def enqueue_sellers(broker, services):
+    # 서비스 리뷰 수를 작업량으로 더해 두어, 리뷰가 많은 판매자부터 처리되게 한다
+    broker.enqueue_many('seller', [(info[1], None, info[3] if len(info) > 3 and info[3] else 0) for info in services])
 
-def crawl_profiles(seller_names=None):
-    profile_crawler = ProfileCrawler(seller_names=seller_names)
-    profiles = []
+def distributed_handlers(broker):
+    # 카테고리 첫 페이지 → 나머지 페이지 → 판매자 순으로, 작업을 처리한 워커가 다음 작업을 큐에 넣는다
+    def crawl_category(crawlers, task):
+        category_crawler, _ = crawlers
+        first = category_crawler._crawl_first_page(task.payload['category_id'])
+        if first['page_count'] is None:
+            # 전체 서비스 수를 모르면 나눠 줄 페이지 범위도 모르므로 이 워커가 마지막 페이지를 찾으며 모두 수집한다
+            page_results = {1: first['services']}
+            category_crawler._probe_pages(task.payload['category_id'], page_results, CATEGORY_PAGE_WORKERS)
+            services = [info for page_idx in sorted(page_results) for info in page_results[page_idx] or []]
+            enqueue_sellers(broker, services)
+            return {**first, 'services': services}
+        broker.enqueue_many('category_page', [
+            (f"{task.key}:{page_idx}", {'category_id': task.payload['category_id'], 'page': page_idx}, 0)
+            for page_idx in range(2, first['page_count'] + 1)
+        ])
+        enqueue_sellers(broker, first['services'])
+        return first
 
-    for seller_idx, seller_name in enumerate(profile_crawler.seller_names):
-        log(f"{seller_name} [{seller_idx+1}/{len(profile_crawler.seller_names)}]")
-        profile = profile_crawler.crawl_profile(seller_name)
-        profiles.append(profile)
+    def crawl_category_page(crawlers, task):
+        category_crawler, _ = crawlers
+        services = category_crawler._crawl_category_page(task.payload['category_id'], task.payload['page'])
+        enqueue_sellers(broker, services)
+        return services
 
-    return profiles
+    def crawl_seller(crawlers, task):
+        _, profile_crawler = crawlers
+        return profile_crawler.crawl_profile(task.key)
+
+    return {'category': crawl_category, 'category_page': crawl_category_page, 'seller': crawl_seller}
+
+def run_worker(broker, max_in_flight=MAX_IN_FLIGHT, archive=None):
+    # 노드마다 실행하는 상태 없는 워커: 브로커에서 작업을 빌려 처리하고 결과를 브로커에 올린다
+    # 받은 페이지 원본은 노드마다 자기 보관소에 남긴다
+    fetcher = HttpFetcher(pool_size=max_in_flight)
+    with DriverPool(size=max_in_flight, factory=profile_driver) as driver_pool:
+        contexts = [(CategoryCrawler(fetcher=fetcher, driver_pool=driver_pool, archive=archive),
+                     ProfileCrawler(seller_names=[], fetcher=fetcher, driver_pool=driver_pool, archive=archive))
+                    for _ in range(max_in_flight)]
+        worker = BrokerWorker(broker, distributed_handlers(broker), contexts)
+        try:
+            processed = worker.run()
+        finally:
+            for category_crawler, profile_crawler in contexts:
+                category_crawler.close()
+                profile_crawler.close()
+            fetcher.close()
+    log(f"워커 {worker.worker_id}: {processed}개 작업 처리")
+
+def collect_results(broker):
+    # 브로커 결과 저장소에서 서비스, 프로필을 모아 단일 실행과 같은 CSV로 저장
+    service_rows = []
+    seen_links = set()
+    pages = [(payload['category_id'], result['services'] if kind == 'category' else result)
+             for kind in ['category', 'category_page']
+             for _, payload, result in broker.results(kind)]
+    for category_id, services in pages:
+        for info in services or []:
+            if info[2] not in seen_links:
+                seen_links.add(info[2])
+                service_rows.append(info[:3] + [category_id, info[3] if len(info) > 3 else None])
+    with CsvSink('output/services.csv', SERVICE_COLUMNS) as sink:
+        sink.write_many(service_rows)
+
+    with CsvSink('output/profiles.csv', PROFILE_COLUMNS) as sink:
+        for _, _, profile in broker.results('seller'):
+            sink.write(profile)
+        profile_count = sink.count
+    log(f"서비스 {len(service_rows)}개, 프로필 {profile_count}개 저장 완료")
+
+def coordinate(broker, category_ids, poll_seconds=30):
+    # 카테고리를 큐에 넣고, 모든 노드의 작업이 끝날 때까지 진행 상황을 보여준 뒤 결과를 합친다
+    # 실행을 마쳤다는 표시를 남겨야 워커가 종료한다
+    broker.open_run()
+    broker.enqueue_many('category', [(category_id, {'category_id': category_id}, 0) for category_id in category_ids])
+    while broker.remaining() > 0:
+        log(f"남은 작업 {broker.remaining()}개 {broker.counts()}")
+        time.sleep(poll_seconds)
+    broker.close_run()
+    log(f"모든 작업 완료 {broker.counts()}")
+    collect_results(broker)
+
+def reextract_archive(archive):
+    # 보관한 원본 페이지로 추출만 다시 실행해 수집 결과 CSV를 다시 만든다 (네트워크, 브라우저 없음)
+    # 선택자를 고친 뒤 전체를 다시 수집하지 않고 여러 프로세스로 몇 분 안에 반영할 수 있다
+    results = extract_archive(archive)
+    services = service_rows(results)
+    if services:
+        with CsvSink('output/services.csv', SERVICE_COLUMNS) as sink:
+            sink.write_many(services)
+    profiles = profile_records(results)
+    if profiles:
+        with CsvSink('output/profiles.csv', PROFILE_COLUMNS) as sink:
+            sink.write_many(profiles)
+    gigs = gig_records(results)
+    if gigs:
+        with CsvSink('output/gigs.csv', GIG_COLUMNS) as sink:
+            sink.write_many(gigs)
+    log(f"서비스 {len(services)}개, 프로필 {len(profiles)}개, 서비스 정보 {len(gigs)}개 다시 추출 완료")
+
+def normalize_data():
+    # profiles.csv의 중첩 셀을 테이블로 나눠 SQLite(가능하면 Parquet도)에 한 번에 적재
+    normalizer = ProfileNormalizer()
+    profiles = normalizer.load_profiles('output/profiles.csv')
+    services = normalizer.load_services('output/services.csv') if os.path.exists('output/services.csv') else None
+    tables = normalizer.normalize(profiles, services)
+    normalizer.save_sqlite(tables, 'output/kmong.db')
+    try:
+        normalizer.save_parquet(tables, 'output/tables')
+    except ImportError:
+        log("pyarrow가 없어 Parquet 저장은 건너뜁니다.")
+    return tables
 
 def main():
-    choice = input("1. 카테고리별 판매자 크롤링\n2. 판매자별 프로필, 리뷰 크롤링\n3. 서비스 정보 크롤링\n4. 데이터 정제\n5. All-in-One\n: ")
-    process_count = 3
-    # process_count = input("가동할 프로세스 수를 입력하세요(기본=1) :")
+    choice = input("1. 카테고리별 판매자 크롤링\n2. 판매자별 프로필, 리뷰 크롤링\n3. 서비스 정보 크롤링\n4. 데이터 정제\n5. All-in-One\n"
+                   "6. 분산 수집 (코디네이터)\n7. 분산 수집 (워커)\n8. 저장된 페이지로 다시 추출 (오프라인)\n: ")
+    max_in_flight = MAX_IN_FLIGHT
+    # max_in_flight = input(f"동시 처리 수를 입력하세요(기본={MAX_IN_FLIGHT}) :")
     try:
-        process_count = int(process_count)
+        max_in_flight = int(max_in_flight)
     except:
-        if process_count == "":
-            process_count = 1
+        if max_in_flight == "":
+            max_in_flight = MAX_IN_FLIGHT
         else:
-            log(f"프로세스 수는 숫자를 입력해야 합니다.")
+            log(f"동시 처리 수는 숫자를 입력해야 합니다.")
             return
 
     if choice in ['1', '5']:
@@ -45,48 +301,131 @@ def main():
         category_ids = input("검색할 카테고리 id를 입력하세요 (기본값 : [605, 661, 663, 645])\n: ")
         if category_ids == "":
             category_ids = [605, 661, 663, 645]
+        else:
+            category_ids = [int(category_id) for category_id in category_ids.replace(",", " ").split()]
 
-        category_crawler = CategoryCrawler()
+        # 페이지별 HTTP 응답에 서비스 카드가 없을 때만 브라우저를 띄운다
+        driver_pool = DriverPool(size=CATEGORY_PAGE_WORKERS)
+        archive = open_archive()
+        category_crawler = CategoryCrawler(driver_pool=driver_pool, archive=archive)
+        state_store = CrawlStateStore()
+        # 이어서 수집하지 않으면 완료된 카테고리/페이지의 저장된 목록을 지우고 모두 다시 수집
+        if input("이전 진행 상태에서 이어서 수집할까요? (Y/n)\n: ").strip().lower() == "n":
+            state_store.reset('category')
+            state_store.reset('category_page')
 
         all_service_infos = []
         try:
             for category_id in category_ids:
-                service_amount, service_list = category_crawler.crawl_category(category_id)
+                service_amount, service_list = category_crawler.crawl_category_pages(category_id, state_store=state_store)
                 all_service_infos.extend(service_list)
                 log(f"카테고리 {category_id} : 총 {service_amount}개 서비스 수집 완료")
             
             category_crawler.save_result(all_service_infos)
         except Exception as e:
             log(f"카테고리 크롤링 실패: {e}")
+        finally:
+            category_crawler.close()
+            driver_pool.close()
+            state_store.close()
+            close_archive(archive)
     elif choice in ['2', '5']:
         log("=== 판매자별 프로필, 리뷰 크롤링 시작 ===")
-        merged_profiles = []
         seller_names = get_seller_names()
-        chunk_size = len(seller_names) // process_count
-        seller_name_chunks = []
-        for i in range(process_count):
-            start_idx = i*chunk_size
-            if i==process_count - 1:
-                end_idx = len(seller_names)
-            else:
-                end_idx = (i+1)*chunk_size
-            seller_name_chunks.append(seller_names[start_idx:end_idx])
-
-        if process_count > 1:
-            pool = Pool(processes=process_count)
-            results = pool.map(crawl_profiles, seller_name_chunks)
-            for result in results:
-                merged_profiles.extend(result)
+        state_store = CrawlStateStore()
+        # 새 수집 회차는 진행 상태만 지우고, 변경 감지용 지문은 유지해 바뀐 판매자만 다시 수집
+        resume = input("이전 진행 상태에서 이어서 수집할까요? (Y/n)\n: ").strip().lower() != "n"
+        if not resume:
+            state_store.reset('seller')
+        sink = PartitionedSink('output/parts', 'profiles', PROFILE_COLUMNS, append=resume)
+        freshness = FreshnessStore()
+        archive = open_archive()
+        try:
+            with DriverPool(size=max_in_flight, factory=profile_driver) as driver_pool:
+                crawl_profiles(seller_names, driver_pool, state_store, sink, freshness, max_in_flight=max_in_flight,
+                               archive=archive)
+        finally:
+            state_store.close()
+            freshness.close()
+            close_archive(archive)
+
+        # 워커별 part 파일을 한 줄씩 이어 붙여 최종 CSV를 만든다 (전체를 메모리에 올리지 않음)
+        profile_count = sink.merge('output/profiles.csv', key='seller_name')
+        log(f"판매자 {len(seller_names)}명 : 총 {profile_count}개 프로필 수집 완료")
+        for host, stats in default_throttle.stats().items():
+            log(f"{host} 요청 속도: 초당 {stats['rate']}회, 동시 {stats['concurrency']}개, 평균 응답 {stats['latency']}초")
+
+    elif choice in ['3', '5']:
+        log("=== 서비스 정보 크롤링 시작 ===")
+        links = get_service_links()
+        state_store = CrawlStateStore()
+        resume = input("이전 진행 상태에서 이어서 수집할까요? (Y/n)\n: ").strip().lower() != "n"
+        if not resume:
+            state_store.reset('gig')
+        sink = PartitionedSink('output/parts', 'gigs', GIG_COLUMNS, append=resume)
+        archive = open_archive()
+        try:
+            with DriverPool(size=max_in_flight) as driver_pool:
+                crawl_gigs(links, driver_pool, state_store, sink, max_in_flight=max_in_flight, archive=archive)
+        finally:
+            state_store.close()
+            close_archive(archive)
+
+        gig_count = sink.merge('output/gigs.csv', key='service_url')
+        log(f"서비스 {len(links)}개 : 총 {gig_count}개 서비스 정보 수집 완료")
+
+    elif choice == '6':
+        log("=== 분산 수집 코디네이터 시작 ===")
+        log(DISTRIBUTED_HELP)
+        category_ids = input("검색할 카테고리 id를 입력하세요 (기본값 : [605, 661, 663, 645])\n: ")
+        if category_ids == "":
+            category_ids = [605, 661, 663, 645]
         else:
-            merged_profiles = crawl_profiles()
+            category_ids = [int(category_id) for category_id in category_ids.replace(",", " ").split()]
+        broker = TaskBroker()
+        if input("이전 작업 큐를 비우고 새로 시작할까요? (y/N)\n: ").strip().lower() == "y":
+            broker.reset()
+        try:
+            coordinate(broker, category_ids)
+        finally:
+            broker.close()
+
+    elif choice == '7':
+        log("=== 분산 수집 워커 시작 ===")
+        log(DISTRIBUTED_HELP)
+        broker = TaskBroker()
+        archive = open_archive()
+        try:
+            run_worker(broker, max_in_flight=max_in_flight, archive=archive)
+        finally:
+            broker.close()
+            close_archive(archive)
 
-        df = pd.DataFrame(merged_profiles)
-        print(df)
-        df.to_csv('output/profiles.csv', mode='w', header=True, index=False, encoding='utf-8-sig')
-        log(f"판매자 {len(seller_names)}명 : 총 {len(merged_profiles)}개 프로필 수집 완료")
+    elif choice == '8':
+        log("=== 저장된 페이지로 다시 추출 ===")
+        archive = PageArchive()
+        stats = archive.stats()
+        log(f"보관한 페이지 {stats['pages']}개 (URL {stats['urls']}개), 원본 {stats['size'] // 1024}KiB → 압축 {stats['stored'] // 1024}KiB")
+        try:
+            reextract_archive(archive)
+        finally:
+            archive.close()
+
+    elif choice == '4':
+        log("=== 데이터 정제 시작 ===")
+        tables = normalize_data()
+        log("=== 카테고리별 수익 구조 분석 ===")
+        analyzer = CategoryAnalyzer.from_tables(tables)
+        analyzer.save(analyzer.run_all(), 'output/analysis')
         
     else:
         log(f"에러입니다.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # METRICS_LIVE_INTERVAL > 0이면 실행 중에도 지표 파일을 주기적으로 갱신
+    metrics.start_live_export(METRICS_LIVE_INTERVAL)
+    try:
+        main()
+    finally:
+        metrics.stop_live_export()
+        log(f"수집 지표 저장: {metrics.save()}")
\ No newline at end of file
@@ -0,0 +1,184 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+
+import zstandard
+
+from src.utils.config import ARCHIVE_DIR, ARCHIVE_SEGMENT_MB, ARCHIVE_ZSTD_LEVEL
+
+ZSTD = 'zstd'
+# zstandard가 선택 의존성이던 때 zlib으로 압축해 둔 보관소를 읽기 위해서만 남겨 둔다
+ZLIB = 'zlib'
+
+
+def page_kind(url):
+    """URL로 페이지 종류를 정한다 (오프라인 재추출 때 어떤 추출기를 쓸지 고르는 기준)"""
+    path = urlsplit(url).path
+    if path.startswith('/category/'):
+        return 'category'
+    if path.startswith('/gig/'):
+        return 'gig'
+    if path.startswith('/@'):
+        return 'portfolio' if path.rstrip('/').endswith('/portfolios') else 'profile'
+    return 'other'
+
+
+def compress(data, level=ARCHIVE_ZSTD_LEVEL):
+    """(압축 방식, 압축한 바이트). 새로 보관하는 페이지는 항상 zstd로 압축한다"""
+    return ZSTD, zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def decompress(codec, data):
+    if codec == ZSTD:
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"알 수 없는 압축 방식: {codec}")
+
+
+def read_blob(location):
+    """색인의 위치 정보(directory, segment, offset, length, codec)로 본문을 읽는다
+
+    색인(SQLite) 없이 세그먼트 파일만 읽으므로 다른 프로세스에서도 그대로 쓸 수 있다.
+    """
+    with open(os.path.join(location['directory'], location['segment']), 'rb') as f:
+        f.seek(location['offset'])
+        data = f.read(location['length'])
+    return decompress(location['codec'], data).decode('utf-8')
+
+
+class PageArchive:
+    """받은 페이지 원본을 URL, 수집 시각별로 보관하는 추가 전용 저장소
+
+    본문은 내용 해시(sha256)로 한 번만 저장한다(같은 내용을 다시 받으면 색인만 추가).
+    압축한 본문은 segment_mb를 넘을 때까지 한 세그먼트 파일에 이어 쓰고, 위치는 SQLite 색인에 둔다.
+    선택자가 바뀌어도 다시 수집하지 않고 보관한 페이지로 추출을 다시 할 수 있다.
+    """
+    def __init__(self, directory=ARCHIVE_DIR, segment_mb=ARCHIVE_SEGMENT_MB):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_bytes = segment_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                codec TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                key TEXT,
+                fetched_at REAL NOT NULL,
+                digest TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url, fetched_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_kind ON pages (kind)")
+        self._conn.commit()
+        self._segment = self._last_segment()
+        self._file = None
+
+    def _last_segment(self):
+        segments = sorted(name for name in os.listdir(self.directory) if name.endswith('.seg'))
+        return segments[-1] if segments else 'pages-000001.seg'
+
+    def _open_segment(self, size):
+        # 현재 세그먼트가 가득 차면 다음 번호의 세그먼트로 넘어간다
+        path = os.path.join(self.directory, self._segment)
+        if os.path.exists(path) and os.path.getsize(path) > 0 and os.path.getsize(path) + size > self.segment_bytes:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            number = int(self._segment.split('-')[1].split('.')[0]) + 1
+            self._segment = f"pages-{number:06d}.seg"
+        if self._file is None:
+            self._file = open(os.path.join(self.directory, self._segment), 'ab')
+        return self._file
+
+    def put(self, url, text, kind=None, key=None, fetched_at=None):
+        """페이지 본문 저장. 내용 해시를 돌려준다"""
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if known is None:
+            # 압축은 락 밖에서 해서 여러 스레드가 동시에 저장할 수 있게 한다
+            codec, compressed = compress(data)
+        with self._lock:
+            if known is None and self._conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone() is None:
+                segment_file = self._open_segment(len(compressed))
+                offset = segment_file.tell()
+                segment_file.write(compressed)
+                segment_file.flush()
+                self._conn.execute(
+                    "INSERT INTO blobs (digest, segment, offset, length, size, codec) VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, self._segment, offset, len(compressed), len(data), codec),
+                )
+            self._conn.execute(
+                "INSERT INTO pages (url, kind, key, fetched_at, digest) VALUES (?, ?, ?, ?, ?)",
+                (url, kind or page_kind(url), key, fetched_at, digest),
+            )
+            self._conn.commit()
+        return digest
+
+    def _location(self, segment, offset, length, codec):
+        return {'directory': self.directory, 'segment': segment, 'offset': offset, 'length': length, 'codec': codec}
+
+    def get(self, url, at=None):
+        """at(기본: 지금) 이전에 받은 url의 가장 최근 본문. 없으면 None"""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT b.segment, b.offset, b.length, b.codec FROM pages p JOIN blobs b ON b.digest = p.digest
+                WHERE p.url = ? AND p.fetched_at <= ? ORDER BY p.fetched_at DESC LIMIT 1
+            """, (url, at or time.time())).fetchone()
+        return read_blob(self._location(*row)) if row else None
+
+    def latest(self, kinds=None, at=None):
+        """URL별로 at 이전의 가장 최근 페이지 목록 [{'url', 'kind', 'key', 'fetched_at', 'location'}, ...]
+
+        같은 세그먼트의 페이지가 이어지도록 위치 순서로 돌려준다.
+        """
+        kind_filter = ""
+        params = [at or time.time()]
+        if kinds:
+            kind_filter = f"AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT p.url, p.kind, p.key, p.fetched_at, b.segment, b.offset, b.length, b.codec
+                FROM pages p JOIN blobs b ON b.digest = p.digest
+                WHERE p.id IN (SELECT MAX(id) FROM pages WHERE fetched_at <= ? {kind_filter} GROUP BY url)
+                ORDER BY b.segment, b.offset
+            """, params).fetchall()
+        return [{'url': url, 'kind': kind, 'key': key, 'fetched_at': fetched_at,
+                 'location': self._location(segment, offset, length, codec)}
+                for url, kind, key, fetched_at, segment, offset, length, codec in rows]
+
+    def stats(self):
+        with self._lock:
+            pages, urls = self._conn.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM pages").fetchone()
+            blobs, size, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length), 0) FROM blobs"
+            ).fetchone()
+        return {'pages': pages, 'urls': urls, 'blobs': blobs, 'size': size, 'stored': stored}
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._conn.close()
@@ -0,0 +1,293 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from src.utils.config import (
+    BROKER_DB_PATH, LEASE_SECONDS, HEARTBEAT_SECONDS, BROKER_POLL_SECONDS, BROKER_STARTUP_GRACE_SECONDS, MAX_ATTEMPTS,
+)
+from src.utils.helpers import log
+from src.utils.metrics import metrics
+
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Task:
+    """브로커에서 빌려 온 작업 하나"""
+    def __init__(self, id, kind, key, payload, attempts):
+        self.id = id
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"{self.kind}:{self.key}"
+
+
+class TaskBroker:
+    """여러 노드의 워커가 함께 쓰는 SQLite 작업 큐 겸 결과 저장소
+
+    워커는 작업을 lease_seconds 동안 빌려 가고(가시성 타임아웃), 처리 중에는 heartbeat로 임대를
+    연장한다. 워커가 죽어 임대가 만료되면 다른 워커가 다시 가져간다. 같은 (kind, key) 작업은 한 번만
+    들어가며, 대기 중인 작업은 priority가 큰 것부터 나간다.
+
+    여러 호스트에서 쓸 때는 모든 노드가 BROKER_DB_PATH를 같은 공유 폴더의 파일로 지정한다
+    (공유 폴더는 파일 잠금(fcntl/SMB 잠금)을 지원해야 한다).
+
+    코디네이터는 작업을 넣기 전에 open_run(), 모든 작업이 끝나면 close_run()을 호출한다.
+    워커는 이 완료 표시를 보고서야 종료하므로 코디네이터보다 먼저 시작해도 된다.
+    """
+    def __init__(self, path=BROKER_DB_PATH, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        # 여러 호스트가 공유 폴더(NFS/SMB)의 같은 파일을 연다. WAL은 한 호스트 안의 공유 메모리가 필요해
+        # 네트워크 파일 시스템에서는 깨지므로, 파일 잠금만 쓰는 롤백 저널을 쓴다
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT,
+                priority REAL NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                result TEXT,
+                error TEXT,
+                updated_at REAL,
+                UNIQUE (kind, key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_queue ON tasks (status, priority DESC, id)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS broker_state (name TEXT PRIMARY KEY, value REAL)")
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def enqueue(self, kind, key, payload=None, priority=0):
+        self.enqueue_many(kind, [(key, payload, priority)])
+
+    def enqueue_many(self, kind, tasks):
+        """(key, payload, priority) 목록 추가. 이미 대기 중인 작업은 priority만 더한다"""
+        rows = [(kind, str(key), json.dumps(payload, ensure_ascii=False), priority or 0, QUEUED, time.time())
+                for key, payload, priority in tasks]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("""
+                    INSERT INTO tasks (kind, key, payload, priority, status, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (kind, key) DO UPDATE SET priority = priority + excluded.priority
+                    WHERE status = 'queued'
+                """, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def lease(self, worker_id, kinds=None):
+        """대기 중이거나 임대가 만료된 작업 하나를 worker_id에게 빌려준다. 없으면 None
+
+        임대가 만료된 작업은 재시도 횟수가 남았을 때만 다시 빌려주고, 다 썼으면 실패로 기록한다.
+        """
+        now = time.time()
+        kind_filter = ""
+        params = [now, self.max_attempts]
+        if kinds:
+            kind_filter = f"AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 처리 중에 워커가 계속 죽는 작업이 끝없이 다시 나가지 않게 한다
+                self._conn.execute("""
+                    UPDATE tasks SET status = ?, error = ?, lease_owner = NULL, updated_at = ?
+                    WHERE status = ? AND lease_expires < ? AND attempts >= ?
+                """, (FAILED, "임대 만료 (재시도 횟수 초과)", now, LEASED, now, self.max_attempts))
+                row = self._conn.execute(f"""
+                    SELECT id, kind, key, payload, attempts FROM tasks
+                    WHERE (status = 'queued' OR (status = 'leased' AND lease_expires < ? AND attempts < ?)) {kind_filter}
+                    ORDER BY priority DESC, id LIMIT 1
+                """, params).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute("""
+                    UPDATE tasks SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?,
+                        updated_at = ? WHERE id = ?
+                """, (LEASED, worker_id, now + self.lease_seconds, now, row[0]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        task_id, kind, key, payload, attempts = row
+        return Task(task_id, kind, key, json.loads(payload) if payload else None, attempts + 1)
+
+    def heartbeat(self, task_ids, worker_id):
+        """처리 중인 작업의 임대 연장"""
+        if not task_ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                [(now + self.lease_seconds, now, task_id, LEASED, worker_id) for task_id in task_ids],
+            )
+
+    def complete(self, task, result, worker_id):
+        """결과 기록. 임대가 만료되어 다른 워커에게 넘어간 작업이면 기록하지 않고 False"""
+        return self._execute(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND status = ? AND lease_owner = ?",
+            (DONE, json.dumps(result, ensure_ascii=False), time.time(), task.id, LEASED, worker_id),
+        ).rowcount > 0
+
+    def fail(self, task, error, worker_id):
+        """재시도 횟수가 남았으면 다시 대기열로, 아니면 실패로 기록. 임대를 잃은 작업이면 False"""
+        status = FAILED if task.attempts >= self.max_attempts else QUEUED
+        return self._execute(
+            "UPDATE tasks SET status = ?, error = ?, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND status = ? AND lease_owner = ?",
+            (status, str(error), time.time(), task.id, LEASED, worker_id),
+        ).rowcount > 0
+
+    def results(self, kind):
+        """완료된 작업의 (key, payload, result) 목록 (추가된 순서)"""
+        rows = self._execute(
+            "SELECT key, payload, result FROM tasks WHERE kind = ? AND status = ? ORDER BY id", (kind, DONE)
+        ).fetchall()
+        return [(key, json.loads(payload) if payload else None, json.loads(result)) for key, payload, result in rows]
+
+    def counts(self):
+        rows = self._execute("SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status").fetchall()
+        counts = {}
+        for kind, status, count in rows:
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+    def remaining(self):
+        """아직 끝나지 않은(대기 중이거나 임대 중인) 작업 수"""
+        return self._execute(
+            "SELECT COUNT(*) FROM tasks WHERE status IN (?, ?)", (QUEUED, LEASED)
+        ).fetchone()[0]
+
+    def open_run(self):
+        """코디네이터가 작업을 넣기 전에 호출: 이전 실행의 완료 표시를 지운다"""
+        self._execute("DELETE FROM broker_state WHERE name = 'run_closed'")
+
+    def close_run(self):
+        """코디네이터가 모든 작업이 끝난 뒤 호출: 워커가 종료해도 된다는 표시"""
+        self._execute("INSERT OR REPLACE INTO broker_state (name, value) VALUES ('run_closed', ?)", (time.time(),))
+
+    def run_closed_at(self):
+        """코디네이터가 실행을 마친 시각. 실행 중이거나 코디네이터가 아직 없으면 None"""
+        row = self._execute("SELECT value FROM broker_state WHERE name = 'run_closed'").fetchone()
+        return row[0] if row else None
+
+    def reset(self):
+        self._execute("DELETE FROM tasks")
+        self._execute("DELETE FROM broker_state")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class BrokerWorker:
+    """브로커에서 작업을 빌려 handlers[kind](context, task)로 처리하고 결과를 올리는 상태 없는 워커
+
+    contexts(예: 크롤러 묶음)마다 스레드를 하나씩 띄운다. 처리 중인 작업은 별도 스레드가
+    heartbeat_seconds마다 임대를 연장한다. 남은 작업이 없고 코디네이터가 실행을 마쳤으면 종료한다.
+    워커 시작 전에 남은 완료 표시(이전 실행)는 startup_grace초 동안 새 코디네이터를 기다린 뒤에만 믿는다.
+    """
+    def __init__(self, broker, handlers, contexts, worker_id=None, heartbeat_seconds=HEARTBEAT_SECONDS,
+                 poll_seconds=BROKER_POLL_SECONDS, startup_grace=BROKER_STARTUP_GRACE_SECONDS):
+        self.broker = broker
+        self.handlers = handlers
+        self.contexts = contexts
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.startup_grace = startup_grace
+        self.processed = 0
+        self._started_at = time.time()
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            with self._lock:
+                task_ids = list(self._active)
+            try:
+                self.broker.heartbeat(task_ids, self.worker_id)
+            except Exception as e:
+                log(f"임대 연장 실패: {e}")
+
+    def _process(self, context, task):
+        with self._lock:
+            self._active[task.id] = task
+        try:
+            result = self.handlers[task.kind](context, task)
+        except Exception as e:
+            log(f"작업 실패: {task} ({e})")
+            metrics.inc('failures', stage=task.kind)
+            if not self.broker.fail(task, e, self.worker_id):
+                log(f"임대가 만료된 작업이라 실패를 기록하지 않습니다: {task}")
+        else:
+            if not self.broker.complete(task, result, self.worker_id):
+                log(f"임대가 만료되어 다른 워커에게 넘어간 작업이라 결과를 버립니다: {task}")
+                return
+            metrics.inc('tasks', worker=True, kind=task.kind)
+            with self._lock:
+                self.processed += 1
+            log(f"{task} 완료 [{self.worker_id}]")
+        finally:
+            with self._lock:
+                self._active.pop(task.id, None)
+
+    def _work_loop(self, context):
+        kinds = list(self.handlers)
+        while not self._stop.is_set():
+            task = self.broker.lease(self.worker_id, kinds)
+            if task is not None:
+                self._process(context, task)
+                continue
+            # 다른 노드가 처리 중인 작업이 남아 있거나 코디네이터가 아직 작업을 넣고 있으면
+            # 임대 만료나 새 작업을 기다린다
+            if self.broker.remaining() == 0 and self._run_closed():
+                return
+            time.sleep(self.poll_seconds)
+
+    def _run_closed(self):
+        closed_at = self.broker.run_closed_at()
+        if closed_at is None:
+            return False
+        return closed_at >= self._started_at or time.time() - self._started_at >= self.startup_grace
+
+    def run(self):
+        self._started_at = time.time()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat.start()
+        threads = [threading.Thread(target=self._work_loop, args=(context,)) for context in self.contexts]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            self._stop.set()
+        return self.processed
@@ -1,64 +1,252 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
 import pandas as pd
 import json
-from datetime import datetime
 import time
-import re
-from bs4 import BeautifulSoup
 import csv
-from random import random
+import math
+
+from src.crawler import hydration, readiness
+from src.crawler.data_extractor import default_spec
+from src.crawler.document import DocumentCache, parse_html
+from src.crawler.driver_pool import DriverPool
+from src.crawler.fetcher import HttpFetcher
+from src.crawler.freshness import fingerprint
+from src.crawler.pipeline import StagedPipeline, process_pool
+from src.crawler.review_api import default_review_api, parse_reviews
+from src.crawler.scheduler import CrawlScheduler, default_throttle
+from src.data.sink import CsvSink
+from src.utils.config import (
+    BASE_URL, PROFILE_MARKERS, CATEGORY_PAGE_WORKERS, CATEGORY_MAX_PAGES, REVIEW_API_WORKERS, REVIEW_MAX_PAGES,
+    HYDRATION_ENABLED, BROWSER_EXTRACTION,
+)
+from src.utils.helpers import log
+from src.utils.metrics import metrics
+
+REVIEW_CARD_SELECTOR = '.ProfileRateEvaluationSection__list-group .RatingList'
+SERVICE_COLUMNS = ['서비스명', '판매자', '링크', '카테고리', '리뷰수']
+PROFILE_COLUMNS = ['seller_name', 'profile_url', 'introduction', 'career', 'specialties', 'skills',
+                   'total_jobs', 'reviews', 'portfolios']
+GIG_COLUMNS = ['service_url', 'packages', 'skill_level', 'team_size']
+PACKAGE_TYPES = ['STANDARD', 'DELUXE', 'PREMIUM']
+PACKAGE_BUTTON_CLASSES = 'flex h-[50px] w-[119px]'
+PACKAGE_PANEL_CLASSES = 'w-full rounded-b-lg border border-gray-300'
+
+# 서비스 상세 페이지의 패키지 탭 패널(숨겨진 것 포함)과 기술 수준, 팀 규모를 브라우저 안에서 읽는다.
+# _gig_from_soup과 같은 결과를 JSON 문자열로 돌려준다 (arguments: 패키지 이름 목록, 탭 버튼 클래스, 탭 패널 클래스)
+GIG_EXTRACT_SCRIPT = """
+const [PACKAGE_TYPES, BUTTON_CLASSES, PANEL_CLASSES] = arguments;
+const hasClasses = (element, classes) => classes.split(' ').every(name => element.classList.contains(name));
+const withClasses = (root, tag, classes) => [...root.getElementsByTagName(tag)].filter(element => hasClasses(element, classes));
+function strippedText(element) {
+    // BeautifulSoup get_text(strip=True)와 같이 텍스트 조각마다 공백을 지우고 이어 붙인다
+    const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+    let text = '';
+    while (walker.nextNode()) text += walker.currentNode.nodeValue.trim();
+    return text;
+}
+function firstText(root, tag, classes) {
+    const found = withClasses(root, tag, classes);
+    return found.length ? strippedText(found[0]) : '';
+}
+function details(panel) {
+    const result = {included_features: [], specifications: {}};
+    for (const item of withClasses(panel, 'div', 'flex basis-1/2')) {
+        const texts = withClasses(item, 'p', 'text-sm').map(strippedText);
+        if (!texts.length) continue;
+        if (item.querySelector('svg') || texts.length < 2) result.included_features.push(texts[0]);
+        else result.specifications[texts[0]] = texts[1];
+    }
+    return result;
+}
+function packageFromPanel(panel) {
+    const price = firstText(panel, 'div', 'text-[18px] font-bold');
+    if (!price) return null;
+    return {
+        price: price,
+        title: firstText(panel, 'p', 'text-[14px] font-bold'),
+        description: firstText(panel, 'p', 'whitespace-pre-wrap'),
+        details: details(panel),
+    };
+}
+function packages() {
+    const aside = document.querySelector('aside');
+    if (!aside) return {};
+    const panels = withClasses(aside, 'div', PANEL_CLASSES);
+    // 선택한 탭의 패널만 그려져 있으면 탭을 눌러 읽어야 한다
+    if (panels.length < withClasses(aside, 'button', BUTTON_CLASSES).length) return null;
+    if (panels.length <= 1) {
+        const single = packageFromPanel(panels.length ? panels[0] : aside);
+        return single ? {SINGLE: single} : {};
+    }
+    const result = {};
+    panels.forEach((panel, i) => {
+        const found = packageFromPanel(panel);
+        if (found) result[i < PACKAGE_TYPES.length ? PACKAGE_TYPES[i] : 'PACKAGE_' + (i + 1)] = found;
+    });
+    return result;
+}
+function infoValue(keywords) {
+    const box = document.getElementById('10');
+    if (!box) return '';
+    const texts = document.createTreeWalker(box, NodeFilter.SHOW_TEXT);
+    while (texts.nextNode()) {
+        if (!keywords.some(keyword => texts.currentNode.nodeValue.includes(keyword))) continue;
+        const parent = texts.currentNode.parentElement;
+        if (!parent) continue;
+        // 부모 다음(문서 순서)의 첫 span
+        const following = document.createTreeWalker(document.body, NodeFilter.SHOW_ELEMENT);
+        following.currentNode = parent;
+        let span = null;
+        while (following.nextNode()) {
+            if (following.currentNode.tagName === 'SPAN') { span = following.currentNode; break; }
+        }
+        if (span && strippedText(span)) return strippedText(span);
+    }
+    return '';
+}
+return JSON.stringify({
+    packages: packages(),
+    skill_level: infoValue(['기술', '수준']),
+    team_size: infoValue(['팀', '규모']),
+});
+"""
 
-def log(message):
-    print(f"{datetime.now().strftime("%H:%M:%S.%f")[:-3]} {message}")
 class BaseCrawler:
-    def __init__(self):
-        time.sleep(random())
-        self.driver = self._setup_driver()
-
-    def _setup_driver(self):
-        options = Options()
-        # options.add_argument('headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-        driver = webdriver.Chrome(options=options)
-        driver.implicitly_wait(2)
-
-        return driver
+    def __init__(self, fetcher=None, throttle=None, driver_pool=None, archive=None):
+        self._session = None
+        self._owns_fetcher = fetcher is None
+        self._owns_pool = driver_pool is None
+        self.fetcher = fetcher if fetcher is not None else HttpFetcher()
+        self.throttle = throttle if throttle is not None else default_throttle
+        self.driver_pool = driver_pool if driver_pool is not None else DriverPool(size=1)
+        self.documents = DocumentCache()
+        self.spec = default_spec
+        # 받은 페이지 원본을 보관해 두면 선택자를 고친 뒤 다시 수집하지 않고 추출만 다시 할 수 있다
+        self.archive = archive
+
+    @property
+    def driver(self):
+        # 브라우저는 HTTP 응답만으로 부족할 때 처음 필요한 시점에 풀에서 빌린다
+        if self._session is None:
+            self._session = self.driver_pool.acquire()
+        return self._session.driver
+
+    def release_driver(self):
+        if self._session is not None:
+            self.driver_pool.release(self._session)
+            self._session = None
+        self.documents.clear()
     
     def _extract_with_soup(self):
+        # DOM이 그대로면 이전에 파싱한 soup을 그대로 돌려준다
+        try:
+            return self.documents.from_driver(self.driver)
+        except Exception as e:
+            log(f"파싱 실패: {e}")
+            return None
+
+    def _extract_fields(self, *pages):
+        """브라우저에 열린 페이지에서 추출 명세의 pages 필드를 읽는다
+
+        BROWSER_EXTRACTION이면 브라우저 안에서 명세를 실행해 값만 받고, 실패하면 page_source를 파싱한다.
+        """
+        if BROWSER_EXTRACTION:
+            try:
+                return self.spec.extract_in_browser(self.driver, *pages)
+            except Exception as e:
+                log(f"브라우저 내 추출 실패, HTML을 파싱해 추출합니다: {e}")
+        soup = self._extract_with_soup()
+        return self.spec.extract(soup, *pages) if soup is not None else None
+
+    def _parse_page(self, parse, html):
+        # 파이프라인 밖에서는 파싱 단계의 순수 함수를 현재 스레드에서 실행한다. 실패하면 브라우저로 대체
+        if not html:
+            return None
+        try:
+            return parse(html)
+        except Exception as e:
+            log(f"파싱 실패: {e}")
+            return None
+
+    def _soup_from_html(self, html):
         try:
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = parse_html(html)
             return soup
         except Exception as e:
             log(f"파싱 실패: {e}")
             return None
+
+    def _get(self, url):
+        with self.throttle.slot(url):
+            self.throttle.wait(url)
+            started = time.monotonic()
+            with metrics.timer('driver_get'):
+                self.driver.get(url)
+            self.throttle.record(url, latency=time.monotonic() - started)
+        self._session.pages += 1
+        metrics.inc('pages', source='driver')
+
+    def _fetch(self, url, headers=None, kind=None, key=None, fetched_at=None):
+        # 응답 시간, 상태 코드, 차단 문구를 조절기에 알려 호스트별 요청 속도를 맞춘다
+        # 보관소가 있으면 정상 응답 본문을 kind(기본: URL로 판단), key, 수집 시각(기본: 지금)과 함께 보관한다
+        with self.throttle.slot(url):
+            self.throttle.wait(url)
+            started = time.monotonic()
+            try:
+                with metrics.timer('http_fetch'):
+                    result = self.fetcher.fetch(url, headers)
+            except Exception:
+                self.throttle.record(url, latency=time.monotonic() - started, error=True)
+                metrics.inc('failures', stage='http_fetch')
+                raise
+            metrics.inc('pages', source='http', status=result.status)
+            retry_after = result.headers.get('retry-after', "")
+            self.throttle.record(url, status=result.status, latency=time.monotonic() - started, text=result.text,
+                                 retry_after=int(retry_after) if retry_after.isdigit() else None)
+        if self.archive is not None and result.ok and result.text:
+            try:
+                with metrics.timer('archive_put'):
+                    self.archive.put(url, result.text, kind, key, fetched_at)
+            except Exception as e:
+                log(f"페이지 보관 실패: {url} ({e})")
+        return result
+
+    def _fetch_html(self, url):
+        try:
+            result = self._fetch(url)
+        except Exception as e:
+            log(f"HTTP 요청 실패: {url} ({e})")
+            return None
+        if not result.ok:
+            log(f"HTTP 응답 오류: {url} ({result.status})")
+            return None
+        return result.text
         
     def save_data(self, data, filename, columns=None):
         if not data:
             return
         
-        df = pd.DataFrame(data, columns=columns)
+        if columns is None:
+            columns = list(data[0].keys()) if isinstance(data[0], dict) else list(range(len(data[0])))
         filepath = f'output/{filename}.csv'
 
-        df.to_csv(filepath, mode='w', header=True, index=False, encoding='utf-8-sig')
+        with CsvSink(filepath, columns) as sink:
+            sink.write_many(data)
         log(f"데이터 저장 완료: {filepath} ({len(data)}개 레코드)")
     
     def close(self):
-        if self.driver:
-            self.driver.quit()
+        self.release_driver()
+        if self._owns_pool:
+            self.driver_pool.close()
+        if self._owns_fetcher:
+            self.fetcher.close()
     
 class CategoryCrawler(BaseCrawler):
-    def __init__(self):
-        super().__init__()
-        self.driver.get("https://kmong.com/category/661")
-        time.sleep(1)
+    def __init__(self, fetcher=None, throttle=None, driver_pool=None, archive=None):
+        super().__init__(fetcher, throttle, driver_pool, archive)
     
     def _parse_service_amount(self):
         WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME, 'css-enj2mu')))
@@ -66,33 +254,30 @@ class CategoryCrawler(BaseCrawler):
         return service_amount
     
     def _extract_service_infos(self):
-        info_list = []
-        soup = self._extract_with_soup()
-        if soup is None:
+        fields = self._extract_fields('category')
+        if fields is None:
             return None
-        service_list = soup.find_all("article", class_="edqw2x10")
-        
-        for service in service_list:
-            title = service.find("span", class_="text-[14px] font-bold leading-[21px] text-gray-900 mb-1 line-clamp-2").text
-            seller = service.find("span", "line-clamp-1 text-xs font-normal leading-[18px] text-gray-600").text
-            link = service.find("a").attrs['href']
-            # log([title, seller, link])
-            info_list.append([title, seller, link])
-
-        return info_list
+        return _service_rows(fields['services'])
 
     def crawl_category(self, category_id):
+        try:
+            return self._crawl_category(category_id)
+        finally:
+            self.release_driver()
+
+    def _crawl_category(self, category_id):
         service_list = []
         page_idx = 1
-        service_amount = self._parse_service_amount()
         
-        self.driver.get(f"https://kmong.com/category/{category_id}")
+        self._get(f"{BASE_URL}/category/{category_id}")
+        service_amount = self._parse_service_amount()
+
+        readiness.wait_for_selector(self.driver, 'article.edqw2x10')
 
         while True:
             log(f"Page {page_idx}")
 
             # 서비스 목록 파싱
-            WebDriverWait(self.driver, 10).until(EC.visibility_of_all_elements_located((By.CLASS_NAME, 'edqw2x10')))
 
             info_list = self._extract_service_infos()
 
@@ -106,7 +291,12 @@ class CategoryCrawler(BaseCrawler):
                 box = self.driver.find_element(By.CLASS_NAME, "e1t3wbc50")
                 next_page_btn = box.find_elements(By.TAG_NAME, "button")[-1]
                 if next_page_btn.is_enabled():
-                    next_page_btn.click()
+                    first_article = readiness.element_signature(self.driver, 'article.edqw2x10')
+                    self.throttle.wait(self.driver.current_url)
+                    with metrics.timer('pagination_click', target='category'):
+                        next_page_btn.click()
+                        # 첫 서비스 카드가 바뀌면 다음 페이지가 그려진 것
+                        readiness.wait_for_change(self.driver, 'article.edqw2x10', first_article)
                 else:
                     self.save_data(service_list, f"services_in_{category_id}")
                     return service_amount, service_list
@@ -114,22 +304,188 @@ class CategoryCrawler(BaseCrawler):
                 log("단일 페이지입니다.")
                 return service_amount, service_list
 
-            time.sleep(0.5+random())
             page_idx += 1
         
+    def _load_category_page(self, url):
+        """카테고리 페이지 하나의 {'service_amount', 'services'}
+
+        HTTP 응답의 __NEXT_DATA__ JSON에서 먼저 꺼내고, 없으면 서버 렌더링된 서비스 카드,
+        그것도 없으면 브라우저로 불러와 화면에서 추출한다.
+        """
+        fields = self._parse_page(parse_category_html, self._fetch_html(url))
+        return fields if fields is not None else self._load_category_in_browser(url)
+
+    def _load_category_in_browser(self, url):
+        try:
+            self._get(url)
+            readiness.wait_for_selector(self.driver, 'article.edqw2x10')
+            return _category_fields(self._extract_fields('category'))
+        finally:
+            self.release_driver()
+
+    def _crawl_category_page(self, category_id, page_idx):
+        url = _category_page_url(category_id, page_idx)
+        return self._category_page_services(url, page_idx, self._load_category_page(url))
+
+    def _category_page_services(self, url, page_idx, fields):
+        info_list = fields['services'] if fields is not None else None
+        if not info_list:
+            # 있어야 할 서비스 카드가 없으면 차단 신호로 보고 속도를 줄인다
+            self.throttle.record(url, empty=True)
+            raise ValueError(f"Page {page_idx}: 서비스 카드를 찾지 못했습니다.")
+        log(f"Page {page_idx}: {len(info_list)}개")
+        return info_list
+
+    def _crawl_first_page(self, category_id):
+        first_page = self._load_category_page(_category_page_url(category_id, 1))
+        if first_page is None:
+            raise ValueError(f"카테고리 {category_id} 첫 페이지를 불러오지 못했습니다.")
+        service_amount = first_page['service_amount']
+        services = first_page['services'] or []
+        if service_amount is None:
+            # 전체 서비스 수를 읽지 못했으면 0으로 보지 않고 페이지 수를 모르는 채로 둔다 (끝을 찾으며 수집)
+            page_count = None
+        else:
+            page_count = math.ceil(service_amount / len(services)) if services else 1
+        return {'service_amount': service_amount, 'page_count': page_count, 'services': services}
+
+    def crawl_category_pages(self, category_id, workers=CATEGORY_PAGE_WORKERS, state_store=None):
+        """?page=N 주소로 모든 페이지를 직접 불러와 병렬 수집 (클릭 페이지네이션 없음)
+
+        state_store를 주면 페이지별 결과를 기록하고, 이미 수집한 페이지는 다시 불러오지 않는다.
+        """
+        first = state_store.get_result('category', category_id) if state_store else None
+        if first is None:
+            try:
+                first = (state_store.track('category', category_id, self._crawl_first_page, category_id)
+                         if state_store else self._crawl_first_page(category_id))
+            except Exception as e:
+                log(e)
+                return 0, []
+        service_amount, page_count = first['service_amount'], first['page_count']
+        page_results = {1: first['services']}
+        if page_count is None:
+            log(f"카테고리 {category_id}: 전체 서비스 수를 알 수 없어 마지막 페이지를 찾으며 수집합니다.")
+            pages = self._probe_pages(category_id, page_results, workers, state_store)
+        else:
+            log(f"카테고리 {category_id}: {service_amount}개 서비스, {page_count}페이지")
+            pages = list(range(2, page_count + 1))
+            todo = self._pending_pages(category_id, pages, state_store)
+            if todo:
+                self._crawl_pages_staged(category_id, todo, page_results, workers, state_store)
+
+        if state_store:
+            # 이전 실행에서 수집한 페이지 결과도 함께 합친다
+            for page_idx in pages:
+                if page_results.get(page_idx) is None:
+                    page_results[page_idx] = state_store.get_result('category_page', f"{category_id}:{page_idx}")
+
+        # 페이지 순서대로 합치면서 링크 기준으로 중복 제거, 분석용으로 카테고리 id를 붙인다
+        # 리뷰 수는 프로필 수집 순서를 정하는 작업량 추정치 (예전에 저장된 페이지 결과에는 없음)
+        service_list = []
+        seen_links = set()
+        for page_idx in sorted(page_results):
+            for info in page_results[page_idx] or []:
+                if info[2] not in seen_links:
+                    seen_links.add(info[2])
+                    service_list.append(info[:3] + [category_id, info[3] if len(info) > 3 else None])
+        log(f"[{len(service_list)}/{service_amount}]")
+
+        self.save_data(service_list, f"services_in_{category_id}", SERVICE_COLUMNS)
+        return (service_amount if service_amount is not None else len(service_list)), service_list
+
+    def _pending_pages(self, category_id, pages, state_store=None):
+        if not state_store:
+            return pages
+        todo = state_store.pending('category_page', [f"{category_id}:{page_idx}" for page_idx in pages])
+        return [int(key.split(":")[1]) for key in todo]
+
+    def _probe_pages(self, category_id, page_results, workers, state_store=None):
+        """전체 페이지 수를 모를 때 2페이지부터 workers개씩 불러오다가 끝을 만나면 멈춘다. 확인한 페이지 번호 목록
+
+        서비스 카드가 없는 페이지, 바로 앞 페이지와 같은 서비스만 있는 페이지(범위를 넘으면 마지막 페이지를
+        다시 보여주는 경우), CATEGORY_MAX_PAGES 중 먼저 만나는 곳을 끝으로 본다.
+        파이프라인과 파싱 프로세스 풀은 카테고리마다 하나만 만들어 묶음마다 이어 쓴다.
+        """
+        pages = []
+        start = 2
+        pipeline, crawlers = self._category_pipeline(category_id, page_results, workers, state_store)
+        try:
+            with process_pool() as executor:
+                while start <= CATEGORY_MAX_PAGES:
+                    batch = list(range(start, min(start + workers, CATEGORY_MAX_PAGES + 1)))
+                    pages.extend(batch)
+                    todo = self._pending_pages(category_id, batch, state_store)
+                    for page_idx in batch:
+                        if page_idx not in todo:
+                            page_results[page_idx] = state_store.get_result('category_page', f"{category_id}:{page_idx}")
+                    if todo:
+                        pipeline.run(todo, executor)
+                    for page_idx in batch:
+                        links = {info[2] for info in page_results.get(page_idx) or []}
+                        if not links or links == {info[2] for info in page_results.get(page_idx - 1) or []}:
+                            log(f"카테고리 {category_id}: {page_idx - 1}페이지가 마지막 페이지입니다.")
+                            return pages
+                    start += workers
+        finally:
+            for crawler in crawlers:
+                crawler.close()
+        log(f"카테고리 {category_id}: 최대 {CATEGORY_MAX_PAGES}페이지까지 수집했습니다.")
+        return pages
+
+    def _crawl_pages_staged(self, category_id, pages, page_results, workers, state_store=None):
+        """HTTP 요청(스레드) → HTML 파싱(프로세스 풀) → 브라우저 대체/검증(스레드) → 결과 기록 단계로 수집
+
+        파싱이 CPU를 쓰는 동안에도 다음 페이지를 받으므로 네트워크와 모든 코어가 함께 일한다.
+        """
+        pipeline, crawlers = self._category_pipeline(category_id, page_results, min(workers, len(pages)), state_store)
+        try:
+            return pipeline.run(pages)
+        finally:
+            for crawler in crawlers:
+                crawler.close()
+
+    def _category_pipeline(self, category_id, page_results, workers, state_store=None):
+        """카테고리 페이지 수집 파이프라인과 마무리 단계의 워커별 크롤러. 크롤러는 다 쓴 뒤 닫아야 한다"""
+        # 같은 fetcher, 조절기, 드라이버 풀을 공유하는 워커별 크롤러 (마무리 단계에서 브라우저가 필요할 때 사용)
+        crawlers = [type(self)(self.fetcher, self.throttle, self.driver_pool, self.archive) for _ in range(workers)]
+
+        def fetch(page_idx):
+            if state_store:
+                state_store.mark_started('category_page', f"{category_id}:{page_idx}")
+            return self._fetch_html(_category_page_url(category_id, page_idx)), None
+
+        def finish(crawler, page_idx, _, fields):
+            url = _category_page_url(category_id, page_idx)
+            if fields is None:
+                fields = crawler._load_category_in_browser(url)
+            return crawler._category_page_services(url, page_idx, fields)
+
+        def write(page_idx, info_list):
+            page_results[page_idx] = info_list
+            if state_store:
+                state_store.mark_done('category_page', f"{category_id}:{page_idx}", info_list)
+
+        def fail(page_idx, error):
+            if state_store:
+                state_store.mark_failed('category_page', f"{category_id}:{page_idx}", error)
+
+        pipeline = StagedPipeline(fetch, parse_category_html, finish, write, crawlers,
+                                  on_error=fail, name='category_page')
+        return pipeline, crawlers
+
     def save_result(self, all_service_infos):
-        self.save_data(all_service_infos, "services", ['서비스명', '판매자', '링크'])
+        self.save_data(all_service_infos, "services", SERVICE_COLUMNS[:len(all_service_infos[0])] if all_service_infos else SERVICE_COLUMNS)
 
 class ProfileCrawler(BaseCrawler):
-    def __init__(self, seller_names=None):
-        super().__init__()
-        self.driver.get("https://kmong.com/category/661")
-        time.sleep(1)
+    def __init__(self, seller_names=None, fetcher=None, throttle=None, driver_pool=None, freshness=None, archive=None):
+        super().__init__(fetcher, throttle, driver_pool, archive)
+        self.freshness = freshness
+        self.review_api = default_review_api
         if seller_names is not None:
             self.seller_names = seller_names
         else:
             self.seller_names = self._get_seller_names()
-        log(f"{len(self.seller_names)}명의 판매자 정보를 수집합니다.")
 
     def _get_seller_names(self):
         df = pd.read_csv('./output/services.csv')
@@ -137,122 +493,192 @@ class ProfileCrawler(BaseCrawler):
         return seller_names
     
     def crawl_profile(self, seller_name):
-        profile_url = f"https://kmong.com/@{seller_name}"
-        self.driver.get(profile_url)
-        time.sleep(0.7+random())
+        try:
+            return self._crawl_profile(seller_name)
+        finally:
+            # 다른 워커가 쓸 수 있도록 브라우저 세션을 풀에 돌려준다
+            self.release_driver()
 
-        soup = self._extract_with_soup()
+    @metrics.timed('crawl_profile')
+    def _crawl_profile(self, seller_name):
+        html, meta = self.fetch_profile(seller_name)
+        return self.finish_profile(seller_name, meta, self._parse_page(parse_profile_html, html))
 
-        career, specialties, skills = self._extract_spec(soup)
-
-        profile_data = {
-            'seller_name': seller_name,
-            'profile_url': profile_url,
-            'introduction': self._extract_introduction(soup),
-            'career': career,
-            'specialties': specialties,
-            'skills': skills,
-            'total_jobs': self._extract_total_jobs(soup),
-            'reviews': self._extract_reviews(),
-            'portfolios': self._extract_portfolios(seller_name)
-        }
-        return profile_data
-    
-    def _extract_introduction(self, soup):
+    def fetch_profile(self, seller_name):
+        """(HTML, 메타) 가져오기 단계. 요청이 실패했거나 변경이 없으면(304) HTML은 None
+
+        이전 응답의 ETag/Last-Modified가 있으면 조건부 요청으로 변경 여부부터 확인
+        """
+        profile_url = f"{BASE_URL}/@{seller_name}"
+        cached = self.freshness.get(profile_url) if self.freshness else None
+        meta = {'cached': cached, 'validators': {}, 'not_modified': False}
+        headers = self.freshness.conditional_headers(cached) if self.freshness else None
         try:
-            intro_element = soup.find('div', 'ProfileDescriptionSection__desctiption')
-            if intro_element:
-                # log(f"자기소개 추출 성공")
-                return intro_element.text.strip()
-            else:
-                log(f"자기소개 추출 실패: 자기소개 텍스트가 없습니다.")
-                return ""
+            result = self._fetch(profile_url, headers)
         except Exception as e:
-            log(f"자기소개 추출 실패: {e}")
-            return ""
+            log(f"HTTP 요청 실패: {profile_url} ({e})")
+            return None, meta
+        if result.status == 304:
+            meta['not_modified'] = True
+            return None, meta
+        meta['validators'] = {'etag': result.headers.get('etag'), 'last_modified': result.headers.get('last-modified')}
+        return (result.text if result.ok else None), meta
 
-    def _extract_spec(self, soup):
-        spec_div = soup.find('div', 'DescriptionDetailSection')
-        career = self._extract_section_data(spec_div, '경력사항')
-        specialties = self._extract_section_data(spec_div, "전문분야 및 상세분야")
-        skills = self._extract_section_data(spec_div, '보유 기술')
+    def finish_profile(self, seller_name, meta, fields):
+        """파싱한 필드로 남은 리뷰 페이지와 포트폴리오를 수집해 프로필 레코드를 만드는 마무리 단계
 
-        return career, specialties, skills
+        HTML에서 필드를 얻지 못했으면(fields가 None) 브라우저로 불러와 추출한다.
+        """
+        profile_url = f"{BASE_URL}/@{seller_name}"
+        cached = meta['cached']
+        if meta['not_modified']:
+            log(f"{seller_name}: 변경 없음 (304)")
+            return cached['result']
+        rendered = fields is None
+        if rendered:
+            fields = self._load_profile_in_browser(profile_url)
 
-    def _extract_section_data(self, div, section_title):
-        try:
-            if section_title == "전문분야 및 상세분야":
-                specialty_dict = {}
-                root_div = div.find('div', 'ProfileSkillSection__specialty')
-                title_divs = root_div.find_all('div', 'ProfileSkillSection__title')
-                for title_div in title_divs:
-                    title = title_div.text.strip()
-                    parent_div = title_div.parent
-                    if parent_div:
-                        tags = parent_div.find_all('div', 'ProfileSkillSection__tag')
-                        tag_texts = [tag.text.strip() for tag in tags if tag.text.strip()]
-                        specialty_dict[title] = tag_texts
-                        if tag_texts:
-                            # log(f"{title} 추출 완료 : {len(tag_texts)}개")
-                            pass
-                        else:
-                            log(f"{title}: 태그 내용이 없습니다.")
-                    else:
-                        log(f"{title}: 부모 div를 찾을 수 없습니다.")
-                specialty_len = 0
-                for specialties in specialty_dict.values():
-                    specialty_len += len(specialties)
-                # log(f"{section_title} 추출 완료: {specialty_len}개")
-                return specialty_dict
+        # 프로필 정보와 최신 리뷰가 이전과 같으면 리뷰 페이지네이션과 포트폴리오는 다시 수집하지 않는다
+        profile_fingerprint = self._profile_fingerprint(fields)
+        unchanged = (cached is not None and cached['result'] is not None and cached['fingerprint'] == profile_fingerprint
+                     and self._collected(fields, cached['result']['reviews'], cached['result']['portfolios']))
+        if unchanged:
+            log(f"{seller_name}: 변경 없음, 리뷰/포트폴리오 재사용")
+            reviews = cached['result']['reviews']
+            portfolios = cached['result']['portfolios']
+        else:
+            plan = self._plan_visits(fields)
+            first_page = review_rows(fields['reviews'])
+            reviews = (self._extract_reviews(profile_url, rendered, first_page, fields['review_count'])
+                       if plan['review_pages'] else first_page)
+            portfolios = self._extract_portfolios(seller_name) if plan['portfolios'] else None
+
+        if not fields['introduction']:
+            log(f"자기소개 추출 실패: 자기소개 텍스트가 없습니다.")
 
+        profile_data = profile_record(seller_name, fields, reviews, portfolios)
+        if self.freshness:
+            if self._collected(fields, reviews, portfolios):
+                self.freshness.save(profile_url, profile_fingerprint, profile_data, **meta['validators'])
             else:
-                title_divs = div.find_all('div', 'ProfileSectionTitle')
-                for title_div in title_divs:
-                    if title_div.text.strip() == section_title:
-                        parent_div = title_div.parent
-                        if parent_div:
-                            tags = parent_div.find_all('div', 'ProfileSkillSection__tag')
-                            tag_texts = [tag.text.strip() for tag in tags if tag.text.strip()]
-                            if tag_texts:
-                                # log(f"{section_title} 추출 완료: {len(tag_texts)}개")
-                                return tag_texts
-            pass
-        except Exception as e:
-            log(f"{section_title} 추출 불가 : {e}")
+                # 304나 지문 일치로 빈 결과를 재사용하지 않도록 다음 실행에서 다시 수집한다
+                log(f"{seller_name}: 리뷰/포트폴리오 수집 실패, 변경 확인 정보를 저장하지 않습니다.")
+        return profile_data
 
-    def _extract_total_jobs(self, soup):
-        try:
-            profile_div = soup.find('div', 'ProfileInformationSection__section')
-            description_divs = profile_div.find_all('span', 'ProfileInformationSection__section-infomation-description')
-            for description_div in description_divs:
-                # log(f"총 작업 수 : {description_div.text}")
-                if "개" in description_div.text.strip():
-                    return description_div.text.strip().replace("개","")
-        except Exception as e:
-            log(f"총 작업 수를 찾을 수 없습니다. : {e}")
+    def _collected(self, fields, reviews, portfolios):
+        # 리뷰와 포트폴리오를 모두 얻었는지. 프로필에 0개로 표시돼 방문하지 않은 포트폴리오는 None이어도 된다
+        return reviews is not None and (portfolios is not None or fields.get('portfolio_count') == 0)
+
+    def _plan_visits(self, fields):
+        """프로필 한 번 로드한 결과로 추가 방문이 필요한 페이지만 결정
 
-    def _extract_reviews(self):
+        리뷰는 다음 페이지가 있을 때만 넘기고, 포트폴리오는 프로필에 0개로 표시되면 방문하지 않는다.
+        포트폴리오 수를 확인할 수 없으면 예전처럼 방문한다. __NEXT_DATA__에서 읽어 페이지네이션 정보가
+        없으면 전체 리뷰 수가 첫 페이지 리뷰 수보다 많을 때 다음 페이지가 있다고 본다.
+        """
+        if 'next_review_page' in fields:
+            review_pages = fields['next_review_page'] is not None
+        else:
+            review_pages = (fields['review_count'] or 0) > len(fields['reviews'])
+        plan = {
+            'review_pages': review_pages,
+            'portfolios': fields.get('portfolio_count') != 0,
+        }
+        if not plan['portfolios']:
+            log("포트폴리오 0개, 포트폴리오 페이지 방문 생략")
+        return plan
+
+    def _load_profile_in_browser(self, profile_url):
+        # 브라우저 화면은 브라우저 안에서 추출한다
+        log("HTML에 프로필 섹션이 없어 브라우저로 불러옵니다.")
+        self._get(profile_url)
+        readiness.wait_for_selector(self.driver, '.DescriptionDetailSection')
+        fields = self._extract_fields('profile', 'review_list')
+        if fields is None:
+            raise ValueError(f"프로필 페이지를 파싱하지 못했습니다: {profile_url}")
+        return fields
+
+    def _profile_fingerprint(self, fields):
+        # HTML이든 __NEXT_DATA__든 같은 필드로 계산해야 읽는 방식이 바뀌어도 지문이 유지된다
+        return fingerprint(
+            fields['introduction'],
+            fields['total_jobs'],
+            fields['career'],
+            fields['skills'],
+            fields['review_count'],
+            fields['reviews'][0] if fields['reviews'] else "",
+        )
+
+    def _review_page_count(self, review_count, page_size):
+        if not review_count or not page_size:
+            return None
+        return math.ceil(review_count / page_size)
+
+    def _fetch_review_page(self, template, seller_name, page, fetched_at=None):
+        url = self.review_api.page_url(template, seller_name, page)
+        result = self._fetch(url, {'Accept': 'application/json', 'Referer': f"{BASE_URL}/@{seller_name}"},
+                             kind='review', key=f"{seller_name}:{page}", fetched_at=fetched_at)
+        if not result.ok:
+            raise ValueError(f"리뷰 API 응답 오류: {result.status}")
+        rows = parse_reviews(result.text)
+        if rows is None:
+            raise ValueError("리뷰 API 응답 형식이 다릅니다.")
+        return rows
+
+    def _fetch_review_pages(self, template, seller_name, start, last=None):
+        """start 페이지부터 리뷰 API로 동시에 요청. 하나라도 실패하면 None (클릭 방식으로 대체)
+
+        리뷰 수로 짐작한 마지막 페이지(last)까지는 한 번에 요청하고, 짐작이 틀렸을 수 있으므로 그 뒤로도
+        빈 페이지가 나올 때까지 REVIEW_API_WORKERS개씩 더 요청한다. 바로 앞 페이지와 같은 리뷰가 돌아오거나
+        REVIEW_MAX_PAGES에 닿아도 멈춘다.
+
+        한 번에 요청한 페이지는 모두 같은 수집 시각으로 보관해, 오프라인 재추출이 한 회차의 페이지만 모을 수 있게 한다.
+        """
+        fetched_at = time.time()
+        scheduler = CrawlScheduler(max_in_flight=REVIEW_API_WORKERS)
+        workers = [None] * REVIEW_API_WORKERS
         reviews = []
+        previous = None
+        page = start
+        while page <= REVIEW_MAX_PAGES:
+            end = last if last is not None and page <= last else page + REVIEW_API_WORKERS - 1
+            end = min(end, REVIEW_MAX_PAGES)
+            results = scheduler.run(
+                list(range(page, end + 1)),
+                lambda _, page_idx: self._fetch_review_page(template, seller_name, page_idx, fetched_at),
+                workers,
+            )
+            if any(rows is None for rows in results):
+                log("리뷰 API 요청 실패, 페이지 넘김 방식으로 수집합니다.")
+                return None
+            for rows in results:
+                if not rows or rows == previous:
+                    return reviews
+                reviews.extend(rows)
+                previous = rows
+            page = end + 1
+        log(f"{seller_name}: 리뷰 {REVIEW_MAX_PAGES}페이지까지만 수집합니다.")
+        return reviews
+
+    @metrics.timed('extract_reviews')
+    def _extract_reviews(self, profile_url, rendered, reviews, review_count=None):
+        """첫 페이지 리뷰(reviews) 뒤의 페이지를 수집해 합친다. 다음 페이지가 있는지는 호출한 쪽에서 확인한다"""
+        # 리뷰 API를 이미 알고 있으면 나머지 페이지를 브라우저 없이 동시에 요청
+        seller_name = profile_url.rsplit('@', 1)[-1]
+        page_count = self._review_page_count(review_count, len(reviews))
+        template = self.review_api.template
+        if template is not None:
+            rest = self._fetch_review_pages(template, seller_name, 2, page_count)
+            if rest is not None:
+                return reviews + rest
+        discover = template is None
+
+        if not rendered:
+            self._get(profile_url)
+            readiness.wait_for_selector(self.driver, REVIEW_CARD_SELECTOR)
 
         try:
             while True:
-                try:
-
-                    soup = self._extract_with_soup()
-                    cards = soup.find_all('div', 'RatingList')
-                    for card in cards:
-                        date = card.find('span', 'RatingList__rating-user-info').text[:8]
-
-                        service_div = card.find('div', 'RatingList__buyer-selling-service-gig-info')
-                        service_title = service_div.select_one('*:nth-child(1) > *:nth-child(1)').text.strip()
-                        period = service_div.select_one('*:nth-child(1) > *:nth-child(2)').text.strip().replace("| ", "")
-                        price = service_div.select_one('*:nth-child(2)').text.strip().replace("주문 금액 범위 : ", "")
-                        reviews.append([date, service_title, period, price])
-            
-                except Exception as e:
-                    log(f"리뷰 추출 실패 : {e}")
-                    return None
-                
                 try:
                     review_section = self.driver.find_element(By.CLASS_NAME, "ProfileRateEvaluationSection__list-group")
                     pagination = review_section.find_element(By.CLASS_NAME, "pagination")
@@ -260,40 +686,326 @@ class ProfileCrawler(BaseCrawler):
                     if next_button.get_attribute("tabindex") == "-1":
                         return reviews
                     else:
-                        self.driver.execute_script("arguments[0].click();", next_button)
-                        time.sleep(1)
+                        first_card = readiness.element_signature(self.driver, REVIEW_CARD_SELECTOR)
+                        if discover:
+                            self.review_api.clear_log(self.driver)
+                        with metrics.timer('pagination_click', target='review'):
+                            self.driver.execute_script("arguments[0].click();", next_button)
+                            # 첫 리뷰 카드가 바뀌면 다음 페이지가 그려진 것
+                            readiness.wait_for_change(self.driver, REVIEW_CARD_SELECTOR, first_card)
                 except Exception as e:
                     log(f"단일 페이지입니다.")
                     return reviews
+
+                try:
+                    reviews.extend(review_rows(self._extract_fields('review_list')['reviews']))
+                except Exception as e:
+                    log(f"리뷰 추출 실패 : {e}")
+                    return None
+
+                # 첫 페이지 넘김에서 리뷰 API를 찾으면 남은 페이지는 API로 동시에 요청
+                if discover:
+                    discover = False
+                    template = self.review_api.discover(self.driver, seller_name)
+                    if template is not None:
+                        rest = self._fetch_review_pages(template, seller_name, 3, page_count)
+                        if rest is not None:
+                            return reviews + rest
         except Exception as e:
             log(f"리뷰 추출 실패 : {e}")
             return None
 
-    def _extract_portfolios(self, seller_name):
-        self.driver.get(f"https://kmong.com/@{seller_name}/portfolios")
+    def _load_portfolios(self, portfolio_url):
+        # HTTP로 받은 페이지를 우선 사용하고, 실패할 때만 브라우저로 불러온다
         try:
-            portfolios = []
-            blank_page_tag = self.driver.find_element(By.TAG_NAME, "b")
-            if blank_page_tag.text=="404":
-                log(f"포트폴리오가 없습니다.")
+            result = self._fetch(portfolio_url)
+            if result.status == 404:
                 return None
-            
-            soup = self._extract_with_soup()
-            if soup:
-                cards = soup.find_all('arcticle')
-                for card in cards:
-                    portfolio = {'title', 'hashtag', 'link'}
-                    portfolio['link'] = card.find('a').attrs['href']
-                    card_texts = card.find_all('p')
-                    if isinstance(card_texts, list) and len(card_texts)==2:
-                        portfolio['title'] = card_texts[0]
-                        portfolio['hashtag'] = card_texts[1]
-                    portfolios.append(portfolio)
-            return portfolios
-                
+            if result.ok:
+                return self._soup_from_html(result.text)
+        except Exception as e:
+            log(f"HTTP 요청 실패: {portfolio_url} ({e})")
+
+        self._get(portfolio_url)
+        return self._extract_with_soup()
+
+    @metrics.timed('extract_portfolios')
+    def _extract_portfolios(self, seller_name):
+        try:
+            return _portfolios_from_soup(self._load_portfolios(f"{BASE_URL}/@{seller_name}/portfolios"))
         except Exception as e:
             log(f"포트폴리오 추출 실패 : {e}")
             return None
     
     def save_result(self, all_service_infos):
-        self.save_data(all_service_infos, "sellers", ['판매자', '주소', '소개', '경력', '전문분야', '보유 기술', '총 작업 수', '서비스', '리뷰'])
\ No newline at end of file
+        self.save_data(all_service_infos, "sellers", ['판매자', '주소', '소개', '경력', '전문분야', '보유 기술', '총 작업 수', '서비스', '리뷰'])
+
+def _with_classes(root, name, classes):
+    # Tailwind 클래스는 CSS 선택자로 쓰기 번거로워 클래스 집합으로 비교한다
+    classes = set(classes.split())
+    return root.find_all(lambda tag: tag.name == name and classes <= set(tag.get('class') or []))
+
+
+def _first_text(root, name, classes):
+    found = _with_classes(root, name, classes)
+    return found[0].get_text(strip=True) if found else ""
+
+
+def review_rows(reviews):
+    return [[review['date'], review['service_title'], review['period'], review['price']] for review in reviews]
+
+
+def profile_record(seller_name, fields, reviews, portfolios):
+    """추출 명세의 프로필 필드와 리뷰, 포트폴리오로 profiles.csv 한 줄을 만든다"""
+    return {
+        'seller_name': seller_name,
+        'profile_url': f"{BASE_URL}/@{seller_name}",
+        'introduction': fields['introduction'] or "",
+        'career': fields['career'] or None,
+        'specialties': {specialty['title']: specialty['tags'] for specialty in fields['specialties']},
+        'skills': fields['skills'] or None,
+        'total_jobs': fields['total_jobs'],
+        'reviews': reviews,
+        'portfolios': portfolios
+    }
+
+
+def _portfolios_from_soup(soup):
+    portfolios = []
+    blank_page_tag = soup.find("b") if soup else None
+    if soup is None or (blank_page_tag and blank_page_tag.text=="404"):
+        log(f"포트폴리오가 없습니다.")
+        return None
+
+    if soup:
+        cards = soup.find_all('arcticle')
+        for card in cards:
+            portfolio = {'title', 'hashtag', 'link'}
+            portfolio['link'] = card.find('a').attrs['href']
+            card_texts = card.find_all('p')
+            if isinstance(card_texts, list) and len(card_texts)==2:
+                portfolio['title'] = card_texts[0]
+                portfolio['hashtag'] = card_texts[1]
+            portfolios.append(portfolio)
+    return portfolios
+
+
+def _category_page_url(category_id, page_idx):
+    return f"{BASE_URL}/category/{category_id}?page={page_idx}"
+
+
+def _service_rows(services):
+    return [[service['title'], service['seller'], service['link'], service['review_count']] for service in services]
+
+
+def _profile_from_soup(soup):
+    return default_spec.extract(soup, 'profile', 'review_list')
+
+
+def _category_from_soup(soup):
+    return _category_fields(default_spec.extract(soup, 'category'))
+
+
+def _category_fields(fields):
+    if fields is None:
+        return None
+    return {'service_amount': fields['service_amount'], 'services': _service_rows(fields['services'])}
+
+
+def _gig_from_soup(soup):
+    return {
+        'packages': _extract_packages(soup),
+        'skill_level': _extract_info_value(soup, ('기술', '수준')),
+        'team_size': _extract_info_value(soup, ('팀', '규모')),
+    }
+
+
+def _extract_packages(soup):
+    """모든 패키지 탭 패널(보이지 않는 패널 포함)을 한 번에 읽는다. 패널이 하나면 'SINGLE'
+
+    탭 버튼보다 패널이 적으면(선택한 탭의 패널만 HTML에 있으면) 일부 패키지만 읽게 되므로 None
+    """
+    aside = soup.find('aside')
+    if aside is None:
+        return {}
+    panels = _with_classes(aside, 'div', PACKAGE_PANEL_CLASSES)
+    if len(panels) < len(_with_classes(aside, 'button', PACKAGE_BUTTON_CLASSES)):
+        return None
+    if len(panels) <= 1:
+        package = _package_from_panel(panels[0] if panels else aside)
+        return {'SINGLE': package} if package else {}
+
+    packages = {}
+    for i, panel in enumerate(panels):
+        package = _package_from_panel(panel)
+        if package:
+            packages[PACKAGE_TYPES[i] if i < len(PACKAGE_TYPES) else f'PACKAGE_{i+1}'] = package
+    return packages
+
+
+def _package_from_panel(panel):
+    # 패널 안에서만 찾아야 다른 영역(푸터 등)의 텍스트를 가격으로 잘못 읽지 않는다
+    price = _first_text(panel, 'div', 'text-[18px] font-bold')
+    if not price:
+        return None
+    return {
+        'price': price,
+        'title': _first_text(panel, 'p', 'text-[14px] font-bold'),
+        'description': _first_text(panel, 'p', 'whitespace-pre-wrap'),
+        'details': _package_details(panel),
+    }
+
+
+def _package_details(panel):
+    details = {'included_features': [], 'specifications': {}}
+    for item in _with_classes(panel, 'div', 'flex basis-1/2'):
+        texts = [p.get_text(strip=True) for p in _with_classes(item, 'p', 'text-sm')]
+        if not texts:
+            continue
+        # 체크 표시(svg)가 있거나 값이 없으면 포함 기능, 값이 있으면 사양
+        if item.find('svg') or len(texts) < 2:
+            details['included_features'].append(texts[0])
+        else:
+            details['specifications'][texts[0]] = texts[1]
+    return details
+
+
+def _extract_info_value(soup, keywords):
+    # 서비스 정보 상자에서 keywords가 들어간 항목 다음 span의 값
+    info_box = soup.find('div', id='10')
+    if info_box is None:
+        return ""
+    for element in info_box.find_all(string=lambda text: text and any(keyword in text for keyword in keywords)):
+        next_span = element.parent.find_next('span') if element.parent else None
+        if next_span and next_span.get_text(strip=True):
+            return next_span.get_text(strip=True)
+    return ""
+
+
+# 아래 parse_*_html은 파이프라인의 파싱 단계(프로세스 풀)에서 실행하는 순수 함수다.
+# 크롤러 상태(드라이버, fetcher)를 쓰지 않고 HTML 문자열만 받아 필드를 돌려주며,
+# HTML만으로 추출할 수 없으면 None(서비스 상세는 값별 None)을 돌려 마무리 단계가 브라우저로 대체하게 한다.
+
+def parse_category_html(html):
+    """카테고리 페이지 → {'service_amount', 'services'}. __NEXT_DATA__ JSON, 서버 렌더링된 서비스 카드 순으로 확인"""
+    if HYDRATION_ENABLED:
+        fields = hydration.category_page(hydration.next_data(html))
+        if fields is not None:
+            if fields['service_amount'] is None and 'css-enj2mu' in html:
+                fields['service_amount'] = _category_from_soup(parse_html(html))['service_amount']
+            return fields
+    if 'edqw2x10' in html:
+        return _category_from_soup(parse_html(html))
+    return None
+
+
+def parse_profile_html(html):
+    """프로필 페이지 → 추출 명세의 profile, review_list 필드. __NEXT_DATA__ JSON, 프로필 섹션이 모두 있는 HTML 순
+
+    JSON에 없는 값은 필드별로 HTML에서 채운다. 리뷰 목록이나 리뷰 수를 어디서도 얻지 못하면 None
+    (첫 페이지 리뷰를 잃지 않도록 브라우저로 대체)
+    """
+    fields = hydration.profile_page(hydration.next_data(html)) if HYDRATION_ENABLED else None
+    if fields is not None and all(value not in (None, []) for value in fields.values()):
+        return fields
+    if all(marker in html for marker in PROFILE_MARKERS):
+        extracted = _profile_from_soup(parse_html(html))
+        if fields is None:
+            return extracted
+        return {**extracted, **{name: value for name, value in fields.items() if value not in (None, [])}}
+    if fields is not None and fields['reviews'] is not None and fields['review_count'] is not None:
+        return fields
+    return None
+
+
+def parse_gig_html(html):
+    """서비스 상세 페이지 → {'packages', 'skill_level', 'team_size'}. __NEXT_DATA__에 없는 값은 패키지 영역에서 읽는다"""
+    data = hydration.next_data(html) if HYDRATION_ENABLED else None
+    fields = {'packages': hydration.gig_packages(data), **hydration.gig_info(data)}
+    if fields['packages'] is not None and len(fields['packages']) < html.count(PACKAGE_BUTTON_CLASSES):
+        # JSON의 패키지가 탭 버튼보다 적으면 HTML의 탭 패널(없으면 브라우저)에서 다시 읽는다
+        fields['packages'] = None
+    if None in fields.values() and '<aside' in html:
+        extracted = _gig_from_soup(parse_html(html))
+        fields = {name: extracted[name] if value is None else value for name, value in fields.items()}
+    return fields
+
+
+def parse_portfolio_html(html):
+    """포트폴리오 페이지 → 포트폴리오 목록. 포트폴리오가 없으면 None"""
+    return _portfolios_from_soup(parse_html(html))
+
+
+class GigCrawler(BaseCrawler):
+    """서비스 상세 페이지에서 패키지별 가격/구성, 기술 수준, 팀 규모를 수집
+
+    패키지 탭 버튼을 누르지 않는다. __NEXT_DATA__에 패키지가 있으면 그것을, 없으면 HTML에
+    숨겨진 채 함께 들어 있는 탭 패널을 모두 읽는다. 브라우저는 HTTP 응답에 패키지 영역이 없을 때만 쓰고,
+    탭 패널이 버튼보다 적게 그려진 페이지만 탭을 하나씩 눌러 읽는다.
+    """
+    def crawl_gig(self, link):
+        try:
+            return self._crawl_gig(link)
+        finally:
+            self.release_driver()
+
+    @metrics.timed('crawl_gig')
+    def _crawl_gig(self, link):
+        html, meta = self.fetch_gig(link)
+        return self.finish_gig(link, meta, self._parse_page(parse_gig_html, html))
+
+    def fetch_gig(self, link):
+        """(HTML, 메타) 가져오기 단계. 요청이 실패하면 HTML은 None"""
+        service_url = link if link.startswith('http') else f"{BASE_URL}{link}"
+        return self._fetch_html(service_url), {'service_url': service_url}
+
+    def finish_gig(self, link, meta, fields):
+        """파싱 단계에서 채우지 못한 값만 브라우저로 불러와 채운다"""
+        service_url = meta['service_url']
+        if fields is None:
+            fields = {name: None for name in GIG_COLUMNS[1:]}
+        if None in fields.values():
+            extracted = self._load_gig_in_browser(service_url)
+            fields = {name: extracted[name] if value is None else value for name, value in fields.items()}
+        return {'service_url': service_url, **fields}
+
+    def _load_gig_in_browser(self, service_url):
+        log("HTML에 패키지 영역이 없어 브라우저로 불러옵니다.")
+        self._get(service_url)
+        readiness.wait_for_selector(self.driver, 'aside')
+        extracted = None
+        if BROWSER_EXTRACTION:
+            try:
+                with metrics.timer('browser_extract', page='gig'):
+                    extracted = json.loads(self.driver.execute_script(
+                        GIG_EXTRACT_SCRIPT, PACKAGE_TYPES, PACKAGE_BUTTON_CLASSES, PACKAGE_PANEL_CLASSES))
+            except Exception as e:
+                log(f"브라우저 내 추출 실패, HTML을 파싱해 추출합니다: {e}")
+        if extracted is None:
+            soup = self._extract_with_soup()
+            if soup is None:
+                raise ValueError(f"서비스 페이지를 파싱하지 못했습니다: {service_url}")
+            extracted = _gig_from_soup(soup)
+        if extracted['packages'] is None:
+            extracted['packages'] = self._click_packages()
+        return extracted
+
+    def _click_packages(self):
+        """탭 버튼을 하나씩 눌러 그때 보이는 패널을 읽는다 (선택한 탭의 패널만 그리는 페이지)"""
+        buttons = self.driver.find_elements(By.XPATH, f"//aside//button[contains(@class, '{PACKAGE_BUTTON_CLASSES}')]")
+        log(f"패키지 탭 패널이 버튼보다 적어 탭 {len(buttons)}개를 눌러 읽습니다.")
+        packages = {}
+        for i, button in enumerate(buttons):
+            previous = readiness.element_signature(self.driver, 'aside div.block')
+            self.driver.execute_script("arguments[0].click();", button)
+            if i > 0:
+                # 첫 탭은 처음부터 선택되어 있어 패널이 바뀌기를 기다리지 않는다
+                readiness.wait_for_change(self.driver, 'aside div.block', previous, timeout=3)
+            aside = parse_html(self.driver.find_element(By.TAG_NAME, 'aside').get_attribute('outerHTML'))
+            active = _with_classes(aside, 'div', f'{PACKAGE_PANEL_CLASSES} block')
+            package = _package_from_panel(active[0]) if active else None
+            if package:
+                packages[PACKAGE_TYPES[i] if i < len(PACKAGE_TYPES) else f'PACKAGE_{i+1}'] = package
+        if len(packages) < len(buttons):
+            log(f"패키지 {len(buttons)}개 중 {len(packages)}개만 읽었습니다.")
+        return packages
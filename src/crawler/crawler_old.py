@@ -1,42 +1,32 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 import pandas as pd
 import json
 from datetime import datetime
 import time
 import re
 
+from src.crawler import hydration, readiness
+from src.crawler.document import DocumentCache
+from src.crawler.driver_pool import create_driver
+
 def log(message):
     print(f"[{datetime.now().strftime("%H:%M:%S.%f")[:-3]}] {message}")
 
 class BaseCrawler:
     def __init__(self):
         self.driver = self._setup_driver()
+        self.documents = DocumentCache()
     
     def _setup_driver(self):
-        """최적화된 드라이버 설정"""
-        options = Options()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-        
-        driver = webdriver.Chrome(options=options)
-        driver.implicitly_wait(2)  # 10초 → 2초로 단축
-        return driver
+        """최적화된 드라이버 설정 (가벼운 브라우저 모드는 config.LEAN_BROWSER)"""
+        return create_driver()
     
     def _extract_with_beautifulsoup(self):
-        """BeautifulSoup으로 빠른 HTML 파싱"""
-        from bs4 import BeautifulSoup
-        
+        """BeautifulSoup으로 빠른 HTML 파싱 (DOM이 바뀌지 않았으면 캐시된 soup 재사용)"""
         try:
-            # 한 번에 전체 HTML 가져오기
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            return soup
+            return self.documents.from_driver(self.driver)
         except Exception as e:
             log(f"BeautifulSoup 파싱 실패: {e}")
             return None
@@ -62,7 +52,7 @@ class SellersCrawler(BaseCrawler):
     def __init__(self):
         super().__init__()
         self.driver.get("https://kmong.com/category/661")
-        time.sleep(3)
+        readiness.wait_for_selector(self.driver, "article.edqw2x10")
     
     def crawl_category_sellers(self, category_id):
         """카테고리의 모든 판매자 정보 수집"""
@@ -75,7 +65,8 @@ class SellersCrawler(BaseCrawler):
             # 페이지 접속
             url = f"https://kmong.com/category/{category_id}?page={page}"
             self.driver.get(url)
-            time.sleep(1)
+            # 빈 페이지("0개의 서비스")에는 카드가 없으므로 네트워크 유휴까지만 대기
+            readiness.wait_for_network_idle(self.driver, idle_ms=300)
             
             # 서비스 개수 확인
             try:
@@ -168,9 +159,6 @@ class SellersCrawler(BaseCrawler):
             except Exception as e:
                 log(f"카테고리 {category_id} 크롤링 실패: {e}")
                 continue
-            
-            # 카테고리 간 잠시 대기
-            time.sleep(3)
         
         return all_data
 
@@ -206,14 +194,19 @@ class ProfileCrawler(BaseCrawler):
     def __init__(self):
         super().__init__()
     
-    def crawl_seller_profile(self, seller_name):
-        """최적화된 프로필 크롤링"""
+    def _open_profile(self, seller_name):
+        """프로필 페이지로 이동 (통합 크롤링에서는 한 번만 호출)"""
+        self.driver.get(f"https://kmong.com/@{seller_name}")
+
+    def crawl_seller_profile(self, seller_name, navigate=True):
+        """최적화된 프로필 크롤링 (navigate=False면 이미 열린 프로필 페이지 사용)"""
         profile_url = f"https://kmong.com/@{seller_name}"
         log(f"프로필 크롤링 시작: {seller_name}")
         
         try:
-            self.driver.get(profile_url)
-            time.sleep(1)  # 페이지 로딩만 대기
+            if navigate:
+                self._open_profile(seller_name)
+            readiness.wait_for_selector(self.driver, ".DescriptionDetailSection")
             
             # BeautifulSoup으로 한 번에 파싱
             soup = self._extract_with_beautifulsoup()
@@ -350,19 +343,17 @@ class ProfileCrawler(BaseCrawler):
             log(f"CSV 파일 읽기 실패: {e}")
             return []
 
-    def crawl_reviews(self, seller_name, max_pages=20):  # 5 → 20으로 증가
+    def crawl_reviews(self, seller_name, max_pages=20, navigate=True):  # 5 → 20으로 증가
         """리뷰 크롤링 - 리뷰 섹션 스크롤 포함"""
-        profile_url = f"https://kmong.com/@{seller_name}"
-        
         try:
-            self.driver.get(profile_url)
-            time.sleep(1)
+            if navigate:
+                self._open_profile(seller_name)
+            readiness.wait_for_selector(self.driver, ".ProfileRateEvaluationSection__list-group")
             
             # 리뷰 섹션으로 스크롤
             try:
                 review_section = self.driver.find_element(By.CLASS_NAME, "ProfileRateEvaluationSection__list-group")
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'start'});", review_section)
-                time.sleep(1)
                 log("리뷰 섹션으로 스크롤 완료")
             except:
                 log("리뷰 섹션을 찾을 수 없음")
@@ -579,15 +570,14 @@ class ProfileCrawler(BaseCrawler):
                 log("리뷰 다음 페이지 버튼이 비활성화됨")
                 return False
             
-            # 클릭 전 잠시 대기
-            time.sleep(0.5)
+            first_card = readiness.element_signature(self.driver, ".ProfileRateEvaluationSection__list-group .RatingList")
             
             # JavaScript 클릭
             self.driver.execute_script("arguments[0].click();", next_button)
             log("리뷰 다음 페이지 버튼 클릭")
             
-            # 페이지 변경 대기 - 더 긴 시간
-            time.sleep(1)
+            # 첫 리뷰 카드가 바뀔 때까지 대기
+            readiness.wait_for_change(self.driver, ".ProfileRateEvaluationSection__list-group .RatingList", first_card)
             
             # 페이지 변경 확인
             try:
@@ -623,12 +613,12 @@ class ProfileCrawler(BaseCrawler):
         """프로필 + 리뷰 통합 크롤링"""
         log(f"\n=== {seller_name} 프로필 + 리뷰 크롤링 시작 ===")
         
-        # 기본 프로필 정보 크롤링
+        # 기본 프로필 정보 크롤링 (리뷰도 같은 페이지에서 이어서 수집)
         profile_data = self.crawl_seller_profile(seller_name)
         
         # 리뷰 크롤링 추가
         try:
-            reviews = self.crawl_reviews(seller_name, max_pages=max_review_pages)
+            reviews = self.crawl_reviews(seller_name, max_pages=max_review_pages, navigate=False)
             profile_data['reviews'] = reviews
             profile_data['total_reviews'] = len(reviews)
             log(f"리뷰 크롤링 완료: {len(reviews)}개")
@@ -658,13 +648,12 @@ class ProfileCrawler(BaseCrawler):
         
         return all_profiles
 
-    def crawl_services(self, seller_name, max_service_pages=10, max_services=None):
+    def crawl_services(self, seller_name, max_service_pages=10, max_services=None, navigate=True):
         """판매자의 서비스 정보 크롤링 - 예외 처리 강화"""
-        profile_url = f"https://kmong.com/@{seller_name}"
-        
         try:
-            self.driver.get(profile_url)
-            time.sleep(1)
+            if navigate:
+                self._open_profile(seller_name)
+                readiness.wait_for_network_idle(self.driver, idle_ms=300)
             
             # 서비스 탭 활성화
             service_tab_activated = self._activate_service_tab()
@@ -708,7 +697,6 @@ class ProfileCrawler(BaseCrawler):
             "//div[contains(@class, 'tab')]//button[contains(text(), '서비스')]",
             "//*[contains(@class, 'ProfileTab')]//button[contains(text(), '서비스')]"
         ]
-        time.sleep(1)
         
         for i, selector in enumerate(service_tab_selectors):
             try:
@@ -717,7 +705,6 @@ class ProfileCrawler(BaseCrawler):
                     EC.element_to_be_clickable((By.XPATH, selector))
                 )
                 self.driver.execute_script("arguments[0].click();", tab)
-                time.sleep(2)
                 
                 # 서비스 목록이 로딩되었는지 확인
                 try:
@@ -758,7 +745,6 @@ class ProfileCrawler(BaseCrawler):
             # 서비스 섹션으로 스크롤
             service_section = self.driver.find_element(By.CLASS_NAME, "ProfileServiceListSection")
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'start'});", service_section)
-            time.sleep(1)
             log("서비스 섹션으로 스크롤 완료")
         except:
             log("서비스 섹션을 찾을 수 없음")
@@ -855,12 +841,14 @@ class ProfileCrawler(BaseCrawler):
                 log("서비스 다음 페이지 버튼이 비활성화됨")
                 return False
             
+            first_gig = readiness.element_signature(self.driver, "a[href*='/gig/']")
+            
             # JavaScript 클릭
             self.driver.execute_script("arguments[0].click();", next_button)
             log("서비스 다음 페이지 버튼 클릭")
             
-            # 페이지 변경 대기
-            time.sleep(1)
+            # 첫 서비스 링크가 바뀔 때까지 대기
+            readiness.wait_for_change(self.driver, "a[href*='/gig/']", first_gig)
             
             # 새 서비스 데이터 로딩 확인
             try:
@@ -877,20 +865,26 @@ class ProfileCrawler(BaseCrawler):
             log(f"서비스 다음 페이지 이동 실패: {e}")
             return False
 
-    def _extract_package_info_fast(self):
+    def _extract_package_info_fast(self, soup=None):
         """빠른 패키지 정보 추출"""
         try:
-            # BeautifulSoup으로 한 번에 파싱
-            soup = self._extract_with_beautifulsoup()
+            if soup is None:
+                soup = self._extract_with_beautifulsoup()
             if not soup:
                 return {}
             
             aside = soup.find('aside')
-            if not aside:
-                return {}
             
             # 패키지 버튼들 확인
-            package_buttons = aside.find_all('button', class_=lambda x: x and 'flex h-[50px] w-[119px]' in x)
+            package_buttons = aside.find_all('button', class_=lambda x: x and 'flex h-[50px] w-[119px]' in x) if aside else []
+            
+            # __NEXT_DATA__에 탭 버튼 수만큼 패키지가 있으면 버튼을 누르지 않고 모든 패키지를 한 번에 읽는다
+            packages = hydration.gig_packages(hydration.next_data(soup))
+            if packages and len(packages) >= len(package_buttons):
+                return packages
+            
+            if not aside:
+                return {}
             
             if not package_buttons:
                 # 단일 패키지 처리
@@ -940,18 +934,15 @@ class ProfileCrawler(BaseCrawler):
         packages = {}
         package_types = ['STANDARD', 'DELUXE', 'PREMIUM']
         
-        # 모든 패키지 콘텐츠 div들 찾기
-        content_divs = aside.find_elements(
-            By.XPATH, ".//div[contains(@class, 'w-full rounded-b-lg border border-gray-300')]"
-        )
-        
-        for i, (button, content_div) in enumerate(zip(package_buttons, content_divs)):
+        # 선택한 탭의 패널만 그려지기도 하므로 패널 수가 아니라 버튼마다 눌러 본다
+        for i, button in enumerate(package_buttons):
             try:
                 package_name = package_types[i] if i < len(package_types) else f'PACKAGE_{i+1}'
                 
                 # 버튼 클릭하여 해당 패키지 활성화
+                previous = readiness.element_signature(self.driver, "aside div.block")
                 self.driver.execute_script("arguments[0].click();", button)
-                time.sleep(1)
+                readiness.wait_for_change(self.driver, "aside div.block", previous, timeout=3)
                 
                 # 현재 활성화된 패키지 정보 추출
                 package_info = self._extract_active_package_info(aside)
@@ -1101,13 +1092,15 @@ class ProfileCrawler(BaseCrawler):
         """최적화된 서비스 크롤링"""
         try:
             self.driver.get(service_url)
-            time.sleep(1)  # 페이지 로딩만 대기
+            readiness.wait_for_selector(self.driver, "aside")
             
+            # 세 추출 함수가 같은 soup을 공유하도록 한 번만 파싱
+            soup = self._extract_with_beautifulsoup()
             service_data = {
                 'service_url': service_url,
-                'packages': self._extract_package_info_fast(),  # 빠른 추출
-                'skill_level': self._extract_skill_level_fast(),
-                'team_size': self._extract_team_size_fast()
+                'packages': self._extract_package_info_fast(soup),  # 빠른 추출
+                'skill_level': self._extract_skill_level_fast(soup),
+                'team_size': self._extract_team_size_fast(soup)
             }
             
             return service_data
@@ -1116,10 +1109,11 @@ class ProfileCrawler(BaseCrawler):
             log(f"서비스 페이지 크롤링 실패: {e}")
             return None
 
-    def _extract_skill_level_fast(self):
+    def _extract_skill_level_fast(self, soup=None):
         """빠른 기술 수준 추출"""
         try:
-            soup = self._extract_with_beautifulsoup()
+            if soup is None:
+                soup = self._extract_with_beautifulsoup()
             if not soup:
                 return ""
             
@@ -1144,10 +1138,11 @@ class ProfileCrawler(BaseCrawler):
             log(f"기술 수준 추출 실패: {e}")
             return ""
 
-    def _extract_team_size_fast(self):
+    def _extract_team_size_fast(self, soup=None):
         """빠른 팀 규모 추출"""
         try:
-            soup = self._extract_with_beautifulsoup()
+            if soup is None:
+                soup = self._extract_with_beautifulsoup()
             if not soup:
                 return ""
             
@@ -1175,12 +1170,15 @@ class ProfileCrawler(BaseCrawler):
         """프로필 + 리뷰 + 서비스 통합 크롤링"""
         log(f"\n=== {seller_name} 전체 데이터 크롤링 시작 ===")
         
+        # 프로필 페이지는 한 번만 열고, 리뷰 페이지네이션과 서비스 탭도 같은 페이지에서 처리
+        self._open_profile(seller_name)
+
         # 1. 기본 프로필 정보
-        profile_data = self.crawl_seller_profile(seller_name)
+        profile_data = self.crawl_seller_profile(seller_name, navigate=False)
         
         # 2. 리뷰 크롤링
         try:
-            reviews = self.crawl_reviews(seller_name, max_pages=max_review_pages)
+            reviews = self.crawl_reviews(seller_name, max_pages=max_review_pages, navigate=False)
             profile_data['reviews'] = reviews
             profile_data['total_reviews'] = len(reviews)
             log(f"리뷰 크롤링 완료: {len(reviews)}개")
@@ -1191,7 +1189,7 @@ class ProfileCrawler(BaseCrawler):
         
         # 3. 서비스 크롤링
         try:
-            services = self.crawl_services(seller_name)
+            services = self.crawl_services(seller_name, navigate=False)
             profile_data['services'] = services
             profile_data['total_services'] = len(services)
             log(f"서비스 크롤링 완료: {len(services)}개")
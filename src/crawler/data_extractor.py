@@ -0,0 +1,322 @@
+import json
+import os
+import re
+import threading
+import time
+
+import soupsieve
+from bs4 import Tag
+
+from src.utils.config import SPEC_RELOAD_INTERVAL
+from src.utils.helpers import log
+from src.utils.metrics import metrics
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extraction_spec.json')
+
+# 추출 명세를 브라우저 안에서 그대로 실행하는 스크립트. arguments[0]은 {필드명: 필드 명세}이고
+# 결과를 JSON 문자열 하나로 돌려준다 (page_source 전체 대신 필요한 값만 한 번에 전송).
+# soupsieve 전용 :-soup-contains("...")는 텍스트가 들어 있는 요소에 임시 속성을 달아 바꿔 쓴다
+BROWSER_EXTRACT_SCRIPT = """
+const marked = [];
+let tokens = 0;
+function rewrite(css) {
+    return css.replace(/([^\\s>+~,()]*):-soup-contains\\((["'])(.*?)\\2\\)/g, (match, compound, quote, text) => {
+        const token = 'c' + (tokens++);
+        compound = compound || '*';
+        for (const element of document.querySelectorAll(compound)) {
+            if (element.textContent.includes(text)) {
+                const current = element.getAttribute('data-soup-contains');
+                element.setAttribute('data-soup-contains', current ? current + ' ' + token : token);
+                marked.push(element);
+            }
+        }
+        return compound + '[data-soup-contains~="' + token + '"]';
+    });
+}
+const OPS = {
+    text: element => element.textContent,
+    strip: value => value.trim(),
+    nonempty: value => value || null,
+    int: value => typeof value === 'number' ? value : (/^\\s*[+-]?\\d+\\s*$/.test(value) ? parseInt(value, 10) : null),
+    attr: (element, name) => element.getAttribute(name),
+    replace: (value, old, replacement) => value.split(old).join(replacement),
+    slice: (value, start, end) => value.slice(start === null ? undefined : start, end === null ? undefined : end),
+    contains: (value, text) => value.includes(text) ? value : null,
+    regex: (value, pattern) => {
+        const match = new RegExp(pattern).exec(value);
+        if (!match) return null;
+        return match.length > 1 ? (match[1] === undefined ? null : match[1]) : match[0];
+    },
+};
+function compile(name, spec) {
+    return {
+        name: name,
+        many: !!spec.many,
+        css: rewrite(spec.css),
+        within: spec.within ? rewrite(spec.within) : null,
+        post: (spec.post || ['text', 'strip']).map(op => typeof op === 'string' ? [op] : op),
+        fields: Object.entries(spec.fields || {}).map(([subName, subSpec]) => compile(subName, subSpec)),
+    };
+}
+function value(field, element) {
+    if (field.fields.length) {
+        const record = {};
+        for (const sub of field.fields) record[sub.name] = evaluate(sub, element);
+        return record;
+    }
+    let result = element;
+    for (const [op, ...args] of field.post) {
+        result = OPS[op](result, ...args);
+        if (result === null || result === undefined) return null;
+    }
+    return result;
+}
+function evaluate(field, scope) {
+    if (field.within) {
+        scope = scope.querySelector(field.within);
+        if (!scope) return field.many ? [] : null;
+    }
+    const values = [];
+    for (const element of scope.querySelectorAll(field.css)) {
+        const result = value(field, element);
+        if (result === null) continue;
+        if (!field.many) return result;
+        values.push(result);
+    }
+    return field.many ? values : null;
+}
+try {
+    const fields = Object.entries(arguments[0]).map(([name, spec]) => compile(name, spec));
+    const result = {};
+    for (const field of fields) result[field.name] = evaluate(field, document);
+    return JSON.stringify(result);
+} finally {
+    for (const element of marked) element.removeAttribute('data-soup-contains');
+}
+"""
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _regex(value, pattern):
+    match = re.search(pattern, value)
+    if match is None:
+        return None
+    return match.group(1) if match.groups() else match.group(0)
+
+
+# 후처리 단계: 이름 → (함수, 인자 수). 값이 None이 되면 이후 단계는 건너뛴다
+POST_OPS = {
+    'text': (lambda element: element.get_text(), 0),
+    'strip': (lambda value: value.strip(), 0),
+    'nonempty': (lambda value: value or None, 0),
+    'int': (_to_int, 0),
+    'attr': (lambda element, name: element.get(name), 1),
+    'replace': (lambda value, old, new: value.replace(old, new), 2),
+    'slice': (lambda value, start, end: value[start:end], 2),
+    'contains': (lambda value, text: value if text in value else None, 1),
+    'regex': (_regex, 1),
+}
+
+
+def _compile_op(op):
+    name, args = (op, []) if isinstance(op, str) else (op[0], list(op[1:]))
+    if name not in POST_OPS:
+        raise ValueError(f"알 수 없는 후처리 단계: {name}")
+    func, arity = POST_OPS[name]
+    if len(args) != arity:
+        raise ValueError(f"{name} 단계는 인자 {arity}개가 필요합니다: {op}")
+    return lambda value: func(value, *args)
+
+
+# 태그 이름, 클래스, class 속성 일치만 쓰는 단순 선택자 (예: article.edqw2x10, span[class="a b"]).
+# ":scope > " 로 시작하면 범위의 자식만 보고, 그때는 :nth-child(N)로 위치도 정할 수 있다
+SIMPLE_SELECTOR_PATTERN = re.compile(
+    r'^(:scope\s*>\s*)?(?:\*|([a-zA-Z][\w-]*))?((?:\.[\w-]+)*)(?:\[class="([^"]*)"\])?(?::nth-child\((\d+)\))?$'
+)
+
+
+class SimpleSelector:
+    """단순 선택자는 soupsieve를 거치지 않고 태그 이름과 클래스만 비교한다 (손으로 쓴 find()와 같은 비용)"""
+    def __init__(self, name, classes, exact, child=False, position=None):
+        self.name = name
+        self.classes = classes
+        self.exact = exact
+        self.child = child
+        self.position = position
+
+    def match(self, element):
+        if self.name is not None and element.name != self.name:
+            return False
+        if self.classes or self.exact is not None:
+            classes = element.get('class')
+            if not classes:
+                return False
+            if self.exact is not None and ' '.join(classes) != self.exact:
+                return False
+            if not self.classes.issubset(classes):
+                return False
+        return True
+
+    def iselect(self, scope):
+        if not self.child:
+            for element in scope.descendants:
+                if isinstance(element, Tag) and self.match(element):
+                    yield element
+            return
+        children = (element for element in scope.children if isinstance(element, Tag))
+        for position, element in enumerate(children, 1):
+            if (self.position is None or position == self.position) and self.match(element):
+                yield element
+
+    def select_one(self, scope):
+        return next(self.iselect(scope), None)
+
+
+def compile_selector(css):
+    match = SIMPLE_SELECTOR_PATTERN.match(css.strip())
+    if match is None or css.strip() in ('', '*'):
+        return soupsieve.compile(css)
+    child, name, classes, exact, position = match.groups()
+    if position is not None and not child:
+        # 자식 범위가 아닌 :nth-child는 형제 위치를 따져야 하므로 soupsieve에 맡긴다
+        return soupsieve.compile(css)
+    return SimpleSelector(name, set(classes.split('.')[1:]), exact, bool(child), int(position) if position else None)
+
+
+class Field:
+    """명세의 필드 하나를 컴파일한 것: within 범위 안에서 css로 찾고 post 단계를 적용
+
+    fields가 있으면 찾은 요소마다 하위 필드로 이루어진 레코드(dict)를 만든다.
+    many가 아니면 결과가 None이 아닌 첫 요소의 값을 쓴다.
+    """
+    def __init__(self, name, spec):
+        self.name = name
+        self.many = spec.get('many', False)
+        self.css = compile_selector(spec['css'])
+        self.within = compile_selector(spec['within']) if 'within' in spec else None
+        self.post = [_compile_op(op) for op in spec.get('post', ['text', 'strip'])]
+        self.fields = [Field(sub_name, sub_spec) for sub_name, sub_spec in spec.get('fields', {}).items()]
+
+    def value(self, element):
+        if self.fields:
+            return {field.name: field.evaluate(element) for field in self.fields}
+        value = element
+        for op in self.post:
+            value = op(value)
+            if value is None:
+                return None
+        return value
+
+    def collect(self, elements):
+        values = (self.value(element) for element in elements)
+        if self.many:
+            return [value for value in values if value is not None]
+        return next((value for value in values if value is not None), None)
+
+    def evaluate(self, scope):
+        if self.within is not None:
+            scope = self.within.select_one(scope)
+            if scope is None:
+                return [] if self.many else None
+        return self.collect(self.css.iselect(scope))
+
+
+class ExtractionSpec:
+    """페이지별 필드 → 선택자 → 후처리 명세를 한 번 컴파일해 두고 필드마다 선택자를 한 번씩 실행해 추출
+
+    many가 아닌 필드는 첫 값을 찾으면 순회를 멈춘다.
+
+    명세 파일(JSON, PyYAML이 있으면 YAML)이 바뀌면 reload_interval초 안에 다시 컴파일한다.
+    새 명세가 잘못되었으면 로그만 남기고 이전 명세를 계속 쓴다.
+    """
+    def __init__(self, path=SPEC_PATH, reload_interval=SPEC_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self._mtime = os.path.getmtime(path)
+        self._raw = self._load()
+        self._pages = self._compile(self._raw)
+        self._combined = {}
+        self._browser = {}
+
+    def _load(self):
+        with open(self.path, encoding='utf-8') as f:
+            if self.path.endswith(('.yaml', '.yml')):
+                if yaml is None:
+                    raise ImportError("YAML 명세를 사용하려면 PyYAML이 필요합니다.")
+                return yaml.safe_load(f)
+            return json.load(f)
+
+    def _compile(self, spec):
+        return {
+            page: [Field(name, field_spec) for name, field_spec in fields.items()]
+            for page, fields in spec.items()
+        }
+
+    def reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return False
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(self.path)
+                if mtime == self._mtime:
+                    return False
+                raw = self._load()
+                pages = self._compile(raw)
+            except Exception as e:
+                log(f"추출 명세 다시 불러오기 실패, 이전 명세 유지: {e}")
+                return False
+            self._mtime = mtime
+            self._raw = raw
+            self._pages = pages
+            self._combined = {}
+            self._browser = {}
+        log(f"추출 명세 다시 불러옴: {self.path}")
+        return True
+
+    def fields(self, *pages):
+        key = pages
+        if key not in self._combined:
+            self._combined[key] = [field for page in pages for field in self._pages[page]]
+        return self._combined[key]
+
+    def extract(self, soup, *pages):
+        """pages에 속한 모든 필드를 추출해 {필드명: 값}으로 반환"""
+        self.reload_if_changed()
+        with metrics.timer('extract', page='+'.join(pages)):
+            return self._extract(soup, self.fields(*pages))
+
+    def browser_spec(self, *pages):
+        """pages의 필드 명세를 합친 {필드명: 명세} (브라우저 스크립트 인자)"""
+        key = pages
+        if key not in self._browser:
+            self._browser[key] = {name: spec for page in pages for name, spec in self._raw[page].items()}
+        return self._browser[key]
+
+    def extract_in_browser(self, driver, *pages):
+        """extract와 같은 결과를 브라우저 안에서 계산해 한 번의 왕복으로 받아 온다"""
+        self.reload_if_changed()
+        with metrics.timer('browser_extract', page='+'.join(pages)):
+            return json.loads(driver.execute_script(BROWSER_EXTRACT_SCRIPT, self.browser_spec(*pages)))
+
+    def _extract(self, soup, fields):
+        # 요소마다 모든 필드의 선택자를 맞춰 보면 요소 수 × 필드 수만큼 soupsieve 비교가 일어난다.
+        # 필드별로 범위 안에서 한 번씩 찾는 편이 단순 선택자는 find() 수준, 나머지는 범위가 좁아 훨씬 싸다
+        return {field.name: field.evaluate(soup) for field in fields}
+
+
+default_spec = ExtractionSpec()
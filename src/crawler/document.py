@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+from bs4 import BeautifulSoup
+
+from src.utils.metrics import metrics
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+# 현재 URL과 DOM 버전을 돌려준다. 버전은 MutationObserver가 DOM 변경마다 1씩 올린다
+DOM_VERSION_SCRIPT = """
+if (window.__domVersion === undefined) {
+    window.__domVersion = 1;
+    new MutationObserver(() => { window.__domVersion += 1; })
+        .observe(document, {childList: true, subtree: true, characterData: true, attributes: true});
+}
+return [location.href, window.__domVersion];
+"""
+
+
+def parse_html(html):
+    """설치되어 있으면 lxml, 없으면 html.parser로 파싱"""
+    with metrics.timer('parse'):
+        return BeautifulSoup(html, PARSER)
+
+
+class DocumentCache:
+    """URL + DOM 버전별로 한 번만 파싱한 soup을 모든 추출 함수가 공유하도록 보관 (LRU)"""
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def _get_or_parse(self, key, load_html):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.inc('document_cache_hits')
+            return self._entries[key]
+
+        self.misses += 1
+        soup = parse_html(load_html())
+        self._entries[key] = soup
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return soup
+
+    def from_driver(self, driver):
+        """DOM이 바뀌지 않았으면 page_source를 다시 가져오지도, 다시 파싱하지도 않는다"""
+        url, version = driver.execute_script(DOM_VERSION_SCRIPT)
+
+        def page_source():
+            with metrics.timer('page_source'):
+                return driver.page_source
+
+        return self._get_or_parse((url, version), page_source)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,219 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from src.utils.config import (
+    USER_AGENT, WARM_UP_URL, DRIVER_POOL_SIZE, DRIVER_MAX_PAGES, DRIVER_MAX_MEMORY_MB,
+    LEAN_BROWSER, PAGE_LOAD_STRATEGY, BLOCKED_URL_PATTERNS,
+)
+from src.utils.helpers import log
+from src.utils.metrics import metrics
+
+# 반납을 기다리는 acquire가 빈 자리가 생겼는지 다시 확인하는 간격(초)
+ACQUIRE_POLL_SECONDS = 1.0
+
+
+def create_driver(lean=LEAN_BROWSER, capture_network=False):
+    """Chrome 세션 생성. lean이면 headless로 띄우고 이미지, 글꼴, 추적 스크립트 요청을 막는다
+
+    capture_network이면 네트워크 이벤트를 성능 로그로 남긴다 (리뷰 API 엔드포인트를 찾을 세션만).
+    """
+    options = Options()
+    if lean:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--mute-audio')
+        options.add_argument('--autoplay-policy=user-gesture-required')
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        options.page_load_strategy = PAGE_LOAD_STRATEGY
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    if capture_network:
+        # 리뷰 위젯이 호출하는 JSON 엔드포인트를 찾기 위해 네트워크 이벤트를 성능 로그로 남긴다
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    driver = webdriver.Chrome(options=options)
+    driver.implicitly_wait(2)
+    if lean and BLOCKED_URL_PATTERNS:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+
+    return driver
+
+
+class DriverSession:
+    """풀에서 빌려주는 WebDriver 세션과 사용량"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+    def memory_mb(self):
+        try:
+            used = self.driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : 0"
+            )
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def drain_logs(self):
+        # 성능 로그는 읽을 때까지 chromedriver에 쌓이므로 풀에 돌려줄 때 비운다
+        try:
+            self.driver.get_log('performance')
+        except Exception:
+            pass
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            log(f"브라우저 종료 실패: {e}")
+
+
+class DriverPool:
+    """미리 띄워 둔 WebDriver 세션을 크롤 작업에 빌려주는 풀
+
+    세션은 max_pages 페이지를 불러왔거나 JS 힙이 max_memory_mb를 넘으면 반납 시점에
+    종료되고, 다음 요청 때 새 세션으로 교체된다. 프로그램 종료 시 모든 세션을 닫는다.
+    """
+    def __init__(self, size=DRIVER_POOL_SIZE, max_pages=DRIVER_MAX_PAGES, max_memory_mb=DRIVER_MAX_MEMORY_MB,
+                 factory=create_driver, warm_up_url=WARM_UP_URL):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.factory = factory
+        self.warm_up_url = warm_up_url
+        self._idle = queue.Queue()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.close)
+
+    def _launch(self):
+        with metrics.timer('driver_startup'):
+            driver = self.factory()
+            session = DriverSession(driver)
+            if self.warm_up_url:
+                driver.get(self.warm_up_url)
+        metrics.inc('driver_sessions')
+        return session
+
+    def start(self):
+        """비어 있는 자리만큼 세션을 병렬로 미리 띄운다 (acquire와 동시에 불러도 size를 넘지 않는다)"""
+        with self._lock:
+            missing = self.size - len(self._sessions)
+            # 자리를 먼저 잡아 두고 락 밖에서 브라우저를 띄운다
+            self._sessions.extend([None] * max(missing, 0))
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [executor.submit(self._launch) for _ in range(missing)]
+        started = 0
+        for future in futures:
+            try:
+                session = future.result()
+            except Exception as e:
+                log(f"브라우저 세션 시작 실패: {e}")
+                self._fill_slot(None)
+                continue
+            if self._fill_slot(session):
+                started += 1
+        log(f"브라우저 세션 {started}개 준비 완료")
+
+    def _fill_slot(self, session):
+        # 잡아 둔 자리를 session으로 채우고 대기열에 넣는다. None이면 자리를 비운다. 풀이 닫혔으면 False
+        with self._lock:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                if session is None:
+                    self._sessions.remove(None)
+                else:
+                    self._sessions[self._sessions.index(None)] = session
+        if closed:
+            if session is not None:
+                session.quit()
+            return False
+        if session is not None:
+            self._idle.put(session)
+        return True
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("이미 종료된 DriverPool입니다.")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_launch = len(self._sessions) < self.size
+                if can_launch:
+                    self._sessions.append(None)
+            if can_launch:
+                try:
+                    session = self._launch()
+                except Exception:
+                    self._fill_slot(None)
+                    raise
+                with self._lock:
+                    if not self._closed:
+                        self._sessions[self._sessions.index(None)] = session
+                return session
+
+            # 세션 교체에 실패해 자리가 비는 경우도 있으므로 기다리는 동안 주기적으로 다시 확인한다
+            wait = ACQUIRE_POLL_SECONDS if deadline is None else min(ACQUIRE_POLL_SECONDS, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def release(self, session):
+        if self._closed:
+            session.quit()
+            return
+        if session.pages >= self.max_pages or session.memory_mb() >= self.max_memory_mb:
+            # 자리는 그대로 두고 새 세션으로 바꿔 대기열에 넣는다 (반납을 기다리는 acquire가 멈추지 않게)
+            log(f"브라우저 세션 교체 ({session.pages}페이지)")
+            with self._lock:
+                self._sessions[self._sessions.index(session)] = None
+            session.quit()
+            try:
+                replacement = self._launch()
+            except Exception as e:
+                log(f"브라우저 세션 교체 실패: {e}")
+                replacement = None
+            self._fill_slot(replacement)
+            return
+        session.drain_logs()
+        self._idle.put(session)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            sessions = [session for session in self._sessions if session is not None]
+            self._sessions = []
+        for session in sessions:
+            session.quit()
+        if sessions:
+            log(f"브라우저 세션 {len(sessions)}개 종료")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,124 @@
+import gzip
+import http.client
+import queue
+import threading
+import zlib
+from urllib.parse import urlsplit, urljoin, quote
+
+from src.utils.config import USER_AGENT, HTTP_TIMEOUT, HTTP_POOL_SIZE
+
+
+class FetchResult:
+    """HTTP 응답 결과"""
+    def __init__(self, url, status, headers, text):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.text = text
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+
+class HttpFetcher:
+    """호스트별 keep-alive 커넥션을 재사용하는 HTTP 클라이언트 (스레드 안전)"""
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT, headers=None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = {
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'ko-KR,ko;q=0.9',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        if headers:
+            self.headers.update(headers)
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, scheme, host):
+        with self._lock:
+            key = (scheme, host)
+            if key not in self._pools:
+                self._pools[key] = queue.LifoQueue(maxsize=self.pool_size)
+            return self._pools[key]
+
+    def _acquire(self, scheme, host):
+        try:
+            return self._pool(scheme, host).get_nowait()
+        except queue.Empty:
+            if scheme == 'https':
+                return http.client.HTTPSConnection(host, timeout=self.timeout)
+            return http.client.HTTPConnection(host, timeout=self.timeout)
+
+    def _release(self, scheme, host, conn):
+        try:
+            self._pool(scheme, host).put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request(self, url, headers):
+        parts = urlsplit(url)
+        path = quote(parts.path or '/', safe="/@%:-._~")
+        if parts.query:
+            path += '?' + parts.query
+
+        # 풀에서 꺼낸 커넥션이 서버 쪽에서 끊겼을 수 있으므로 한 번 재시도
+        for attempt in range(2):
+            conn = self._acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError, OSError):
+                conn.close()
+                if attempt == 1:
+                    raise
+                continue
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(parts.scheme, parts.netloc, conn)
+            return response, body
+
+    def fetch(self, url, headers=None, max_redirects=3):
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+
+        for _ in range(max_redirects + 1):
+            response, body = self._request(url, request_headers)
+            if response.status in (301, 302, 303, 307, 308) and response.getheader('Location'):
+                url = urljoin(url, response.getheader('Location'))
+                continue
+            break
+
+        response_headers = {key.lower(): value for key, value in response.getheaders()}
+        return FetchResult(url, response.status, response_headers, self._decode(body, response_headers))
+
+    def _decode(self, body, headers):
+        encoding = headers.get('content-encoding', '')
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+
+        charset = 'utf-8'
+        content_type = headers.get('content-type', '')
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=')[-1].split(';')[0].strip()
+        return body.decode(charset, errors='replace')
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
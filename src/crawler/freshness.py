@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from src.utils.config import FRESHNESS_DB_PATH
+
+
+def fingerprint(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class FreshnessStore:
+    """URL별 콘텐츠 지문, ETag/Last-Modified, 마지막 수집 결과를 보관
+
+    다음 실행에서 조건부 요청 헤더를 만들고, 지문이 같으면 이전 결과를 재사용하는 데 쓴다.
+    """
+    def __init__(self, path=FRESHNESS_DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS page_freshness (
+                url TEXT PRIMARY KEY,
+                fingerprint TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                checked_at TEXT,
+                result TEXT
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, etag, last_modified, result FROM page_freshness WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'fingerprint': row[0],
+            'etag': row[1],
+            'last_modified': row[2],
+            'result': json.loads(row[3]) if row[3] else None,
+        }
+
+    def save(self, url, fingerprint, result, etag=None, last_modified=None):
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO page_freshness (url, fingerprint, etag, last_modified, checked_at, result)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    fingerprint = excluded.fingerprint, etag = excluded.etag,
+                    last_modified = excluded.last_modified, checked_at = excluded.checked_at,
+                    result = excluded.result
+            """, (url, fingerprint, etag, last_modified, datetime.now().isoformat(timespec='seconds'),
+                  json.dumps(result, ensure_ascii=False)))
+            self._conn.commit()
+
+    def conditional_headers(self, cached):
+        """이전 응답의 검증자로 조건부 요청 헤더 생성"""
+        headers = {}
+        if cached and cached['result'] is not None:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
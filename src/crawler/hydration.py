@@ -0,0 +1,264 @@
+import json
+import re
+
+from src.crawler.review_api import REVIEW_JSON_KEYS, review_row
+
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S)
+
+# __NEXT_DATA__ 항목에서 값을 찾을 때 확인할 키 (앞쪽 우선, 'a.b'는 중첩 키)
+SERVICE_JSON_KEYS = {
+    'title': ('gig_title', 'gigTitle', 'title'),
+    'seller': ('seller.nickname', 'seller.username', 'user.nickname', 'user.username',
+               'seller_name', 'sellerName', 'nickname', 'username'),
+    'id': ('gig_id', 'gigId', 'id'),
+    'review_count': ('review_count', 'reviewCount', 'rating_count', 'ratingCount', 'review.count'),
+}
+SERVICE_AMOUNT_KEYS = ('total_gig_count', 'totalGigCount', 'total_count', 'totalCount', 'total')
+PROFILE_JSON_KEYS = {
+    'introduction': ('introduction', 'self_introduction', 'selfIntroduction'),
+    'total_jobs': ('total_jobs', 'totalJobs', 'total_orders', 'totalOrders', 'order_count', 'orderCount'),
+    'portfolio_count': ('portfolio_count', 'portfolioCount', 'portfolios_count', 'portfoliosCount'),
+    'review_count': ('review_count', 'reviewCount', 'rating_count', 'ratingCount', 'evaluation_count'),
+    'career': ('careers', 'career'),
+    'skills': ('skills', 'skill_tags', 'skillTags'),
+    'specialties': ('specialties', 'specialty', 'expertises'),
+}
+SPECIALTY_JSON_KEYS = {
+    'title': ('title', 'name', 'category_name', 'categoryName', 'category'),
+    'tags': ('tags', 'skills', 'items', 'children'),
+}
+PACKAGE_LIST_KEYS = ('packages', 'gig_packages', 'gigPackages')
+PACKAGE_JSON_KEYS = {
+    'type': ('package_type', 'packageType', 'type', 'name'),
+    'price': ('price', 'amount'),
+    'title': ('title', 'package_title', 'packageTitle'),
+    'description': ('description', 'desc'),
+    'options': ('options', 'features', 'items'),
+}
+OPTION_JSON_KEYS = {
+    'name': ('name', 'title', 'label'),
+    'value': ('value', 'count', 'included'),
+}
+GIG_INFO_JSON_KEYS = {
+    'skill_level': ('skill_level', 'skillLevel', 'tech_level', 'techLevel'),
+    'team_size': ('team_size', 'teamSize', 'team_scale', 'teamScale'),
+}
+LABEL_KEYS = ('name', 'title', 'label', 'text', 'value')
+PACKAGE_TYPES = ['STANDARD', 'DELUXE', 'PREMIUM']
+
+
+def next_data(source):
+    """HTML 문자열이나 soup에서 __NEXT_DATA__ JSON을 꺼낸다. 없거나 깨졌으면 None"""
+    if source is None:
+        return None
+    if isinstance(source, str):
+        match = NEXT_DATA_PATTERN.search(source)
+        text = match.group(1) if match else None
+    else:
+        script = source.find('script', id='__NEXT_DATA__')
+        text = script.string if script else None
+    if not text:
+        return None
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    # 페이지 데이터는 props.pageProps 아래에 있다
+    if isinstance(data, dict):
+        return data.get('props', {}).get('pageProps', data.get('props', data))
+    return None
+
+
+def _lookup(item, key):
+    for part in key.split('.'):
+        if not isinstance(item, dict):
+            return None
+        item = item.get(part)
+    return item
+
+
+def _first(item, keys):
+    for key in keys:
+        value = _lookup(item, key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _walk(data):
+    """JSON 트리를 앞에서부터(깊이 우선) 훑으며 딕셔너리와 리스트를 하나씩 내놓는다"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        yield node
+        children = node.values() if isinstance(node, dict) else node if isinstance(node, list) else ()
+        stack.extend(reversed([child for child in children if isinstance(child, (dict, list))]))
+
+
+def _find_records(data, required):
+    """required의 키 묶음마다 값이 있는 딕셔너리로 이루어진 첫 리스트"""
+    for node in _walk(data):
+        if isinstance(node, list) and node and all(isinstance(item, dict) for item in node):
+            if all(_first(node[0], keys) is not None for keys in required):
+                return node
+    return None
+
+
+def _find_dict(data, keys):
+    for node in _walk(data):
+        if isinstance(node, dict) and _first(node, keys) is not None:
+            return node
+    return None
+
+
+def _to_int(value):
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        digits = re.sub(r'[^\d]', '', value)
+        return int(digits) if digits else None
+    return None
+
+
+def _label(item):
+    if isinstance(item, dict):
+        item = _first(item, LABEL_KEYS)
+    return str(item).strip() if item not in (None, "") else None
+
+
+def _labels(items):
+    if not isinstance(items, list):
+        return []
+    return [label for label in (_label(item) for item in items) if label]
+
+
+def _price_text(value):
+    # 화면과 같은 '79,000원' 형식
+    return f"{value:,}원" if isinstance(value, (int, float)) else (value or "")
+
+
+def category_page(data):
+    """카테고리 페이지 → {'service_amount', 'services': [[서비스명, 판매자, 링크, 리뷰수], ...]}
+
+    서비스 목록을 찾지 못하면 None (DOM 추출로 대체)
+    """
+    if data is None:
+        return None
+    items = _find_records(data, [SERVICE_JSON_KEYS['title'], SERVICE_JSON_KEYS['seller'], SERVICE_JSON_KEYS['id']])
+    if items is None:
+        return None
+    services = []
+    for item in items:
+        title, seller, gig_id = (_first(item, SERVICE_JSON_KEYS[key]) for key in ('title', 'seller', 'id'))
+        if title is None or seller is None or gig_id is None:
+            continue
+        services.append([str(title), str(seller), f"/gig/{gig_id}", _to_int(_first(item, SERVICE_JSON_KEYS['review_count']))])
+    if not services:
+        return None
+    amount = _find_dict(data, SERVICE_AMOUNT_KEYS)
+    return {
+        'service_amount': _to_int(_first(amount, SERVICE_AMOUNT_KEYS)) if amount else None,
+        'services': services,
+    }
+
+
+def profile_page(data):
+    """프로필 페이지 → 추출 명세의 profile, review_list와 같은 필드 + review_count. 프로필이 없으면 None
+
+    JSON에서 찾지 못한 값은 None(목록은 빈 목록)으로 두고 DOM 추출로 채우게 한다.
+    """
+    if data is None:
+        return None
+    profile = _find_dict(data, PROFILE_JSON_KEYS['introduction'])
+    if profile is None:
+        return None
+
+    def value(name):
+        found = _first(profile, PROFILE_JSON_KEYS[name])
+        if found is None:
+            node = _find_dict(data, PROFILE_JSON_KEYS[name])
+            found = _first(node, PROFILE_JSON_KEYS[name]) if node else None
+        return found
+
+    specialties = []
+    for specialty in value('specialties') or []:
+        if isinstance(specialty, dict):
+            title = _first(specialty, SPECIALTY_JSON_KEYS['title'])
+            specialties.append({'title': _label(title), 'tags': _labels(_first(specialty, SPECIALTY_JSON_KEYS['tags']))})
+
+    review_count = _to_int(value('review_count'))
+    review_items = _find_records(data, [REVIEW_JSON_KEYS['date'], REVIEW_JSON_KEYS['service_title']])
+    if review_items is None:
+        # 리뷰를 따로 불러오는 페이지는 JSON에 리뷰 목록이 없다. 리뷰가 0건일 때만 빈 목록으로 확정한다
+        reviews = [] if review_count == 0 else None
+    else:
+        reviews = [dict(zip(('date', 'service_title', 'period', 'price'), row))
+                   for row in (review_row(item) for item in review_items) if row is not None]
+    total_jobs = _to_int(value('total_jobs'))
+
+    return {
+        'introduction': str(_first(profile, PROFILE_JSON_KEYS['introduction'])).strip(),
+        'career': _labels(value('career')),
+        'skills': _labels(value('skills')),
+        'specialties': specialties,
+        'total_jobs': str(total_jobs) if total_jobs is not None else None,
+        'portfolio_count': _to_int(value('portfolio_count')),
+        'review_count': review_count,
+        'reviews': reviews,
+    }
+
+
+def _package_details(options):
+    details = {'included_features': [], 'specifications': {}}
+    for option in options if isinstance(options, list) else []:
+        if not isinstance(option, dict):
+            continue
+        name = _label(_first(option, OPTION_JSON_KEYS['name']))
+        value = _first(option, OPTION_JSON_KEYS['value'])
+        if name is None:
+            continue
+        # 체크 표시 항목은 포함 기능, 값이 있는 항목은 사양
+        if value is True or value is None:
+            details['included_features'].append(name)
+        elif value is not False:
+            details['specifications'][name] = str(value)
+    return details
+
+
+def gig_packages(data):
+    """서비스 상세 페이지 → {'STANDARD': {'price', 'title', 'description', 'details'}, ...}
+
+    패키지가 하나면 화면 추출과 같이 'SINGLE'로 둔다. 패키지를 찾지 못하면 None
+    """
+    if data is None:
+        return None
+    # 추천 서비스 목록 등 다른 가격 목록과 헷갈리지 않도록 packages 키를 먼저 본다
+    container = _find_dict(data, PACKAGE_LIST_KEYS)
+    items = _first(container, PACKAGE_LIST_KEYS) if container else None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        items = _find_records(data, [PACKAGE_JSON_KEYS['price'], PACKAGE_JSON_KEYS['title'], PACKAGE_JSON_KEYS['options']])
+    if not items:
+        return None
+    packages = {}
+    for i, item in enumerate(items):
+        package_type = str(_first(item, PACKAGE_JSON_KEYS['type']) or "").upper()
+        if package_type not in PACKAGE_TYPES:
+            package_type = PACKAGE_TYPES[i] if i < len(PACKAGE_TYPES) else f'PACKAGE_{i+1}'
+        packages[package_type] = {
+            'price': _price_text(_first(item, PACKAGE_JSON_KEYS['price'])),
+            'title': str(_first(item, PACKAGE_JSON_KEYS['title'])).strip(),
+            'description': str(_first(item, PACKAGE_JSON_KEYS['description']) or "").strip(),
+            'details': _package_details(_first(item, PACKAGE_JSON_KEYS['options'])),
+        }
+    if len(packages) == 1:
+        return {'SINGLE': next(iter(packages.values()))}
+    return packages
+
+
+def gig_info(data):
+    """서비스 상세 페이지의 {'skill_level', 'team_size'}. 찾지 못한 값은 None"""
+    info = {}
+    for name, keys in GIG_INFO_JSON_KEYS.items():
+        node = _find_dict(data, keys) if data is not None else None
+        info[name] = _label(_first(node, keys)) if node else None
+    return info
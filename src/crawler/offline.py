@@ -0,0 +1,139 @@
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import unquote
+
+from src.crawler.archive import read_blob
+from src.crawler.crawler import (
+    parse_category_html, parse_gig_html, parse_portfolio_html, parse_profile_html, profile_record, review_rows,
+)
+from src.crawler.review_api import parse_reviews
+from src.utils.config import PARSE_WORKERS
+from src.utils.helpers import log
+from src.utils.metrics import metrics
+
+# 페이지 종류별 추출기 (모두 HTML/JSON 문자열만 받는 순수 함수)
+EXTRACTORS = {
+    'category': parse_category_html,
+    'profile': parse_profile_html,
+    'review': parse_reviews,
+    'portfolio': parse_portfolio_html,
+    'gig': parse_gig_html,
+}
+CATEGORY_URL_PATTERN = re.compile(r'/category/(\d+)(?:\?(?:.*&)?page=(\d+))?')
+SELLER_URL_PATTERN = re.compile(r'/@([^/?#]+)')
+
+
+def _extract_page(page):
+    # 파싱 프로세스에서 실행: 보관소 색인 없이 세그먼트 파일에서 본문을 읽어 추출한다. (결과, 오류)
+    try:
+        return EXTRACTORS[page['kind']](read_blob(page['location'])), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def extract_archive(archive, kinds=None, at=None, workers=PARSE_WORKERS, chunksize=64):
+    """보관한 페이지(URL별로 at 이전의 최신)를 프로세스 풀에서 다시 추출. [(페이지, 결과), ...]
+
+    네트워크와 브라우저를 쓰지 않는다. 추출에 실패한 페이지의 결과는 None
+    """
+    pages = [page for page in archive.latest(kinds or list(EXTRACTORS), at) if page['kind'] in EXTRACTORS]
+    log(f"보관한 페이지 {len(pages)}개 다시 추출")
+    results = []
+    failed = 0
+    # 페이지를 chunksize개씩 묶어 보내 프로세스 간 통신 횟수를 줄인다
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        for page, (result, error) in zip(pages, executor.map(_extract_page, pages, chunksize=chunksize)):
+            if error is not None:
+                failed += 1
+                metrics.inc('failures', stage='reextract')
+                log(f"추출 실패: {page['url']} ({error})")
+            metrics.inc('reextracted', kind=page['kind'])
+            results.append((page, result))
+            if len(results) % 5000 == 0:
+                log(f"[{len(results)}/{len(pages)}]")
+    log(f"다시 추출 완료: {len(results)}개 중 실패 {failed}개")
+    return results
+
+
+def service_rows(results):
+    """카테고리 페이지 결과 → services.csv 행. 카테고리마다 페이지 순서대로 링크 기준 중복 제거"""
+    pages = []
+    for page, fields in results:
+        match = CATEGORY_URL_PATTERN.search(page['url'])
+        if page['kind'] == 'category' and fields is not None and match is not None:
+            pages.append((int(match.group(1)), int(match.group(2) or 1), fields['services']))
+
+    rows = []
+    seen_links = set()
+    for category_id, _, services in sorted(pages, key=lambda item: item[:2]):
+        for info in services or []:
+            if (category_id, info[2]) not in seen_links:
+                seen_links.add((category_id, info[2]))
+                rows.append(info[:3] + [category_id, info[3] if len(info) > 3 else None])
+    return rows
+
+
+def review_run_rows(runs):
+    """판매자 한 명의 보관된 리뷰 API 페이지 {수집 시각: {페이지 번호: 리뷰 또는 None}} → 첫 페이지 뒤의 리뷰
+
+    가장 최근 회차(같은 수집 시각)의 페이지만 쓰고, 온라인 수집(_fetch_review_pages)과 같이 2페이지부터
+    차례로 읽다가 빠진 페이지, 빈 페이지, 바로 앞 페이지와 같은 페이지에서 멈춘다.
+    끝을 넘겨 더 요청했던 페이지나 범위 밖 요청에 끝 페이지를 다시 돌려준 응답은 버려진다.
+    """
+    if not runs:
+        return []
+    pages = runs[max(runs)]
+    reviews = []
+    previous = None
+    page_no = 2
+    while pages.get(page_no) and pages[page_no] != previous:
+        reviews.extend(pages[page_no])
+        previous = pages[page_no]
+        page_no += 1
+    return reviews
+
+
+def profile_records(results):
+    """프로필, 리뷰 API, 포트폴리오 페이지 결과를 판매자별로 모아 profiles.csv 레코드를 만든다
+
+    첫 페이지 이후의 리뷰는 리뷰 API 응답이 보관된 판매자만 채운다 (브라우저로 넘긴 페이지는 보관되지 않는다).
+    """
+    profiles = {}
+    review_pages = {}
+    portfolios = {}
+    for page, result in results:
+        if page['kind'] == 'review':
+            if page['key']:
+                seller_name, page_no = page['key'].rsplit(':', 1)
+                review_pages.setdefault(seller_name, {}).setdefault(page['fetched_at'], {})[int(page_no)] = result
+            continue
+        match = SELLER_URL_PATTERN.search(page['url'])
+        if match is None:
+            continue
+        seller_name = unquote(match.group(1))
+        if page['kind'] == 'profile' and result is not None:
+            profiles[seller_name] = result
+        elif page['kind'] == 'portfolio':
+            portfolios[seller_name] = result
+
+    records = []
+    for seller_name, fields in profiles.items():
+        reviews = review_rows(fields['reviews']) + review_run_rows(review_pages.get(seller_name))
+        records.append(profile_record(seller_name, fields, reviews, portfolios.get(seller_name)))
+    return records
+
+
+def gig_records(results):
+    """서비스 상세 페이지 결과 → gigs.csv 레코드. HTML만으로 채우지 못한 값(브라우저가 필요했던 값)은 비워 둔다"""
+    records = []
+    incomplete = 0
+    for page, fields in results:
+        if page['kind'] != 'gig' or fields is None:
+            continue
+        if None in fields.values():
+            incomplete += 1
+        records.append({'service_url': page['url'], **fields})
+    if incomplete:
+        log(f"HTML만으로 채우지 못한 서비스 {incomplete}개는 빈 값으로 저장합니다.")
+    return records
@@ -0,0 +1,174 @@
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.utils.config import PARSE_WORKERS, PIPELINE_QUEUE_SIZE
+from src.utils.helpers import log
+from src.utils.metrics import metrics
+
+# 단계가 끝났음을 다음 단계에 알리는 표시
+_DONE = object()
+
+
+def process_pool(workers=PARSE_WORKERS):
+    """파싱 단계의 프로세스 풀. 스레드가 도는 중에 fork하면 다른 스레드가 잡고 있던 락이 그대로 복사될 수 있어 spawn으로 띄운다"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def _run_parse(parse, html):
+    # 파싱 프로세스 안에서 실행: 지표는 프로세스마다 따로라서 소요 시간을 결과와 함께 돌려준다
+    started = time.perf_counter()
+    result = parse(html)
+    return result, time.perf_counter() - started
+
+
+class StagedPipeline:
+    """가져오기 → 파싱 → 마무리 → 쓰기 단계로 나눠 네트워크와 CPU를 함께 쓰는 파이프라인
+
+    - 가져오기: fetch_workers개 스레드가 fetch(item) → (html, meta)로 원본 HTML을 받는다
+    - 파싱: 프로세스 풀이 parse(html)를 실행한다. GIL에 묶이지 않도록 모듈 수준의 순수 함수여야 한다
+    - 마무리: contexts(예: 크롤러)마다 스레드를 하나씩 두고 finish(context, item, meta, parsed)로
+      추가 요청(리뷰 API, 브라우저 대체 등)을 처리해 레코드를 만든다. HTML이 없거나 파싱에 실패하면
+      parsed는 None (파이프라인 밖의 BaseCrawler._parse_page와 같이 브라우저로 대체)
+    - 쓰기: 스레드 하나가 write(item, record)로 결과를 저장한다
+
+    단계 사이는 queue_size 크기의 큐로 잇는다. 뒤 단계가 밀리면 큐가 차서 앞 단계가 기다리므로(배압)
+    받아 놓은 HTML과 파싱 중인 작업이 메모리에 쌓이지 않는다. 항목 하나가 어느 단계에서든 실패하면
+    on_error(item, error)를 호출하고 다음 항목을 계속 처리한다.
+    """
+    def __init__(self, fetch, parse, finish, write, contexts, fetch_workers=None, parse_workers=PARSE_WORKERS,
+                 queue_size=PIPELINE_QUEUE_SIZE, on_error=None, name='pipeline'):
+        self.fetch = fetch
+        self.parse = parse
+        self.finish = finish
+        self.write = write
+        self.contexts = contexts
+        self.fetch_workers = fetch_workers or len(contexts)
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.name = name
+        self.written = 0
+
+    def _fail(self, stage, item, error):
+        log(f"{stage} 실패: {item} ({error})")
+        metrics.inc('failures', stage=f"{self.name}_{stage}")
+        if self.on_error:
+            try:
+                self.on_error(item, error)
+            except Exception as e:
+                log(f"실패 기록 실패: {item} ({e})")
+
+    def _fetch_loop(self, items, raw):
+        while True:
+            try:
+                item = items.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                with metrics.timer('pipeline_fetch', pipeline=self.name):
+                    html, meta = self.fetch(item)
+            except Exception as e:
+                self._fail('fetch', item, e)
+                continue
+            raw.put((item, html, meta))
+
+    def _dispatch_loop(self, executor, raw, parsed):
+        # 제출한 작업(future)을 크기가 정해진 큐에 넣어 동시에 파싱 중인 페이지 수를 제한한다
+        while True:
+            entry = raw.get()
+            if entry is _DONE:
+                for _ in self.contexts:
+                    parsed.put(_DONE)
+                return
+            item, html, meta = entry
+            metrics.set('pipeline_queue_depth', raw.qsize(), pipeline=self.name, stage='raw')
+            try:
+                future = executor.submit(_run_parse, self.parse, html) if html else None
+            except Exception as e:
+                # 파싱 프로세스가 죽어 풀을 쓸 수 없어도 종료 표시는 끝까지 넘기고, 항목은 마무리 단계가 대체한다
+                log(f"파싱 실패: {item} ({e})")
+                metrics.inc('failures', stage=f"{self.name}_parse")
+                future = None
+            parsed.put((item, meta, future))
+
+    def _finish_loop(self, context, parsed, records):
+        while True:
+            entry = parsed.get()
+            if entry is _DONE:
+                return
+            item, meta, future = entry
+            result = None
+            if future is not None:
+                try:
+                    result, seconds = future.result()
+                    metrics.observe('pipeline_parse', seconds, pipeline=self.name)
+                except Exception as e:
+                    # 실패로 기록하지 않고 HTML이 없을 때처럼 마무리 단계에서 브라우저로 대체한다
+                    log(f"파싱 실패: {item} ({e})")
+                    metrics.inc('failures', stage=f"{self.name}_parse")
+            try:
+                with metrics.timer('pipeline_finish', pipeline=self.name):
+                    record = self.finish(context, item, meta, result)
+            except Exception as e:
+                self._fail('finish', item, e)
+                continue
+            records.put((item, record))
+
+    def _write_loop(self, records):
+        while True:
+            entry = records.get()
+            if entry is _DONE:
+                return
+            item, record = entry
+            try:
+                with metrics.timer('pipeline_write', pipeline=self.name):
+                    self.write(item, record)
+            except Exception as e:
+                self._fail('write', item, e)
+                continue
+            self.written += 1
+
+    def run(self, items, executor=None):
+        """모든 항목을 처리하고 쓰기까지 끝난 항목 수를 돌려준다
+
+        항목을 여러 번 나눠 넣을 때는 process_pool()로 만든 executor를 넘겨 한 풀을 계속 쓴다 (닫지 않는다).
+        """
+        if executor is None:
+            with process_pool(self.parse_workers) as executor:
+                return self._run(items, executor)
+        return self._run(items, executor)
+
+    def _run(self, items, executor):
+        self.written = 0
+        todo = queue.Queue()
+        for item in items:
+            todo.put(item)
+        raw = queue.Queue(maxsize=self.queue_size)
+        parsed = queue.Queue(maxsize=self.queue_size)
+        records = queue.Queue(maxsize=self.queue_size)
+
+        # 스레드 이름은 metrics.inc(..., worker=True)의 워커 이름이 된다
+        writer = threading.Thread(target=self._write_loop, args=(records,), name=f"{self.name}-write", daemon=True)
+        finishers = [threading.Thread(target=self._finish_loop, args=(context, parsed, records),
+                                      name=f"{self.name}-finish-{i}", daemon=True)
+                     for i, context in enumerate(self.contexts)]
+        dispatcher = threading.Thread(target=self._dispatch_loop, args=(executor, raw, parsed),
+                                      name=f"{self.name}-dispatch", daemon=True)
+        fetchers = [threading.Thread(target=self._fetch_loop, args=(todo, raw), name=f"{self.name}-fetch-{i}", daemon=True)
+                    for i in range(self.fetch_workers)]
+        for thread in [writer, *finishers, dispatcher, *fetchers]:
+            thread.start()
+
+        # 앞 단계가 모두 끝나면 다음 단계에 종료 표시를 보낸다
+        for thread in fetchers:
+            thread.join()
+        raw.put(_DONE)
+        dispatcher.join()
+        for thread in finishers:
+            thread.join()
+        records.put(_DONE)
+        writer.join()
+        return self.written
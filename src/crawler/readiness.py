@@ -0,0 +1,72 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.utils.helpers import log
+from src.utils.metrics import metrics
+
+POLL_INTERVAL = 0.1
+
+# 선택자에 맞는 첫 요소의 HTML을 돌려준다. 내용이 바뀌었는지 비교하는 용도
+SIGNATURE_SCRIPT = """
+const el = document.querySelector(arguments[0]);
+return el ? el.outerHTML : null;
+"""
+
+# 문서 상태, 리소스 요청 수, 현재 시각, 마지막 DOM 변경 시각을 돌려준다
+# MutationObserver는 최초 호출 시 한 번만 설치
+ACTIVITY_SCRIPT = """
+if (!window.__readiness) {
+    window.__readiness = {lastMutation: performance.now()};
+    new MutationObserver(() => { window.__readiness.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, characterData: true});
+}
+return [document.readyState, performance.getEntriesByType('resource').length,
+        performance.now(), window.__readiness.lastMutation];
+"""
+
+
+def _wait(driver, condition, timeout, description):
+    try:
+        with metrics.timer('readiness_wait'):
+            WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+        return True
+    except TimeoutException:
+        log(f"{description} 대기 시간 초과")
+        metrics.inc('readiness_timeouts')
+        return False
+
+
+def element_signature(driver, css_selector):
+    try:
+        return driver.execute_script(SIGNATURE_SCRIPT, css_selector)
+    except Exception:
+        return None
+
+
+def wait_for_selector(driver, css_selector, timeout=10):
+    """선택자에 맞는 요소가 나타나면 바로 반환"""
+    return _wait(driver, lambda d: element_signature(d, css_selector) is not None, timeout, css_selector)
+
+
+def wait_for_change(driver, css_selector, previous, timeout=10):
+    """선택자에 맞는 첫 요소가 previous와 달라지면 바로 반환 (페이지네이션 클릭 후 사용)"""
+    def changed(d):
+        current = element_signature(d, css_selector)
+        return current is not None and current != previous
+
+    return _wait(driver, changed, timeout, f"{css_selector} 변경")
+
+
+def wait_for_network_idle(driver, idle_ms=500, timeout=10):
+    """문서 로딩이 끝나고 idle_ms 동안 새 리소스 요청과 DOM 변경이 없으면 반환"""
+    state = {'resources': -1, 'since': 0}
+
+    def idle(d):
+        ready_state, resources, now, last_mutation = d.execute_script(ACTIVITY_SCRIPT)
+        if ready_state != 'complete' or resources != state['resources']:
+            state['resources'] = resources
+            state['since'] = now
+            return False
+        return now - state['since'] >= idle_ms and now - last_mutation >= idle_ms
+
+    return _wait(driver, idle, timeout, "네트워크 유휴")
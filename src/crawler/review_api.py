@@ -0,0 +1,136 @@
+import json
+import re
+import threading
+from datetime import datetime
+from urllib.parse import quote
+
+from src.utils.config import REVIEW_API_TEMPLATE
+from src.utils.helpers import log
+
+PAGE_PARAM = re.compile(r'([?&](?:page|pageNo|page_no|p)=)\d+')
+REVIEW_URL_HINTS = ('review', 'rating', 'evaluation')
+
+# JSON 리뷰 항목에서 [날짜, 서비스명, 작업기간, 주문 금액 범위]를 찾을 때 확인할 키 (앞쪽 우선)
+REVIEW_JSON_KEYS = {
+    'date': ('created_at', 'createdAt', 'reg_date', 'date'),
+    'service_title': ('gig_title', 'gigTitle', 'service_title', 'serviceTitle', 'title'),
+    'period': ('work_period', 'workPeriod', 'working_days', 'period'),
+    'price': ('price_range', 'priceRange', 'order_price_range', 'orderPriceRange', 'price'),
+}
+LIST_KEYS = ('reviews', 'items', 'list', 'data', 'results', 'content')
+
+
+def _first(item, keys):
+    for key in keys:
+        if item.get(key) not in (None, ""):
+            return item[key]
+    return None
+
+
+def _find_items(data):
+    """응답 JSON에서 리뷰 항목 리스트(딕셔너리의 리스트)를 찾는다"""
+    if isinstance(data, list):
+        return data if all(isinstance(item, dict) for item in data) else None
+    if isinstance(data, dict):
+        for key in LIST_KEYS:
+            if key in data:
+                found = _find_items(data[key])
+                if found is not None:
+                    return found
+    return None
+
+
+def _format_date(value):
+    # 화면에 표시되는 리뷰 날짜와 같은 'YY.MM.DD' 형식으로 맞춘다
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%y.%m.%d')
+        except ValueError:
+            return value[:8]
+    return value
+
+
+def review_row(item):
+    """JSON 리뷰 항목 하나를 화면에서 추출한 리뷰와 같은 리스트 형식으로 변환 (필드를 못 찾으면 None)"""
+    date = _first(item, REVIEW_JSON_KEYS['date'])
+    service_title = _first(item, REVIEW_JSON_KEYS['service_title'])
+    if date is None or service_title is None:
+        return None
+    period = _first(item, REVIEW_JSON_KEYS['period'])
+    price = _first(item, REVIEW_JSON_KEYS['price'])
+    return [
+        _format_date(date),
+        str(service_title).strip(),
+        f"{period}일" if isinstance(period, (int, float)) else (period or ""),
+        f"{price:,}원" if isinstance(price, (int, float)) else (price or ""),
+    ]
+
+
+def parse_reviews(text):
+    """응답 본문에서 리뷰 목록을 꺼낸다. 리뷰 형식이 아니면 None"""
+    try:
+        items = _find_items(json.loads(text))
+    except ValueError:
+        return None
+    if items is None:
+        return None
+    rows = [review_row(item) for item in items]
+    if items and not any(rows):
+        return None
+    return [row for row in rows if row is not None]
+
+
+class ReviewApi:
+    """리뷰 위젯이 호출하는 JSON 엔드포인트를 찾아 두고 페이지 URL을 만든다
+
+    URL 템플릿은 설정(REVIEW_API_TEMPLATE)으로 지정하거나, 페이지를 한 번 넘겼을 때의
+    Chrome 성능 로그(Network.responseReceived)에서 찾는다. 찾은 URL에 판매자 이름이
+    들어 있으면 다른 판매자에게도 그대로 재사용하므로 이후에는 브라우저 없이 요청할 수 있다.
+    """
+    def __init__(self, template=REVIEW_API_TEMPLATE):
+        self.template = template
+        self._lock = threading.Lock()
+
+    def page_url(self, template, seller_name, page):
+        return template.replace('{seller_name}', quote(seller_name)).replace('{page}', str(page))
+
+    def clear_log(self, driver):
+        # 이전 페이지의 네트워크 이벤트를 비워 두고 다음 클릭에서 발생한 요청만 본다
+        try:
+            driver.get_log('performance')
+        except Exception:
+            pass
+
+    def discover(self, driver, seller_name):
+        """방금 페이지를 넘기며 발생한 JSON 응답 중 리뷰 엔드포인트를 찾아 URL 템플릿으로 반환"""
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            log(f"성능 로그를 읽을 수 없습니다: {e}")
+            return None
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            if message.get('method') != 'Network.responseReceived':
+                continue
+            response = message['params']['response']
+            url = response.get('url', "")
+            if 'json' not in response.get('mimeType', "") or not any(hint in url.lower() for hint in REVIEW_URL_HINTS):
+                continue
+            if not PAGE_PARAM.search(url):
+                continue
+
+            template = PAGE_PARAM.sub(r'\g<1>{page}', url, count=1)
+            if quote(seller_name) in template:
+                template = template.replace(quote(seller_name), '{seller_name}')
+                with self._lock:
+                    self.template = template
+            log(f"리뷰 API 발견: {template}")
+            return template
+        return None
+
+
+default_review_api = ReviewApi()
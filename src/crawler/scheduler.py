@@ -0,0 +1,274 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+from src.utils.config import (
+    BASE_URL, MAX_IN_FLIGHT, PER_HOST_LIMIT, HOST_RATE, HOST_BURST,
+    HOST_MIN_RATE, HOST_MAX_RATE, HOST_RATE_STEP, HOST_RATE_BACKOFF,
+    SLOW_RESPONSE_SECONDS, BLOCK_COOLDOWN_SECONDS, BLOCK_MARKERS,
+)
+from src.utils.helpers import log
+from src.utils.metrics import metrics
+
+
+def host_of(url):
+    return urlsplit(url).netloc
+
+
+class TokenBucket:
+    """초당 rate개 토큰을 채우는 버킷 (스레드 안전, 토큰이 없으면 대기)"""
+    def __init__(self, rate=HOST_RATE, capacity=HOST_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        # 토큰을 하나 예약하고, 토큰이 찰 때까지 기다려야 할 시간을 돌려준다
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def set_rate(self, rate):
+        # 지금까지 쌓인 토큰은 이전 속도로 계산해 두고 새 속도 적용
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.rate = rate
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HostThrottle:
+    """호스트별 TokenBucket을 관리하는 요청 간격 조절기"""
+    def __init__(self, rate=HOST_RATE, capacity=HOST_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host):
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.capacity)
+            return self._buckets[host]
+
+    def wait(self, url):
+        self.bucket(host_of(url)).acquire()
+
+    def slot(self, url):
+        return nullcontext()
+
+    def record(self, url, status=None, latency=None, text=None, empty=False, error=False, retry_after=None):
+        pass
+
+
+# 캡차/차단 안내 페이지는 짧다. 일반 페이지에 포함된 캡차 스크립트는 차단으로 보지 않도록 짧은 본문만 검사
+BLOCK_PAGE_MAX_LENGTH = 20000
+
+
+def is_blocked(status=None, text=None):
+    """429/503/403 응답이거나 짧은 본문에 캡차/차단 문구가 있으면 차단으로 본다"""
+    if status in (403, 429, 503):
+        return True
+    if not text or len(text) > BLOCK_PAGE_MAX_LENGTH:
+        return False
+    return any(marker in text for marker in BLOCK_MARKERS)
+
+
+class AdaptiveLimit:
+    """동시에 진행할 수 있는 요청 수가 바뀌는 세마포어"""
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self._condition = threading.Condition()
+
+    def set_limit(self, limit):
+        with self._condition:
+            self.limit = limit
+            self._condition.notify_all()
+
+    @contextmanager
+    def hold(self):
+        with self._condition:
+            while self.active >= self.limit:
+                self._condition.wait()
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.active -= 1
+                self._condition.notify()
+
+
+class AdaptiveThrottle(HostThrottle):
+    """응답 지연과 차단 신호로 호스트별 요청 속도와 동시 요청 수를 조절하는 AIMD 조절기
+
+    정상 응답마다 속도를 step만큼 올리고(가산 증가), 동시 요청 수는 연속 성공이 쌓이면 하나씩 늘린다.
+    차단(429/503/403, 캡차), 느린 응답, 빈 결과가 보이면 속도를 backoff배, 동시 요청 수를 절반으로
+    줄이고(곱셈 감소), 차단이면 Retry-After(없으면 cooldown초) 동안 그 호스트 요청을 멈춘다.
+    """
+    def __init__(self, rate=HOST_RATE, capacity=HOST_BURST, min_rate=HOST_MIN_RATE, max_rate=HOST_MAX_RATE,
+                 step=HOST_RATE_STEP, backoff=HOST_RATE_BACKOFF, slow_seconds=SLOW_RESPONSE_SECONDS,
+                 cooldown=BLOCK_COOLDOWN_SECONDS, max_concurrency=PER_HOST_LIMIT):
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.backoff = backoff
+        self.slow_seconds = slow_seconds
+        self.cooldown = cooldown
+        self.max_concurrency = max_concurrency
+        self._limits = {}
+        self._paused_until = {}
+        self._latency = {}
+        self._successes = {}
+        self._decreased_at = {}
+
+    def limit(self, host):
+        with self._lock:
+            if host not in self._limits:
+                self._limits[host] = AdaptiveLimit(self.max_concurrency)
+            return self._limits[host]
+
+    def wait(self, url):
+        host = host_of(url)
+        delay = self._paused_until.get(host, 0) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.bucket(host).acquire()
+
+    def slot(self, url):
+        return self.limit(host_of(url)).hold()
+
+    def rate_of(self, host):
+        return self.bucket(host).rate
+
+    def stats(self):
+        """호스트별 현재 속도(초당 요청 수), 동시 요청 한도, 평균 응답 시간(초)"""
+        with self._lock:
+            hosts = list(self._buckets)
+        return {
+            host: {
+                'rate': round(self.rate_of(host), 3),
+                'concurrency': self.limit(host).limit,
+                'latency': round(self._latency.get(host, 0), 3),
+            }
+            for host in hosts
+        }
+
+    def record(self, url, status=None, latency=None, text=None, empty=False, error=False, retry_after=None):
+        """요청 하나의 결과를 반영. error는 연결 실패, empty는 내용이 있어야 할 페이지가 비어 있던 경우
+
+        반영한 뒤의 호스트별 속도, 동시 요청 한도, 평균 응답 시간을 지표(게이지)로 남긴다.
+        """
+        host = host_of(url)
+        try:
+            self._record(host, status, latency, text, empty, error, retry_after)
+        finally:
+            metrics.set('host_rate', round(self.rate_of(host), 3), host=host)
+            metrics.set('host_concurrency', self.limit(host).limit, host=host)
+            metrics.set('host_latency_seconds', round(self._latency.get(host, 0), 3), host=host)
+
+    def _record(self, host, status, latency, text, empty, error, retry_after):
+        bucket = self.bucket(host)
+        limit = self.limit(host)
+        if latency is not None:
+            previous = self._latency.get(host)
+            self._latency[host] = latency if previous is None else previous * 0.8 + latency * 0.2
+
+        blocked = is_blocked(status, text)
+        slow = latency is not None and latency >= self.slow_seconds
+        failed = error or (status is not None and status >= 500)
+        if blocked or slow or failed or empty:
+            # 같은 원인에 함께 걸린 동시 요청은 한 번만 반영 (멈춘 동안이나 직전 감속 후 1초 이내)
+            now = time.monotonic()
+            if self._paused_until.get(host, 0) > now or now - self._decreased_at.get(host, -1.0) < 1.0:
+                return
+            self._decreased_at[host] = now
+            rate = max(self.min_rate, bucket.rate * self.backoff)
+            bucket.set_rate(rate)
+            limit.set_limit(max(1, limit.limit // 2))
+            self._successes[host] = 0
+            if blocked:
+                pause = retry_after if retry_after is not None else self.cooldown
+                self._paused_until[host] = now + pause
+                log(f"{host} 차단 신호 (status={status}), {pause}초 대기 후 초당 {rate:.2f}회로 감속")
+            else:
+                log(f"{host} 응답 지연/오류 (status={status}, {latency or 0:.1f}초), 초당 {rate:.2f}회로 감속")
+            return
+
+        bucket.set_rate(min(self.max_rate, bucket.rate + self.step))
+        # 동시 요청 수는 현재 한도의 10배만큼 연속으로 성공하면 하나 늘린다
+        self._successes[host] = self._successes.get(host, 0) + 1
+        if self._successes[host] >= limit.limit * 10 and limit.limit < self.max_concurrency:
+            limit.set_limit(limit.limit + 1)
+            self._successes[host] = 0
+
+
+# 한 프로세스 안의 모든 크롤러가 공유하는 기본 조절기
+default_throttle = AdaptiveThrottle()
+
+
+class CrawlScheduler:
+    """공유 작업 큐에서 항목을 하나씩 꺼내 처리하는 asyncio 스케줄러
+
+    워커 수만큼 동시에 처리하며, 같은 호스트로 향하는 작업은 per_host_limit개까지만
+    동시에 실행한다. 처리 함수는 블로킹 코드(Selenium, HTTP)이므로 스레드에서 실행한다.
+    """
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, per_host_limit=PER_HOST_LIMIT):
+        self.max_in_flight = max_in_flight
+        self.per_host_limit = per_host_limit
+
+    def run(self, items, handler, contexts, host=None):
+        """contexts의 각 원소(예: 크롤러)마다 워커를 하나씩 띄워 handler(context, item)를 호출"""
+        return asyncio.run(self.run_async(items, handler, contexts, host))
+
+    async def run_async(self, items, handler, contexts, host=None):
+        items = list(items)
+        results = [None] * len(items)
+        work_queue = asyncio.Queue()
+        for index, item in enumerate(items):
+            work_queue.put_nowait((index, item))
+
+        global_limit = asyncio.Semaphore(self.max_in_flight)
+        host_limits = {}
+
+        async def worker(context):
+            while True:
+                try:
+                    index, item = work_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                item_host = host(item) if host else host_of(BASE_URL)
+                if item_host not in host_limits:
+                    host_limits[item_host] = asyncio.Semaphore(self.per_host_limit)
+
+                async with global_limit, host_limits[item_host]:
+                    try:
+                        results[index] = await asyncio.to_thread(handler, context, item)
+                    except Exception as e:
+                        log(f"작업 실패: {item} ({e})")
+                        metrics.inc('failures', stage='scheduler')
+                work_queue.task_done()
+
+        await asyncio.gather(*(worker(context) for context in contexts))
+        return results
@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from src.utils.config import STATE_DB_PATH, MAX_ATTEMPTS
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class CrawlStateStore:
+    """판매자, 카테고리 페이지 단위의 크롤링 진행 상태와 결과를 SQLite에 기록
+
+    항목이 끝날 때마다 바로 커밋하므로, 중간에 중단돼도 다음 실행에서 완료된 항목은
+    건너뛰고 실패하거나 끝나지 않은 항목만 다시 수집할 수 있다.
+    """
+    def __init__(self, path=STATE_DB_PATH, max_attempts=MAX_ATTEMPTS):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_items (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                started_at TEXT,
+                finished_at TEXT,
+                result TEXT,
+                error TEXT,
+                PRIMARY KEY (kind, key)
+            )
+        """)
+        self._conn.commit()
+
+    def _now(self):
+        return datetime.now().isoformat(timespec='seconds')
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def pending(self, kind, keys):
+        """keys 중 아직 완료되지 않았고 재시도 횟수가 남은 항목 (입력 순서 유지)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, status, attempts FROM crawl_items WHERE kind = ?", (kind,)
+            ).fetchall()
+        states = {key: (status, attempts) for key, status, attempts in rows}
+        result = []
+        for key in keys:
+            status, attempts = states.get(str(key), (PENDING, 0))
+            if status == DONE:
+                continue
+            if status == FAILED and attempts >= self.max_attempts:
+                continue
+            result.append(key)
+        return result
+
+    def mark_started(self, kind, key):
+        self._execute("""
+            INSERT INTO crawl_items (kind, key, status, attempts, started_at) VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT (kind, key) DO UPDATE SET
+                status = excluded.status, attempts = attempts + 1, started_at = excluded.started_at
+        """, (kind, str(key), RUNNING, self._now()))
+
+    def mark_done(self, kind, key, result):
+        self._execute(
+            "UPDATE crawl_items SET status = ?, finished_at = ?, result = ?, error = NULL WHERE kind = ? AND key = ?",
+            (DONE, self._now(), json.dumps(result, ensure_ascii=False), kind, str(key)),
+        )
+
+    def mark_failed(self, kind, key, error):
+        self._execute(
+            "UPDATE crawl_items SET status = ?, finished_at = ?, error = ? WHERE kind = ? AND key = ?",
+            (FAILED, self._now(), str(error), kind, str(key)),
+        )
+
+    def get_result(self, kind, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM crawl_items WHERE kind = ? AND key = ? AND status = ?", (kind, str(key), DONE)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def results(self, kind, keys=None):
+        """완료된 결과 목록. keys를 주면 그 순서대로, 아니면 완료 시각 순서"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, result FROM crawl_items WHERE kind = ? AND status = ? ORDER BY finished_at",
+                (kind, DONE),
+            ).fetchall()
+        by_key = {key: json.loads(result) for key, result in rows}
+        if keys is None:
+            return list(by_key.values())
+        return [by_key[str(key)] for key in keys if str(key) in by_key]
+
+    def counts(self, kind):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM crawl_items WHERE kind = ? GROUP BY status", (kind,)
+            ).fetchall()
+        return dict(rows)
+
+    def reset(self, kind):
+        """kind 항목의 진행 상태를 모두 지우고 처음부터 다시 수집"""
+        self._execute("DELETE FROM crawl_items WHERE kind = ?", (kind,))
+
+    def track(self, kind, key, func, *args):
+        """func(*args)를 실행하면서 시작/완료/실패를 기록"""
+        self.mark_started(kind, key)
+        try:
+            result = func(*args)
+        except Exception as e:
+            self.mark_failed(kind, key, e)
+            raise
+        self.mark_done(kind, key, result)
+        return result
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,156 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.utils.helpers import log
+
+
+class CategoryAnalyzer:
+    """정규화된 테이블로 카테고리별 판매자 구성과 수익 구조를 계산 (행 단위 루프 없이 벡터 연산)
+
+    services: title, seller_name, link, category_id
+    sellers: seller_name, total_jobs, ...
+    reviews: seller_name, review_date, service_title, price_min, price_max, ...
+
+    판매자가 여러 카테고리에 서비스를 올려도 리뷰는 한 카테고리에만 더한다 (review_categories 참고).
+    skills: seller_name, skill
+    """
+    def __init__(self, services, sellers, reviews, skills=None):
+        self.services = services
+        self.sellers = sellers
+        self.reviews = reviews
+        self.skills = skills if skills is not None else pd.DataFrame(columns=['seller_name', 'skill'])
+
+    @classmethod
+    def from_tables(cls, tables):
+        return cls(tables.get('services', pd.DataFrame(columns=['seller_name', 'category_id'])),
+                   tables['sellers'], tables['reviews'], tables.get('skills'))
+
+    def category_seller_counts(self):
+        services = self.services
+        if 'category_id' not in services.columns:
+            services = services.assign(category_id=pd.NA)
+        grouped = services.groupby('category_id', dropna=False)
+        return pd.DataFrame({
+            'sellers': grouped['seller_name'].nunique(),
+            'services': grouped.size(),
+        }).reset_index().sort_values('sellers', ascending=False, ignore_index=True)
+
+    def review_revenue(self):
+        """리뷰 1건의 주문 금액 추정치: 범위 중간값, '미만'은 상한의 절반, '이상'은 하한"""
+        price_min = self.reviews['price_min'].astype('float64')
+        price_max = self.reviews['price_max'].astype('float64')
+        midpoint = np.where(
+            price_max.isna(), price_min,
+            np.where(price_min.fillna(0) == 0, price_max / 2, (price_min + price_max) / 2),
+        )
+        return pd.Series(midpoint, index=self.reviews.index, name='estimated_amount')
+
+    def review_velocity(self):
+        """판매자별 월간 리뷰 수"""
+        reviews = self.reviews.dropna(subset=['review_date'])
+        month = reviews['review_date'].dt.to_period('M')
+        velocity = reviews.groupby(['seller_name', month]).size().rename('reviews').reset_index()
+        return velocity.rename(columns={'review_date': 'month'})
+
+    def seller_revenue(self):
+        reviews = self.reviews.assign(estimated_amount=self.review_revenue())
+        grouped = reviews.groupby('seller_name')
+        revenue = pd.DataFrame({
+            'reviews': grouped.size(),
+            'estimated_revenue': grouped['estimated_amount'].sum(min_count=1),
+            'first_review': grouped['review_date'].min(),
+            'last_review': grouped['review_date'].max(),
+        })
+        # 활동 기간(개월)으로 나눈 월평균 리뷰 수와 매출
+        months = ((revenue['last_review'] - revenue['first_review']).dt.days / 30.4).clip(lower=1)
+        revenue['reviews_per_month'] = revenue['reviews'] / months
+        revenue['revenue_per_month'] = revenue['estimated_revenue'] / months
+        sellers = self.sellers[['seller_name', 'total_jobs']].set_index('seller_name')
+        return sellers.join(revenue, how='left').reset_index()
+
+    def review_categories(self):
+        """리뷰마다 카테고리 하나를 정한 표 (reviews + estimated_amount, category_id)
+
+        리뷰의 서비스명을 같은 판매자의 서비스 제목과 맞춰 그 서비스의 카테고리로 정한다.
+        맞는 서비스가 없는 리뷰는 판매자의 모든 카테고리에 더하지 않고 category_id를 비워 미분류로 둔다.
+        """
+        reviews = self.reviews.assign(estimated_amount=self.review_revenue())
+        if not {'title', 'category_id'} <= set(self.services.columns) or 'service_title' not in reviews.columns:
+            return reviews.assign(category_id=pd.NA)
+        services = self.services.dropna(subset=['title'])
+        # 같은 제목의 서비스가 여러 카테고리에 있으면 먼저 수집한 카테고리 하나로 정한다
+        titles = pd.DataFrame({
+            'seller_name': services['seller_name'],
+            'service_key': services['title'].astype('string').str.strip(),
+            'category_id': services['category_id'],
+        }).drop_duplicates(['seller_name', 'service_key'])
+        keyed = reviews.assign(service_key=reviews['service_title'].astype('string').str.strip())
+        return keyed.merge(titles, on=['seller_name', 'service_key'], how='left').drop(columns='service_key')
+
+    def category_revenue(self):
+        """카테고리별 리뷰 수와 추정 매출. 카테고리를 정하지 못한 리뷰는 category_id가 빈 행에 모은다"""
+        reviews = self.review_categories()
+        unattributed = int(reviews['category_id'].isna().sum())
+        if unattributed:
+            log(f"서비스명으로 카테고리를 정하지 못한 리뷰 {unattributed}건은 미분류로 집계합니다.")
+        grouped = reviews.groupby(['category_id', 'seller_name'], dropna=False)
+        revenue = pd.DataFrame({
+            'reviews': grouped.size(),
+            'estimated_revenue': grouped['estimated_amount'].sum(min_count=1),
+            'first_review': grouped['review_date'].min(),
+            'last_review': grouped['review_date'].max(),
+        })
+        months = ((revenue['last_review'] - revenue['first_review']).dt.days / 30.4).clip(lower=1)
+        revenue['revenue_per_month'] = revenue['estimated_revenue'] / months
+        grouped = revenue.reset_index().groupby('category_id', dropna=False)
+        result = pd.DataFrame({
+            'sellers': grouped['seller_name'].nunique(),
+            'reviews': grouped['reviews'].sum(min_count=1),
+            'estimated_revenue': grouped['estimated_revenue'].sum(min_count=1),
+            'median_seller_revenue': grouped['estimated_revenue'].median(),
+            'revenue_per_month': grouped['revenue_per_month'].sum(min_count=1),
+        }).reset_index()
+        return result.sort_values('estimated_revenue', ascending=False, ignore_index=True)
+
+    def category_velocity(self):
+        """카테고리별 월간 리뷰 수 (리뷰마다 카테고리 하나, 미분류는 category_id가 빈 행)"""
+        reviews = self.review_categories().dropna(subset=['review_date'])
+        month = reviews['review_date'].dt.to_period('M')
+        velocity = reviews.groupby(['category_id', month], dropna=False).size().rename('reviews').reset_index()
+        return velocity.rename(columns={'review_date': 'month'})
+
+    def skill_cooccurrence(self, top_n=50):
+        """상위 top_n개 기술의 동시 보유 판매자 수 행렬 (판매자×기술 지시 행렬의 XᵀX)"""
+        skills = self.skills.dropna(subset=['skill']).drop_duplicates()
+        top_skills = skills['skill'].value_counts().head(top_n).index
+        skills = skills[skills['skill'].isin(top_skills)]
+        if skills.empty:
+            return pd.DataFrame()
+        seller_codes, _ = pd.factorize(skills['seller_name'])
+        skill_codes, skill_names = pd.factorize(skills['skill'])
+        indicator = np.zeros((seller_codes.max() + 1, len(skill_names)), dtype=np.int32)
+        indicator[seller_codes, skill_codes] = 1
+        matrix = indicator.T @ indicator
+        return pd.DataFrame(matrix, index=skill_names, columns=skill_names)
+
+    def run_all(self):
+        results = {
+            'category_seller_counts': self.category_seller_counts(),
+            'seller_revenue': self.seller_revenue(),
+            'category_revenue': self.category_revenue(),
+            'review_velocity': self.review_velocity(),
+            'category_velocity': self.category_velocity(),
+            'skill_cooccurrence': self.skill_cooccurrence(),
+        }
+        for name, table in results.items():
+            log(f"{name}: {len(table)}행")
+        return results
+
+    def save(self, results, directory='output/analysis'):
+        os.makedirs(directory, exist_ok=True)
+        for name, table in results.items():
+            table.to_csv(os.path.join(directory, f"{name}.csv"), index=name == 'skill_cooccurrence',
+                         encoding='utf-8-sig')
+        log(f"분석 결과 저장 완료: {directory}")
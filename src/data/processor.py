@@ -0,0 +1,151 @@
+import ast
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+from src.utils.helpers import log
+
+# 리뷰 원본 형식: [날짜, 서비스명, 작업기간, 주문 금액 범위]
+REVIEW_FIELDS = ['review_date', 'service_title', 'period', 'price_text']
+PORTFOLIO_FIELDS = ['title', 'hashtag', 'link']
+
+
+def parse_cell(value):
+    """CSV 셀에 문자열로 저장된 리스트/딕셔너리 복원 (JSON, 예전 파이썬 repr 모두 지원)"""
+    if not isinstance(value, str) or value == "":
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+def parse_price_range(price_text):
+    """'10만원 미만', '5만원 ~ 10만원', '100만원 이상', '79,000원' 형태를 최소/최대 금액(원)으로 변환"""
+    # 금액 문구 종류는 몇십 가지뿐이므로 고유값만 파싱한 뒤 원래 행으로 펼친다
+    codes, uniques = pd.factorize(price_text.fillna("").astype(str))
+    if len(uniques) < len(price_text):
+        parsed = parse_price_range(pd.Series(uniques)).iloc[codes]
+        return parsed.set_index(price_text.index)
+
+    text = pd.Series(uniques, index=price_text.index).str.replace(",", "", regex=False)
+    amounts = text.str.extractall(r'(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>만)?')
+    if amounts.empty:
+        return pd.DataFrame({'price_min': pd.Series(pd.NA, index=text.index, dtype='Int64'),
+                             'price_max': pd.Series(pd.NA, index=text.index, dtype='Int64')})
+
+    values = amounts['number'].astype(float) * amounts['unit'].notna().map({True: 10000, False: 1})
+    grouped = values.groupby(level=0)
+    low = grouped.min().reindex(text.index)
+    high = grouped.max().reindex(text.index)
+
+    under = text.str.contains('미만|이하', regex=True)
+    over = text.str.contains('이상|초과', regex=True)
+    price_min = low.mask(under, 0)
+    price_max = high.mask(over & ~under, float('nan'))
+    return pd.DataFrame({
+        'price_min': price_min.round().astype('Int64'),
+        'price_max': price_max.round().astype('Int64'),
+    })
+
+
+class ProfileNormalizer:
+    """profiles.csv의 중첩 셀(리뷰, 전문분야 등)을 seller_name으로 연결된 개별 테이블로 분리"""
+    def load_profiles(self, path='output/profiles.csv'):
+        df = pd.read_csv(path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+        for column in ['career', 'specialties', 'skills', 'reviews', 'portfolios']:
+            if column in df.columns:
+                df[column] = df[column].map(parse_cell)
+        return df
+
+    def load_services(self, path='output/services.csv'):
+        df = pd.read_csv(path, encoding='utf-8-sig', dtype=str)
+        df = df.rename(columns={'서비스명': 'title', '판매자': 'seller_name', '링크': 'link', '카테고리': 'category_id',
+                                '리뷰수': 'review_count'})
+        for column in ['category_id', 'review_count']:
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+        df['gig_id'] = pd.to_numeric(df['link'].str.extract(r'/gig/(\d+)')[0], errors='coerce').astype('Int64')
+        return df
+
+    def normalize(self, profiles, services=None):
+        tables = {
+            'sellers': self._sellers(profiles),
+            'reviews': self._reviews(profiles),
+            'skills': self._tags(profiles, 'skills', 'skill'),
+            'careers': self._tags(profiles, 'career', 'career'),
+            'specialties': self._specialties(profiles),
+            'portfolios': self._portfolios(profiles),
+        }
+        if services is not None:
+            tables['services'] = services
+        for name, table in tables.items():
+            log(f"{name}: {len(table)}행")
+        return tables
+
+    def _sellers(self, profiles):
+        sellers = profiles[['seller_name', 'profile_url', 'introduction']].copy()
+        sellers['total_jobs'] = pd.to_numeric(profiles['total_jobs'], errors='coerce').astype('Int64')
+        sellers['review_count'] = profiles['reviews'].map(lambda v: len(v) if isinstance(v, list) else 0)
+        sellers['portfolio_count'] = profiles['portfolios'].map(lambda v: len(v) if isinstance(v, list) else 0)
+        return sellers
+
+    def _exploded(self, profiles, column):
+        exploded = profiles[['seller_name', column]].explode(column)
+        return exploded[exploded[column].notna()].reset_index(drop=True)
+
+    def _reviews(self, profiles):
+        exploded = self._exploded(profiles, 'reviews')
+        rows = pd.DataFrame(exploded['reviews'].tolist()).iloc[:, :len(REVIEW_FIELDS)]
+        rows.columns = REVIEW_FIELDS[:rows.shape[1]]
+        rows = rows.reindex(columns=REVIEW_FIELDS).astype('string')
+        reviews = pd.concat([exploded[['seller_name']], rows], axis=1)
+        reviews['review_date'] = pd.to_datetime(reviews['review_date'].str.strip(), format='%y.%m.%d', errors='coerce')
+        reviews['period_days'] = pd.to_numeric(
+            reviews['period'].str.extract(r'(\d+)\s*일')[0], errors='coerce'
+        ).astype('Int64')
+        reviews = pd.concat([reviews, parse_price_range(reviews['price_text'])], axis=1)
+        return reviews
+
+    def _tags(self, profiles, column, name):
+        exploded = self._exploded(profiles, column)
+        return exploded.rename(columns={column: name})
+
+    def _specialties(self, profiles):
+        pairs = [
+            (seller_name, category, specialty)
+            for seller_name, specialties in zip(profiles['seller_name'], profiles['specialties'])
+            if isinstance(specialties, dict)
+            for category, values in specialties.items()
+            for specialty in values
+        ]
+        return pd.DataFrame(pairs, columns=['seller_name', 'category', 'specialty'])
+
+    def _portfolios(self, profiles):
+        exploded = self._exploded(profiles, 'portfolios')
+        rows = pd.DataFrame(
+            [{field: portfolio.get(field) for field in PORTFOLIO_FIELDS} if isinstance(portfolio, dict) else {}
+             for portfolio in exploded['portfolios']],
+            columns=PORTFOLIO_FIELDS,
+        )
+        return pd.concat([exploded[['seller_name']], rows], axis=1)
+
+    def save_sqlite(self, tables, path='output/kmong.db'):
+        """테이블별로 한 번에 적재 (기존 테이블은 교체)"""
+        with sqlite3.connect(path) as conn:
+            for name, table in tables.items():
+                table.to_sql(name, conn, if_exists='replace', index=False, chunksize=10000)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_reviews_seller ON reviews (seller_name)")
+        log(f"SQLite 적재 완료: {path}")
+
+    def save_parquet(self, tables, directory='output/tables'):
+        os.makedirs(directory, exist_ok=True)
+        for name, table in tables.items():
+            table.to_parquet(os.path.join(directory, f"{name}.parquet"), index=False)
+        log(f"Parquet 저장 완료: {directory}")
@@ -0,0 +1,240 @@
+import csv
+import glob
+import json
+import os
+import threading
+import time
+
+from src.utils.metrics import metrics
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def _cell(value):
+    # 리스트/딕셔너리는 JSON 문자열로 저장해 나중에 json.loads로 바로 읽을 수 있게 한다
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if value is None:
+        return ""
+    return value
+
+
+def _row(record, columns):
+    if isinstance(record, dict):
+        return [_cell(record.get(column)) for column in columns]
+    return [_cell(value) for value in record]
+
+
+class CsvSink:
+    """레코드가 끝날 때마다 한 줄씩 쓰고 바로 flush하는 CSV 저장소 (스레드 안전)"""
+    def __init__(self, path, columns, append=False):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self.path = path
+        self.columns = columns
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'a' if append else 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(columns)
+            self._file.flush()
+
+    def write(self, record):
+        with self._lock, metrics.timer('csv_write'):
+            self._writer.writerow(_row(record, self.columns))
+            self._file.flush()
+            self.count += 1
+
+    def write_many(self, records):
+        with self._lock, metrics.timer('csv_write'):
+            for record in records:
+                self._writer.writerow(_row(record, self.columns))
+                self.count += 1
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParquetSink:
+    """row_group_size개씩 모아 row group으로 쓰고, rows_per_file마다 새 파일로 넘기는 Parquet 저장소"""
+    def __init__(self, path, columns, row_group_size=500, rows_per_file=50000):
+        if pq is None:
+            raise ImportError("ParquetSink를 사용하려면 pyarrow가 필요합니다.")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.columns = columns
+        self.row_group_size = row_group_size
+        self.rows_per_file = rows_per_file
+        self.count = 0
+        self.paths = []
+        self._schema = pa.schema([(column, pa.string()) for column in columns])
+        self._buffer = []
+        self._writer = None
+        self._rows_in_file = 0
+        self._lock = threading.Lock()
+
+    def _open_next(self):
+        if self._writer is not None:
+            self._writer.close()
+        root, ext = os.path.splitext(self.path)
+        path = f"{root}.{len(self.paths):03d}{ext or '.parquet'}"
+        self.paths.append(path)
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._rows_in_file = 0
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        if self._writer is None or self._rows_in_file >= self.rows_per_file:
+            self._open_next()
+        columns = list(zip(*self._buffer))
+        table = pa.table({
+            column: [None if value == "" else str(value) for value in columns[i]]
+            for i, column in enumerate(self.columns)
+        }, schema=self._schema)
+        self._writer.write_table(table)
+        self._rows_in_file += len(self._buffer)
+        self._buffer = []
+
+    def write(self, record):
+        with self._lock:
+            self._buffer.append(_row(record, self.columns))
+            self.count += 1
+            if len(self._buffer) >= self.row_group_size:
+                self._flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# part 파일에만 있는 마지막 열: 행을 쓴 시각. 합칠 때 같은 key의 최신 행을 고르는 데 쓰고 결과에는 넣지 않는다
+WRITTEN_AT_COLUMN = '_written_at'
+
+
+class _PartSink:
+    """part 파일 저장소에 쓰는 행마다 쓴 시각을 붙인다"""
+    def __init__(self, sink, columns):
+        self.sink = sink
+        self.columns = columns
+
+    @property
+    def count(self):
+        return self.sink.count
+
+    def write(self, record):
+        self.sink.write(_row(record, self.columns) + [repr(time.time())])
+
+    def write_many(self, records):
+        self.sink.write_many([_row(record, self.columns) + [repr(time.time())] for record in records])
+
+    def close(self):
+        self.sink.close()
+
+
+class PartitionedSink:
+    """워커마다 별도 파일(part)에 바로 쓰고, 끝나면 부모가 파일만 합치는 저장소
+
+    output/parts/profiles.part-000.csv 처럼 워커별 파일을 쓰므로 워커 간 락이나
+    결과 전달(pickle/IPC)이 필요 없다. 이어서 수집할 때는 기존 part 파일에 이어 쓴다.
+    """
+    def __init__(self, directory, name, columns, file_format='csv', append=True):
+        self.directory = directory
+        self.name = name
+        self.columns = columns
+        self.file_format = file_format
+        self.append = append
+        self._parts = []
+        os.makedirs(directory, exist_ok=True)
+        if not append:
+            self.clear()
+
+    def part_paths(self):
+        return sorted(glob.glob(os.path.join(self.directory, f"{self.name}.part-*.{self.file_format}")))
+
+    def clear(self):
+        for path in self.part_paths():
+            os.remove(path)
+
+    def part(self, worker_id):
+        path = os.path.join(self.directory, f"{self.name}.part-{worker_id:03d}.{self.file_format}")
+        columns = self.columns + [WRITTEN_AT_COLUMN]
+        if self.file_format == 'parquet':
+            sink = _PartSink(ParquetSink(path, columns), self.columns)
+        else:
+            sink = _PartSink(CsvSink(path, columns, append=self.append), self.columns)
+        self._parts.append(sink)
+        return sink
+
+    def close(self):
+        for sink in self._parts:
+            sink.close()
+
+    def _read_part(self, part_path):
+        # (쓴 시각, 행) 순회. 쓴 시각 열이 없는 예전 part 파일의 행은 가장 오래된 것으로 본다
+        with open(part_path, newline='', encoding='utf-8-sig') as part:
+            reader = csv.reader(part)
+            header = next(reader, None) or []
+            written_at = header.index(WRITTEN_AT_COLUMN) if WRITTEN_AT_COLUMN in header else None
+            for row in reader:
+                yield (float(row[written_at]) if written_at is not None else 0.0), row[:len(self.columns)]
+
+    def merge(self, path, key=None):
+        """CSV part 파일들을 한 줄씩 읽어 path로 합친다. key 열이 같은 행은 가장 나중에 쓴 것만 남긴다
+
+        이어서 수집하며 다시 수집한 판매자/서비스는 여러 part 파일에 남을 수 있어, 먼저 key별로
+        가장 나중에 쓴 행의 위치만 찾아 두고 두 번째로 읽을 때 그 행만 쓴다.
+        """
+        self.close()
+        if self.file_format != 'csv':
+            return self.part_paths()
+        part_paths = self.part_paths()
+        key_index = self.columns.index(key) if key else None
+        latest = {}
+        if key_index is not None:
+            for part_no, part_path in enumerate(part_paths):
+                for row_no, (written_at, row) in enumerate(self._read_part(part_path)):
+                    position = (written_at, part_no, row_no)
+                    if row[key_index] not in latest or position > latest[row[key_index]]:
+                        latest[row[key_index]] = position
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8-sig') as merged:
+            writer = csv.writer(merged)
+            writer.writerow(self.columns)
+            for part_no, part_path in enumerate(part_paths):
+                for row_no, (written_at, row) in enumerate(self._read_part(part_path)):
+                    if key_index is not None and latest[row[key_index]] != (written_at, part_no, row_no):
+                        continue
+                    writer.writerow(row)
+                    count += 1
+        return count
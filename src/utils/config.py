@@ -0,0 +1,97 @@
+BASE_URL = "https://kmong.com"
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+# 서버 렌더링 HTML만으로 프로필 추출이 가능한지 판단하는 마커
+PROFILE_MARKERS = ('DescriptionDetailSection', 'ProfileInformationSection__section')
+# HTML에 포함된 __NEXT_DATA__ JSON에서 먼저 추출 (없거나 형식이 다르면 화면 추출로 대체)
+HYDRATION_ENABLED = True
+# 브라우저로 불러온 페이지는 page_source를 받아 파싱하는 대신 브라우저 안에서 추출해 필요한 값만 받는다
+BROWSER_EXTRACTION = True
+
+# HTTP 클라이언트 설정
+HTTP_TIMEOUT = 10
+HTTP_POOL_SIZE = 4
+
+# 스케줄러 설정: 동시 처리 수와 호스트별 요청 속도(초당 요청 수)
+MAX_IN_FLIGHT = 3
+PER_HOST_LIMIT = 3
+HOST_RATE = 2.0
+HOST_BURST = 2
+
+# 적응형 속도 조절(AIMD): 정상 응답마다 HOST_RATE_STEP씩 올리고, 차단 신호(429/503, 캡차, 느린 응답,
+# 빈 결과)가 보이면 HOST_RATE_BACKOFF배로 줄인다. 동시 요청 수도 같은 방식으로 1~PER_HOST_LIMIT 사이에서 조절
+HOST_MIN_RATE = 0.2
+HOST_MAX_RATE = 8.0
+HOST_RATE_STEP = 0.1
+HOST_RATE_BACKOFF = 0.5
+SLOW_RESPONSE_SECONDS = 5
+BLOCK_COOLDOWN_SECONDS = 30
+BLOCK_MARKERS = ('g-recaptcha', 'captcha', 'cf-chl', 'Too Many Requests', '비정상적인 접근')
+
+# WebDriver 풀 설정: 세션 수, 세션 교체 기준(페이지 수, JS 힙 MB)
+WARM_UP_URL = f"{BASE_URL}/category/661"
+DRIVER_POOL_SIZE = 3
+DRIVER_MAX_PAGES = 200
+DRIVER_MAX_MEMORY_MB = 512
+
+# 가벼운 브라우저 모드: page_source의 텍스트만 읽으므로 화면 표시, 이미지, 추적 스크립트는 받지 않는다
+# 페이지 로딩은 DOMContentLoaded까지만 기다리고(eager) 이후는 readiness 대기로 확인
+LEAN_BROWSER = True
+PAGE_LOAD_STRATEGY = 'eager'
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.mp4', '*.webm',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*facebook.com/tr*', '*connect.facebook*', '*analytics.tiktok.com*',
+    '*hotjar.com*', '*amplitude.com*', '*braze.com*', '*channel.io*', '*criteo*',
+]
+
+# 카테고리 페이지를 동시에 불러올 워커 수
+CATEGORY_PAGE_WORKERS = 4
+# 전체 서비스 수를 모를 때 끝을 찾으며 확인할 최대 페이지 수
+CATEGORY_MAX_PAGES = 1000
+
+# 서비스 상세 페이지를 동시에 불러올 워커 수 (브라우저는 HTTP 응답으로 부족할 때만 MAX_IN_FLIGHT개까지)
+GIG_WORKERS = 8
+
+# 가져오기/파싱 분리 파이프라인: HTML 파싱 프로세스 수(None이면 CPU 코어 수)와 단계 사이 큐 크기
+PARSE_WORKERS = None
+PIPELINE_QUEUE_SIZE = 32
+
+# 크롤링 진행 상태 저장 위치와 항목별 최대 시도 횟수
+STATE_DB_PATH = 'output/crawl_state.db'
+MAX_ATTEMPTS = 3
+
+# 판매자별 콘텐츠 지문과 마지막 결과 (일일 증분 수집용)
+FRESHNESS_DB_PATH = 'output/freshness.db'
+
+# 추출 명세 파일 변경 여부를 확인하는 간격(초). 파일이 바뀌면 다시 컴파일한다
+SPEC_RELOAD_INTERVAL = 5
+
+# 리뷰 위젯 JSON 엔드포인트: '{seller_name}', '{page}' 자리표시자를 쓴 URL 템플릿.
+# None이면 첫 페이지 넘김 때 Chrome 성능 로그에서 찾아낸다
+REVIEW_API_TEMPLATE = None
+REVIEW_API_WORKERS = 4
+# 판매자 한 명의 리뷰를 API로 요청할 최대 페이지 수 (끝 페이지를 계속 돌려주는 응답에 대비)
+REVIEW_MAX_PAGES = 500
+
+# 분산 수집: 여러 노드가 공유하는 작업 큐(SQLite) 위치, 작업 임대 시간과 갱신 주기(초)
+# 여러 호스트에서 돌릴 때는 모든 노드가 파일 잠금을 지원하는 같은 공유 폴더(NFS, SMB)의 파일을 가리켜야 한다
+# (예: '/mnt/shared/kmong/broker.db'). 큐는 WAL 대신 롤백 저널로 열어 네트워크 파일 시스템에서도 쓸 수 있다
+BROKER_DB_PATH = 'output/broker.db'
+LEASE_SECONDS = 300
+HEARTBEAT_SECONDS = 60
+BROKER_POLL_SECONDS = 2
+# 워커 시작 전에 끝난 이전 실행의 완료 표시만 있을 때 새 코디네이터를 기다리는 시간(초)
+BROKER_STARTUP_GRACE_SECONDS = 60
+
+# 받은 페이지 원본 보관소(오프라인 재추출용): 압축한 본문을 세그먼트 파일(최대 ARCHIVE_SEGMENT_MB)에 이어 쓴다
+# 본문은 zstd(ARCHIVE_ZSTD_LEVEL)로 압축한다. 예전에 zlib으로 압축한 보관소도 그대로 읽는다
+ARCHIVE_ENABLED = True
+ARCHIVE_DIR = 'output/archive'
+ARCHIVE_SEGMENT_MB = 256
+ARCHIVE_ZSTD_LEVEL = 3
+
+# 단계별 소요 시간, 카운터 내보내기 위치와 실행 중 갱신 주기(초, 0이면 종료 시에만 저장)
+METRICS_DIR = 'output/metrics'
+METRICS_LIVE_INTERVAL = 0
@@ -0,0 +1,5 @@
+from datetime import datetime
+
+
+def log(message):
+    print(f"{datetime.now().strftime("%H:%M:%S.%f")[:-3]} {message}")
@@ -0,0 +1,194 @@
+import functools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from src.utils.config import METRICS_DIR
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class Histogram:
+    """관측값 분포. 표본이 max_samples를 넘으면 저수지 표집으로 일부만 보관해 분위수를 계산"""
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self.count = 0
+        self.total = 0.0
+        self.samples = []
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+        else:
+            index = random.randrange(self.count)
+            if index < self.max_samples:
+                self.samples[index] = value
+
+    def quantiles(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: None for q in QUANTILES}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            **{f"p{int(q * 100)}": round(value, 6) if value is not None else None
+               for q, value in self.quantiles().items()},
+        }
+
+
+class Metrics:
+    """단계별 소요 시간(히스토그램), 카운터, 현재 값(게이지), 워커별 처리량을 모아 JSON/Prometheus 텍스트로 내보낸다
+
+    timer('driver_get')처럼 단계 이름으로 감싸면 초 단위로 기록한다. 워커별 처리량은
+    inc(..., worker=True)로 센 항목을 실행 시간으로 나눈 값이다. 게이지는 set()으로 마지막 값만 남긴다.
+    """
+    def __init__(self, prefix='kmong'):
+        self.prefix = prefix
+        self.started = time.monotonic()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._live = None
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            self._histograms[key].observe(value)
+
+    def inc(self, name, value=1, worker=False, **labels):
+        if worker:
+            labels['worker'] = threading.current_thread().name
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, name):
+        """함수 실행 시간을 name 단계로 기록하는 데코레이터"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        elapsed = time.monotonic() - self.started
+        with self._lock:
+            histograms = {key: histogram.summary() for key, histogram in self._histograms.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        throughput = {}
+        for (name, labels), value in counters.items():
+            worker = dict(labels).get('worker')
+            if worker is not None:
+                throughput.setdefault(worker, {})[name] = round(value / elapsed, 4) if elapsed else 0
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            'stages': [{'name': name, 'labels': dict(labels), **summary}
+                       for (name, labels), summary in sorted(histograms.items())],
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in sorted(counters.items())],
+            'gauges': [{'name': name, 'labels': dict(labels), 'value': value}
+                       for (name, labels), value in sorted(gauges.items())],
+            'worker_throughput_per_second': throughput,
+        }
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            histograms = {key: histogram.summary() for key, histogram in self._histograms.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        for name in sorted({name for name, _ in histograms}):
+            metric = f"{self.prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for (other, labels), summary in sorted(histograms.items()):
+                if other != name:
+                    continue
+                for q in QUANTILES:
+                    value = summary[f"p{int(q * 100)}"]
+                    lines.append(f"{metric}{_label_text(labels + (('quantile', q),))} {value if value is not None else 'NaN'}")
+                lines.append(f"{metric}_sum{_label_text(labels)} {summary['sum']}")
+                lines.append(f"{metric}_count{_label_text(labels)} {summary['count']}")
+        for name in sorted({name for name, _ in counters}):
+            metric = f"{self.prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (other, labels), value in sorted(counters.items()):
+                if other == name:
+                    lines.append(f"{metric}{_label_text(labels)} {value}")
+        for name in sorted({name for name, _ in gauges}):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            for (other, labels), value in sorted(gauges.items()):
+                if other == name:
+                    lines.append(f"{metric}{_label_text(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, directory=METRICS_DIR):
+        os.makedirs(directory, exist_ok=True)
+        # 실행 중 갱신할 때 읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일에 쓰고 교체
+        for filename, content in [('metrics.json', json.dumps(self.snapshot(), ensure_ascii=False, indent=2)),
+                                  ('metrics.prom', self.to_prometheus())]:
+            path = os.path.join(directory, filename)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(path + '.tmp', path)
+        return directory
+
+    def start_live_export(self, interval, directory=METRICS_DIR):
+        """interval초마다 파일을 갱신하는 백그라운드 스레드 시작"""
+        if self._live is not None or interval <= 0:
+            return
+        stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval):
+                self.save(directory)
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        self._live = stop
+
+    def stop_live_export(self):
+        if self._live is not None:
+            self._live.set()
+            self._live = None
+
+
+# 한 프로세스의 모든 단계가 함께 쓰는 기본 수집기
+metrics = Metrics()
@@ -0,0 +1,60 @@
+import unittest
+
+import pandas as pd
+
+from src.data.analyzer import CategoryAnalyzer
+
+
+def _analyzer():
+    # alice는 두 카테고리(1, 2)에 서비스를 올린 판매자, bob은 카테고리 1에만 있다
+    services = pd.DataFrame({
+        'title': ['엑셀 자동화', '웹 크롤링', '데이터 수집'],
+        'seller_name': ['alice', 'alice', 'bob'],
+        'link': ['/gig/1', '/gig/2', '/gig/3'],
+        'category_id': [1, 2, 1],
+    })
+    sellers = pd.DataFrame({'seller_name': ['alice', 'bob'], 'total_jobs': [10, 3]})
+    reviews = pd.DataFrame({
+        'seller_name': ['alice', 'alice', 'alice', 'alice', 'bob'],
+        'review_date': pd.to_datetime(['2024-01-05', '2024-01-20', '2024-02-03', '2024-02-10', '2024-01-15']),
+        'service_title': ['엑셀 자동화', ' 웹 크롤링 ', '웹 크롤링', '삭제된 서비스', '데이터 수집'],
+        'price_min': pd.array([10000, 20000, 20000, 50000, 30000], dtype='Int64'),
+        'price_max': pd.array([30000, 40000, 40000, 50000, 30000], dtype='Int64'),
+    })
+    return CategoryAnalyzer(services, sellers, reviews)
+
+
+class CategoryAnalyzerTest(unittest.TestCase):
+    def test_reviews_are_attributed_to_one_category(self):
+        categories = _analyzer().review_categories()
+        self.assertEqual(len(categories), 5)
+        self.assertEqual(categories['category_id'].tolist()[:3], [1, 2, 2])
+        self.assertTrue(pd.isna(categories['category_id'].iloc[3]))
+
+    def test_category_revenue_does_not_double_count_sellers_in_several_categories(self):
+        analyzer = _analyzer()
+        revenue = analyzer.category_revenue().set_index('category_id', drop=False)
+        attributed = revenue[revenue['category_id'].notna()].set_index('category_id')
+        self.assertEqual(attributed.loc[1, 'reviews'], 2)
+        self.assertEqual(attributed.loc[1, 'estimated_revenue'], 20000 + 30000)
+        self.assertEqual(attributed.loc[2, 'reviews'], 2)
+        self.assertEqual(attributed.loc[2, 'estimated_revenue'], 30000 + 30000)
+
+        unattributed = revenue[revenue['category_id'].isna()]
+        self.assertEqual(unattributed['reviews'].tolist(), [1])
+        self.assertEqual(unattributed['estimated_revenue'].tolist(), [50000])
+        # 카테고리별 합계(미분류 포함)가 전체 리뷰 수, 전체 추정 매출과 같아야 한다
+        self.assertEqual(revenue['reviews'].sum(), len(analyzer.reviews))
+        self.assertEqual(revenue['estimated_revenue'].sum(), analyzer.review_revenue().sum())
+
+    def test_category_velocity_counts_each_review_once(self):
+        analyzer = _analyzer()
+        velocity = analyzer.category_velocity()
+        self.assertEqual(velocity['reviews'].sum(), len(analyzer.reviews))
+        by_key = {(row.category_id, str(row.month)): row.reviews
+                  for row in velocity.itertuples() if pd.notna(row.category_id)}
+        self.assertEqual(by_key, {(1, '2024-01'): 2, (2, '2024-01'): 1, (2, '2024-02'): 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.crawler.broker import BrokerWorker, TaskBroker
+
+
+class TaskBrokerTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, 'broker.db')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def broker(self, **kwargs):
+        broker = TaskBroker(self.path, **kwargs)
+        self.addCleanup(broker.close)
+        return broker
+
+    def test_expired_lease_is_not_retried_past_max_attempts(self):
+        # lease_seconds=0: 빌려 간 작업은 바로 임대가 만료된다
+        broker = self.broker(lease_seconds=0, max_attempts=2)
+        broker.enqueue('seller', 'alice')
+        self.assertEqual(broker.lease('w1').attempts, 1)
+        time.sleep(0.01)
+        self.assertEqual(broker.lease('w2').attempts, 2)
+        time.sleep(0.01)
+        self.assertIsNone(broker.lease('w3'))
+        self.assertEqual(broker.counts(), {'seller': {'failed': 1}})
+        self.assertEqual(broker.remaining(), 0)
+
+    def test_only_the_current_lease_owner_can_finish_a_task(self):
+        broker = self.broker(lease_seconds=0, max_attempts=3)
+        broker.enqueue('seller', 'alice')
+        stale = broker.lease('w1')
+        time.sleep(0.01)
+        current = broker.lease('w2')
+        self.assertFalse(broker.complete(stale, {'by': 'w1'}, 'w1'))
+        self.assertFalse(broker.fail(stale, 'timeout', 'w1'))
+        self.assertTrue(broker.complete(current, {'by': 'w2'}, 'w2'))
+        self.assertEqual(broker.results('seller'), [('alice', None, {'by': 'w2'})])
+
+    def test_worker_started_before_coordinator_waits_for_the_run_to_close(self):
+        broker = self.broker()
+        worker = BrokerWorker(broker, {'seller': lambda context, task: task.key.upper()}, [None],
+                              worker_id='w1', poll_seconds=0.02)
+        processed = []
+        thread = threading.Thread(target=lambda: processed.append(worker.run()))
+        thread.start()
+        time.sleep(0.2)
+        self.assertTrue(thread.is_alive())
+
+        broker.open_run()
+        broker.enqueue_many('seller', [('alice', None, 0), ('bob', None, 0)])
+        deadline = time.monotonic() + 5
+        while broker.remaining() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.1)
+        self.assertTrue(thread.is_alive())
+
+        broker.close_run()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(processed, [2])
+        self.assertEqual([result for _, _, result in broker.results('seller')], ['ALICE', 'BOB'])
+
+    def test_stale_run_marker_is_trusted_after_startup_grace(self):
+        broker = self.broker()
+        broker.close_run()
+        worker = BrokerWorker(broker, {'seller': lambda context, task: None}, [None],
+                              worker_id='w1', poll_seconds=0.02, startup_grace=0.2)
+        started = time.monotonic()
+        self.assertEqual(worker.run(), 0)
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import os
+import re
+import unittest
+
+from src.crawler.crawler import parse_gig_html
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(filename):
+    with open(os.path.join(FIXTURE_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+
+class GigPackagesTest(unittest.TestCase):
+    # 탭 버튼 3개와 탭 패널 3개(STANDARD만 보이고 나머지는 hidden)가 함께 렌더링된 서비스 상세 페이지
+    def setUp(self):
+        self.html = load_fixture('gig_packages.html')
+
+    def test_reads_every_tab_panel_without_clicking(self):
+        fields = parse_gig_html(self.html)
+        packages = fields['packages']
+        self.assertEqual(list(packages), ['STANDARD', 'DELUXE', 'PREMIUM'])
+        self.assertEqual([package['price'] for package in packages.values()], ['50,000원', '150,000원', '300,000원'])
+        self.assertEqual(packages['DELUXE']['title'], '상세 크롤러')
+        self.assertEqual(packages['PREMIUM']['details'], {
+            'included_features': ['소스코드 제공', '실행파일 제공', '기능 추가'],
+            'specifications': {'수정 횟수': '5', '작업 기간': '14일'},
+        })
+        self.assertEqual((fields['skill_level'], fields['team_size']), ('중급', '2~5인'))
+
+    def test_fewer_panels_than_buttons_falls_back_to_clicking(self):
+        # 선택한 탭의 패널만 그려진 페이지: 일부나 SINGLE로 저장하지 않고 브라우저에서 탭을 눌러 읽게 한다
+        html = re.sub(r'<div class="w-full rounded-b-lg border border-gray-300 hidden">.*?(?=<div class="w-full|<button class="purchase")',
+                      '', self.html)
+        self.assertEqual(html.count('border-gray-300 hidden'), 0)
+        fields = parse_gig_html(html)
+        self.assertIsNone(fields['packages'])
+        self.assertEqual(fields['skill_level'], '중급')
+
+    def test_next_data_with_fewer_packages_than_buttons_uses_tab_panels(self):
+        data = {'props': {'pageProps': {'gig': {'packages': [
+            {'type': 'STANDARD', 'price': 50000, 'title': '기본 크롤러', 'description': '', 'options': []},
+        ]}}}}
+        script = f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data, ensure_ascii=False)}</script>'
+        fields = parse_gig_html(self.html.replace('</body>', script + '</body>'))
+        self.assertEqual(list(fields['packages']), ['STANDARD', 'DELUXE', 'PREMIUM'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import unittest
+
+from src.crawler import hydration
+from src.crawler.crawler import parse_profile_html
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(filename):
+    with open(os.path.join(FIXTURE_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+
+class ProfileHydrationTest(unittest.TestCase):
+    # 리뷰 목록은 __NEXT_DATA__에 없고(리뷰 API로 따로 불러옴) 서버 렌더링된 DOM에만 있는 프로필 페이지
+    def setUp(self):
+        self.html = load_fixture('profile_hydrated.html')
+
+    def test_missing_review_list_is_unknown_not_empty(self):
+        fields = hydration.profile_page(hydration.next_data(self.html))
+        self.assertEqual(fields['review_count'], 87)
+        self.assertIsNone(fields['reviews'])
+
+    def test_missing_fields_are_filled_from_dom(self):
+        fields = parse_profile_html(self.html)
+        self.assertEqual(fields['review_count'], 87)
+        self.assertEqual(len(fields['reviews']), 10)
+        self.assertEqual(fields['reviews'][0], {
+            'date': '22.05.13', 'service_title': '엑셀 데이터 봇 API', 'period': '작업일 14일', 'price': '7만원 ~ 42만원',
+        })
+        # 다음 페이지 여부도 DOM에서 읽어 나머지 리뷰 페이지를 수집하게 한다
+        self.assertEqual(fields['next_review_page'], '다음')
+        self.assertEqual(fields['total_jobs'], '312')
+        self.assertEqual(fields['career'][0], '프로그램 크롤링')
+
+    def test_without_dom_and_review_list_falls_back_to_browser(self):
+        script = self.html[self.html.index('<script id="__NEXT_DATA__"'):]
+        self.assertIsNone(parse_profile_html(f"<html><body>{script}"))
+
+    def test_zero_reviews_needs_no_review_list(self):
+        html = self.html.replace('"review_count": 87', '"review_count": 0')
+        fields = hydration.profile_page(hydration.next_data(html))
+        self.assertEqual(fields['reviews'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from src.crawler.offline import profile_records, review_run_rows
+
+
+def review(n):
+    return ['22.05.13', f'서비스 {n}', '작업일 7일', '10만원']
+
+
+class ReviewRunTest(unittest.TestCase):
+    def test_stops_at_empty_page(self):
+        # 마지막 페이지(3) 뒤로 한 묶음 더 요청한 4, 5페이지는 비어 있거나 버려진다
+        runs = {100.0: {2: [review(2)], 3: [review(3)], 4: [], 5: [review(5)]}}
+        self.assertEqual(review_run_rows(runs), [review(2), review(3)])
+
+    def test_stops_when_endpoint_repeats_the_last_page(self):
+        # 범위 밖 페이지에 마지막 페이지를 다시 돌려주는 API
+        runs = {100.0: {2: [review(2)], 3: [review(3)], 4: [review(3)], 5: [review(3)]}}
+        self.assertEqual(review_run_rows(runs), [review(2), review(3)])
+
+    def test_uses_only_the_latest_fetch_run(self):
+        # 이전 회차(100)에는 6페이지까지, 최근 회차(200)에는 3페이지까지 있었다
+        runs = {
+            100.0: {page: [review(f'old-{page}')] for page in range(2, 7)},
+            200.0: {2: [review(2)], 3: [review(3)], 4: []},
+        }
+        self.assertEqual(review_run_rows(runs), [review(2), review(3)])
+
+    def test_missing_or_unparsed_page_stops(self):
+        self.assertEqual(review_run_rows({100.0: {2: [review(2)], 3: None, 4: [review(4)]}}), [review(2)])
+        self.assertEqual(review_run_rows({100.0: {3: [review(3)]}}), [])
+        self.assertEqual(review_run_rows(None), [])
+
+    def test_profile_records_appends_review_run(self):
+        fields = {'introduction': '소개', 'career': [], 'specialties': [], 'skills': [], 'total_jobs': '3',
+                  'reviews': [{'date': '22.05.13', 'service_title': '서비스 1', 'period': '작업일 7일', 'price': '10만원'}]}
+        results = [
+            ({'kind': 'profile', 'url': 'https://kmong.com/@alice', 'key': None, 'fetched_at': 90.0}, fields),
+            ({'kind': 'review', 'url': 'https://api/1', 'key': 'alice:2', 'fetched_at': 100.0}, [review(2)]),
+            ({'kind': 'review', 'url': 'https://api/2', 'key': 'alice:3', 'fetched_at': 100.0}, [review(2)]),
+        ]
+        [record] = profile_records(results)
+        self.assertEqual(record['reviews'], [review(1), review(2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from src.crawler.pipeline import StagedPipeline, process_pool
+
+
+def parse_upper(html):
+    # 파싱 프로세스에서 실행되므로 모듈 수준 함수여야 한다
+    if html == 'broken':
+        raise ValueError("깨진 HTML")
+    return html.upper()
+
+
+class StagedPipelineTest(unittest.TestCase):
+    def test_parse_failure_falls_back_in_finish_stage(self):
+        written = {}
+        failed = []
+
+        def finish(context, item, meta, parsed):
+            # 파싱 결과가 없으면 브라우저 대체처럼 다른 방법으로 레코드를 만든다
+            return parsed if parsed is not None else f"browser:{item}"
+
+        pipeline = StagedPipeline(lambda item: (item, {}), parse_upper, finish, written.__setitem__, [None, None],
+                                  parse_workers=1, on_error=lambda item, error: failed.append(item), name='test')
+        self.assertEqual(pipeline.run(['ok', 'broken']), 2)
+        self.assertEqual(written, {'ok': 'OK', 'broken': 'browser:broken'})
+        self.assertEqual(failed, [])
+
+    def test_batches_share_one_process_pool(self):
+        written = {}
+        pipeline = StagedPipeline(lambda item: (item, {}), parse_upper, lambda context, item, meta, parsed: parsed,
+                                  written.__setitem__, [None], parse_workers=1, name='test')
+        with process_pool(1) as executor:
+            self.assertEqual(pipeline.run(['a', 'b'], executor), 2)
+            self.assertEqual(pipeline.run(['c'], executor), 1)
+            # 넘겨받은 풀은 닫지 않는다
+            self.assertEqual(executor.submit(parse_upper, 'd').result(), 'D')
+        self.assertEqual(written, {'a': 'A', 'b': 'B', 'c': 'C'})
+
+
+if __name__ == '__main__':
+    unittest.main()
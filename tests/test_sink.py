@@ -0,0 +1,58 @@
+import csv
+import os
+import tempfile
+import time
+import unittest
+
+from src.data.sink import PartitionedSink
+
+COLUMNS = ['seller_name', 'total_jobs']
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.reader(f))
+
+
+class PartitionedSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tempdir.name, 'parts')
+        self.merged = os.path.join(self.tempdir.name, 'profiles.csv')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_workers_write_their_own_part_files(self):
+        sink = PartitionedSink(self.directory, 'profiles', COLUMNS)
+        for i, part in enumerate([sink.part(0), sink.part(1)]):
+            part.write({'seller_name': f'seller{i}', 'total_jobs': i})
+        self.assertEqual(sink.merge(self.merged, key='seller_name'), 2)
+        self.assertEqual([os.path.basename(path) for path in sink.part_paths()],
+                         ['profiles.part-000.csv', 'profiles.part-001.csv'])
+        self.assertEqual(read_rows(self.merged), [COLUMNS, ['seller0', '0'], ['seller1', '1']])
+
+    def test_merge_keeps_the_latest_row_for_a_key(self):
+        # 이전 실행에서 워커 1이 쓴 alice를 이어서 수집할 때 워커 0이 다시 수집한 경우
+        first = PartitionedSink(self.directory, 'profiles', COLUMNS)
+        first.part(1).write({'seller_name': 'alice', 'total_jobs': 10})
+        first.part(0).write({'seller_name': 'bob', 'total_jobs': 3})
+        first.close()
+        time.sleep(0.01)
+
+        resumed = PartitionedSink(self.directory, 'profiles', COLUMNS, append=True)
+        resumed.part(0).write({'seller_name': 'alice', 'total_jobs': 12})
+        self.assertEqual(resumed.merge(self.merged, key='seller_name'), 2)
+        self.assertEqual(read_rows(self.merged), [COLUMNS, ['bob', '3'], ['alice', '12']])
+
+    def test_merge_reads_part_files_without_written_at_column(self):
+        os.makedirs(self.directory)
+        with open(os.path.join(self.directory, 'profiles.part-000.csv'), 'w', newline='', encoding='utf-8-sig') as f:
+            csv.writer(f).writerows([COLUMNS, ['alice', '10'], ['alice', '11']])
+        sink = PartitionedSink(self.directory, 'profiles', COLUMNS)
+        self.assertEqual(sink.merge(self.merged, key='seller_name'), 1)
+        self.assertEqual(read_rows(self.merged), [COLUMNS, ['alice', '11']])
+
+
+if __name__ == '__main__':
+    unittest.main()
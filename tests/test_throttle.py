@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.crawler.crawler import BaseCrawler
+from src.crawler.fetcher import HttpFetcher
+from src.crawler.scheduler import AdaptiveThrottle
+from src.utils.metrics import metrics
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """경로별로 정해 둔 (상태 코드, 헤더, 지연 초)로 응답하는 스텁 서버"""
+    routes = {
+        '/ok': (200, {}, 0),
+        '/busy': (429, {'Retry-After': '1'}, 0),
+        '/unavailable': (503, {}, 0),
+        '/slow': (200, {}, 0.4),
+    }
+
+    def do_GET(self):
+        status, headers, delay = self.routes[self.path]
+        if delay:
+            time.sleep(delay)
+        body = f"<html><body>{self.path}</body></html>".encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AdaptiveThrottleTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.throttle = AdaptiveThrottle(rate=20, capacity=1, min_rate=0.5, max_rate=40, step=1, backoff=0.5,
+                                         slow_seconds=0.3, cooldown=0.5, max_concurrency=4)
+        self.fetcher = HttpFetcher()
+        self.crawler = BaseCrawler(self.fetcher, self.throttle)
+        self.host = self.base_url.split('//', 1)[1]
+
+    def tearDown(self):
+        self.fetcher.close()
+
+    def fetch(self, path):
+        return self.crawler._fetch(self.base_url + path)
+
+    def test_backs_off_on_429_and_honors_retry_after(self):
+        self.assertEqual(self.fetch('/busy').status, 429)
+        self.assertEqual(self.throttle.rate_of(self.host), 10)
+        self.assertEqual(self.throttle.limit(self.host).limit, 2)
+
+        # Retry-After: 1 이 끝날 때까지 같은 호스트에 요청하지 않는다
+        started = time.monotonic()
+        self.assertEqual(self.fetch('/ok').status, 200)
+        self.assertGreaterEqual(time.monotonic() - started, 0.9)
+
+    def test_uses_cooldown_without_retry_after(self):
+        self.fetch('/unavailable')
+        self.assertEqual(self.throttle.rate_of(self.host), 10)
+        started = time.monotonic()
+        self.fetch('/ok')
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+    def test_backs_off_on_slow_responses_without_pausing(self):
+        self.fetch('/slow')
+        self.assertEqual(self.throttle.rate_of(self.host), 10)
+        self.assertEqual(self.throttle.limit(self.host).limit, 2)
+        started = time.monotonic()
+        self.fetch('/ok')
+        self.assertLess(time.monotonic() - started, 0.3)
+
+    def test_exports_rate_concurrency_and_latency_per_host(self):
+        self.fetch('/busy')
+        gauges = {gauge['name']: gauge['value'] for gauge in metrics.snapshot()['gauges']
+                  if gauge['labels'] == {'host': self.host}}
+        self.assertEqual(gauges['host_rate'], 10)
+        self.assertEqual(gauges['host_concurrency'], 2)
+        self.assertIn('host_latency_seconds', gauges)
+        self.assertIn(f'kmong_host_rate{{host="{self.host}"}} 10', metrics.to_prometheus())
+
+    def test_recovers_after_successful_responses(self):
+        self.fetch('/busy')
+        time.sleep(1)
+        for _ in range(5):
+            self.fetch('/ok')
+        # 정상 응답마다 step만큼 가산 증가
+        self.assertEqual(self.throttle.rate_of(self.host), 15)
+        # 동시 요청 수는 현재 한도의 10배만큼 연속으로 성공하면 하나 늘어난다
+        for _ in range(15):
+            self.fetch('/ok')
+        self.assertEqual(self.throttle.limit(self.host).limit, 3)
+        self.assertLessEqual(self.throttle.rate_of(self.host), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()